@@ -15,6 +15,7 @@ import argparse
 import sys
 from structural_analysis.operations import MidasOperations
 from structural_analysis.post_processor import create_processor
+from structural_analysis.export import ResultExporter
 
 def parse_args():
     """解析命令行参数"""
@@ -40,6 +41,10 @@ def parse_args():
                               help='单元编号列表 (例如: 1,2,3)')
     extract_parser.add_argument('--load-case', required=True, 
                               help='荷载工况名称')
+    extract_parser.add_argument('--output',
+                              help='导出路径 (Parquet为目录，HDF5为.h5文件)')
+    extract_parser.add_argument('--format', default='parquet', choices=['parquet', 'hdf5'],
+                              help='导出格式')
     
     # plot 命令
     plot_parser = subparsers.add_parser('plot', help='绘制结果图表')
@@ -91,9 +96,18 @@ def extract_results(args):
             load_case=args.load_case
         )
         print("结果提取成功")
-        return results
     except Exception as e:
         print(f"结果提取失败: {str(e)}")
+        return
+
+    if getattr(args, 'output', None):
+        try:
+            with ResultExporter(args.output, args.format) as exporter:
+                rows = exporter.write(results)
+            print(f"结果已导出到 {args.output}，共{rows}行")
+        except Exception as e:
+            print(f"结果导出失败: {str(e)}")
+    return results
 
 def plot_results(args, results=None):
     """绘制结果图表"""
@@ -14,8 +14,13 @@ setup(
         'requests>=2.25.0',
         'pandas>=1.2.0',
         'numpy>=1.19.0',
-        'matplotlib>=3.3.0'
+        'matplotlib>=3.3.0',
+        'scipy>=1.5.0'
     ],
+    extras_require={
+        'parquet': ['pyarrow>=6.0.0'],
+        'hdf5': ['h5py>=3.0.0']
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -22,11 +22,75 @@ from .post_processor import (
 )
 
 from .operations import MidasOperations
+from .result_tensor import StageResultTensor
+from .envelope import compute_envelope
+from .combination import CombinationEngine, LoadCombination
+from .geometry import GeometryIndex, geometry_index
+from .spatial import NodeSpatialIndex
+from .generator import BridgeModel, girder_model, cable_stayed_model
+from .snapshot import Snapshot, snapshot, restore
+from .load_cases import LoadCaseRegistry, load_case_registry
+from .stages import StageRegistry, stage_registry
+from .library import MaterialLibrary, SectionLibrary, material_library, section_library
+from .compare import RunComparison, compare_runs
+from .calibration import (
+    Calibration,
+    CalibrationParameter,
+    ModelEvaluator,
+    Measurement,
+    material_parameter,
+    prestress_loss_parameter,
+    spring_parameter
+)
+from .sensitivity import SensitivityAnalysis
+from .surrogate import ResponseSurface
+from .frame_solver import FrameModel, FrameResult
+from .influence import InfluenceBuilder, InfluenceMatrix
+from .export import ResultExporter, read_results, export_construction
 
 __all__ = [
     'MidasCivil',
     'StaticLoadsProcessor',
     'TemperatureLoadsProcessor',
     'PrestressLoadsProcessor',
-    'ConstructionStageProcessor'
+    'ConstructionStageProcessor',
+    'StageResultTensor',
+    'compute_envelope',
+    'CombinationEngine',
+    'LoadCombination',
+    'GeometryIndex',
+    'geometry_index',
+    'NodeSpatialIndex',
+    'BridgeModel',
+    'girder_model',
+    'cable_stayed_model',
+    'Snapshot',
+    'snapshot',
+    'restore',
+    'LoadCaseRegistry',
+    'load_case_registry',
+    'StageRegistry',
+    'stage_registry',
+    'MaterialLibrary',
+    'SectionLibrary',
+    'material_library',
+    'section_library',
+    'RunComparison',
+    'compare_runs',
+    'Calibration',
+    'CalibrationParameter',
+    'ModelEvaluator',
+    'Measurement',
+    'material_parameter',
+    'prestress_loss_parameter',
+    'spring_parameter',
+    'SensitivityAnalysis',
+    'ResponseSurface',
+    'FrameModel',
+    'FrameResult',
+    'InfluenceBuilder',
+    'InfluenceMatrix',
+    'ResultExporter',
+    'read_results',
+    'export_construction'
 ] 
\ No newline at end of file
@@ -1,18 +1,126 @@
 """MIDAS API核心功能模块"""
 
+import threading
+from contextlib import contextmanager
 import requests
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from .config import midas_config
 
+
+def compress_ranges(ids):
+    """
+    将编号压缩为连续区间
+    
+    参数:
+    - ids: array-like, 编号(可无序、可重复)
+    
+    返回:
+    - list: [(起始编号, 结束编号), ...]，按升序排列
+    
+    示例:
+    >>> compress_ranges([5, 1, 2, 3, 7, 8])
+    [(1, 3), (5, 5), (7, 8)]
+    """
+    ids = np.unique(np.asarray(ids, dtype=np.int64))
+    if not len(ids):
+        return []
+    breaks = np.flatnonzero(np.diff(ids) != 1)
+    starts = ids[np.r_[0, breaks + 1]]
+    ends = ids[np.r_[breaks, len(ids) - 1]]
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def format_ranges(ranges):
+    """将区间列表转换为多编号路径格式，如[(1, 3), (5, 5)] -> 1to3,5"""
+    return ",".join(str(a) if a == b else f"{a}to{b}" for a, b in ranges)
+
+
+def response_failed(response):
+    """判断响应是否表示请求失败(空响应或包含error字段)"""
+    return not response or (isinstance(response, dict) and "error" in response)
+
+
 class MidasAPI:
     def __init__(self):
-        self.base_url = midas_config.base_url
-        self.headers = {
+        self._base_url = midas_config.base_url
+        self._headers = {
             "Content-Type": "application/json",
             "MAPI-Key": midas_config.api_key
         }
+        # 线程内的连接设置，用于在不同线程中同时操作多个MIDAS实例
+        self._local = threading.local()
+
+    @property
+    def base_url(self):
+        """当前线程使用的接口地址"""
+        return getattr(self._local, "base_url", None) or self._base_url
+
+    @base_url.setter
+    def base_url(self, value):
+        self._base_url = value
+
+    @property
+    def headers(self):
+        """当前线程使用的请求头"""
+        return getattr(self._local, "headers", None) or self._headers
+
+    @headers.setter
+    def headers(self, value):
+        self._headers = value
+
+    @contextmanager
+    def connect(self, base_url, api_key=None):
+        """
+        在当前线程中临时连接到另一个MIDAS实例(其他线程不受影响)
+        
+        参数:
+        - base_url: str, 接口地址，如"https://localhost:10025/civil"
+        - api_key: str, MAPI-Key，默认与全局连接相同
+        
+        示例:
+        >>> with midas_api.connect("https://localhost:10026/civil", key):
+        ...     MidasOperations.analyze()
+        """
+        headers = {**self._headers, "MAPI-Key": api_key or self._headers["MAPI-Key"]}
+        with self._use(base_url, headers):
+            yield self
+
+    @contextmanager
+    def _use(self, base_url, headers):
+        """在当前线程中使用指定的接口地址和请求头"""
+        previous = (getattr(self._local, "base_url", None), getattr(self._local, "headers", None))
+        self._local.base_url, self._local.headers = base_url, headers
+        try:
+            yield self
+        finally:
+            self._local.base_url, self._local.headers = previous
+
+    def bind(self, func):
+        """
+        包装函数，使其在其他线程(如线程池)中调用时使用当前线程的连接
+
+        参数:
+        - func: callable, 需要在工作线程中执行的函数
+
+        返回:
+        - callable: 包装后的函数
+
+        示例:
+        >>> with midas_api.connect(url, key):
+        ...     executor.submit(midas_api.bind(processor.extract_construction), elems, case, steps)
+        """
+        base_url, headers = self.base_url, self.headers
+
+        def bound(*args, **kwargs):
+            with self._use(base_url, headers):
+                return func(*args, **kwargs)
+        return bound
     
     def request(self, method, endpoint, data=None):
         """统一的API请求处理"""
+        if not self.base_url:
+            raise RuntimeError("未获取到MIDAS连接信息，请确认MIDAS Civil已启动API连接，或通过connect指定接口地址")
         url = self.base_url + endpoint
         response = requests.request(
             method=method,
@@ -23,5 +131,77 @@ class MidasAPI:
         print(f"{method} {endpoint} {response.status_code}")
         return response.json()
 
+    def request_chunked(self, method, endpoint, assign, chunk_size=5000):
+        """
+        分批提交大量数据，每批为一个{"Assign": {...}}请求
+        
+        参数:
+        - method: str, 请求方法("POST"或"PUT")
+        - endpoint: str, 接口路径，如"/db/NODE"
+        - assign: dict, {编号: 数据}，即Assign部分的全部内容
+        - chunk_size: int, 每批的数据条数
+        
+        返回:
+        - list: 各批次的响应结果
+        """
+        keys = list(assign)
+        responses = []
+        for start in range(0, len(keys), chunk_size):
+            chunk = {key: assign[key] for key in keys[start:start + chunk_size]}
+            responses.append(self.request(method, endpoint, {"Assign": chunk}))
+        return responses
+
+    def delete_many(self, endpoint, ids, max_path_length=1500, max_workers=8):
+        """
+        批量删除数据，编号压缩为区间后以多编号路径(如/db/NODE/1to100,105)分批删除，
+        某批删除失败时改为并发逐个删除该批编号
+        
+        参数:
+        - endpoint: str, 接口路径，如"/db/NODE"
+        - ids: array-like, 需要删除的编号
+        - max_path_length: int, 每个请求中编号部分的最大长度
+        - max_workers: int, 逐个删除时的并发请求数
+        
+        返回:
+        - tuple: (删除成功的编号, 删除失败的编号)，均为升序ndarray
+        """
+        # 按路径长度将区间分批
+        batches, batch, length = [], [], 0
+        for item in compress_ranges(ids):
+            text = format_ranges([item])
+            if batch and length + len(text) + 1 > max_path_length:
+                batches.append(batch)
+                batch, length = [], 0
+            batch.append(item)
+            length += len(text) + 1
+        if batch:
+            batches.append(batch)
+        
+        def delete_one(item_id):
+            try:
+                return item_id, not response_failed(self.request("DELETE", f"{endpoint}/{item_id}"))
+            except (requests.RequestException, ValueError):
+                return item_id, False
+        
+        deleted, retry = [], []
+        for batch in batches:
+            batch_ids = [np.arange(a, b + 1) for a, b in batch]
+            try:
+                failed = response_failed(self.request("DELETE", f"{endpoint}/{format_ranges(batch)}"))
+            except (requests.RequestException, ValueError):
+                failed = True
+            (retry if failed else deleted).extend(batch_ids)
+        
+        failed_ids = []
+        if retry:
+            retry = np.concatenate(retry).tolist()
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for item_id, ok in executor.map(self.bind(delete_one), retry):
+                    (deleted if ok else failed_ids).append([item_id])
+        
+        def to_array(parts):
+            return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        return to_array(deleted), to_array(failed_ids)
+
 # 全局API实例        
 midas_api = MidasAPI() 
\ No newline at end of file
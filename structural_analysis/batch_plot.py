@@ -0,0 +1,149 @@
+"""批量绘图模块，提供无界面的批量结果图输出功能，包括：
+- 使用Agg后端直接输出图片，不调用plt.show()
+- 每个施工阶段、分量或荷载工况输出一张图片
+- 多进程并行绘图
+- 各进程复用同一个图形和坐标轴对象
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from .result_tensor import StageResultTensor
+
+# 每个进程复用的图形对象，键为(figsize, dpi)
+_canvases = {}
+
+
+def _safe_name(name):
+    """将阶段/工况名称转换为合法的文件名"""
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", str(name)).strip("_")
+
+
+def _get_axes(processor, figsize, dpi):
+    """获取当前进程复用的图形和坐标轴，首次调用时创建"""
+    key = (tuple(figsize), dpi)
+    if key not in _canvases:
+        processor._setup_plot_style()
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        _canvases[key] = (fig, fig.add_subplot(1, 1, 1))
+    return _canvases[key]
+
+
+def _render_job(job):
+    """
+    绘制并保存一个阶段/工况的全部分量结果图
+
+    参数:
+    - job: tuple, (processor, df, plots, figsize, dpi)，plots为[(分量, 标题, 输出路径), ...]
+
+    返回:
+    - list: 输出图片路径
+    """
+    processor, df, plots, figsize, dpi = job
+    fig, ax = _get_axes(processor, figsize, dpi)
+    paths = []
+    for component, title, path in plots:
+        ax.clear()
+        processor._plot_single_result(df, component, ax, title=title)
+        # 每帧重新计算布局，避免刻度标签较宽时被裁切
+        fig.tight_layout()
+        fig.savefig(path)
+        paths.append(path)
+    return paths
+
+
+def _split_frames(results, by=None):
+    """
+    将结果数据拆分为(标签, DataFrame)列表
+
+    参数:
+    - results: list/dict/DataFrame/StageResultTensor, 结果数据
+    - by: str, 对DataFrame按该列拆分(如"Load"、"Stage")，None表示不拆分
+    """
+    if isinstance(results, StageResultTensor):
+        return [(stage, results.to_frame(stage)) for stage in results.stages]
+    if isinstance(results, dict):
+        return list(results.items())
+    if isinstance(results, list):
+        return [(df["Stage"].iloc[0] if "Stage" in df.columns else i, df)
+                for i, df in enumerate(results, 1)]
+    if isinstance(results, pd.DataFrame):
+        if by is None:
+            return [("", results)]
+        return [(label, group) for label, group in results.groupby(by, sort=False)]
+    raise ValueError("结果数据格式不正确。应为DataFrame列表、字典、DataFrame或StageResultTensor。")
+
+
+def render_batch(processor, results, components, output_dir, workers=None, by=None,
+                 fmt="png", figsize=(10, 3), dpi=100, title=None):
+    """
+    批量输出结果图，每个(阶段/工况, 分量)组合输出一张图片
+
+    参数:
+    - processor: PostProcessor, 结果处理器，需实现_plot_single_result，否则抛出ValueError
+    - results: 结果数据，支持:
+        - list: process_construction_results返回的按阶段分组的DataFrame列表
+        - dict: {标签: DataFrame}
+        - DataFrame: 配合by参数按列拆分，如by="Load"每个荷载工况一张图
+        - StageResultTensor: 每个施工阶段一张图
+    - components: str/list, 绘制的分量
+    - output_dir: str, 输出目录
+    - workers: int, 并行进程数，None为CPU核数，0或1表示在当前进程中依次绘制
+    - by: str, results为DataFrame时的拆分列
+    - fmt: str, 图片格式(png, svg, pdf等)
+    - figsize: tuple, 图形尺寸
+    - dpi: int, 分辨率
+    - title: str, 标题模板，可使用{label}和{component}占位符
+
+    返回:
+    - list: 输出图片路径列表，文件名由标签和分量组成，重名时加序号(如"CS1_001_Moment-y_2")
+
+    注意:
+    - Windows下使用多进程时，调用代码需放在 if __name__ == "__main__": 中
+
+    示例:
+    >>> stages = force.process_construction_results(raw)
+    >>> render_batch(force, stages, ["Moment-y", "Axial"], "figures/cs_force", workers=8)
+    """
+    if not hasattr(processor, "_plot_single_result"):
+        raise ValueError(f"{type(processor).__name__}不支持批量绘图(未实现_plot_single_result)")
+    if isinstance(components, str):
+        components = [components]
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 每个阶段/工况的数据只传递一次
+    jobs = []
+    used = set()
+    for label, df in _split_frames(results, by):
+        plots = []
+        for component in components:
+            if title:
+                plot_title = title.format(label=label, component=component)
+            elif label != "":
+                plot_title = f"{label} - {component} 分布图"
+            else:
+                plot_title = f"{component} 分布图"
+            name = "_".join(part for part in (_safe_name(label), _safe_name(component)) if part)
+            # 不同标签转换后的文件名可能相同(如"CS1:001"和"CS1 001")，重名时加序号
+            unique, k = name, 1
+            while unique.lower() in used:
+                k += 1
+                unique = f"{name}_{k}"
+            used.add(unique.lower())
+            path = os.path.join(output_dir, f"{unique}.{fmt}")
+            plots.append((component, plot_title, path))
+        jobs.append((processor, df, plots, figsize, dpi))
+
+    if workers is not None and workers <= 1:
+        paths = [path for job in jobs for path in _render_job(job)]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            paths = [path for job_paths in executor.map(_render_job, jobs, chunksize=chunksize) for path in job_paths]
+    print(f"批量绘图完成，共输出{len(paths)}张图片至 {output_dir}")
+    return paths
@@ -0,0 +1,103 @@
+"""结果缓存模块，在本地缓存/post/table接口的提取结果
+
+缓存以基准单位保存结果，同一结果表以不同单位提取时只请求一次。
+只有通过本库运行分析(MidasOperations.analyze)的连接才使用缓存，缓存键包含该次分析的编号，
+再次分析或打开模型后原有结果失效。在MIDAS界面或其他程序中重新分析后须调用invalidate()。
+"""
+
+import json
+import threading
+from .api import midas_api
+
+
+class ResultCache:
+    """
+    结果表缓存类
+
+    属性:
+    - fingerprint: int, 当前分析指纹，每次缓存失效或完成分析时递增
+    """
+
+    def __init__(self):
+        self._tables = {}
+        self._runs = {}
+        self._lock = threading.Lock()
+        self.fingerprint = 0
+
+    def active(self, url=None):
+        """
+        连接的结果是否可以缓存(该连接上的最近一次分析由本库运行)
+
+        参数:
+        - url: str, 接口地址，默认为当前线程的连接
+
+        返回:
+        - bool
+        """
+        with self._lock:
+            return (url or midas_api.base_url) in self._runs
+
+    def mark_analyzed(self, url=None):
+        """
+        登记本库在连接上完成了一次分析，之后该连接的提取结果以本次分析编号缓存
+
+        参数:
+        - url: str, 接口地址，默认为当前线程的连接
+        """
+        with self._lock:
+            self.fingerprint += 1
+            self._runs[url or midas_api.base_url] = self.fingerprint
+
+    def make_key(self, argument):
+        """
+        根据请求参数生成缓存键(包含当前线程连接的MIDAS实例地址和该连接的分析编号)
+
+        参数:
+        - argument: dict, /post/table请求的Argument部分
+
+        返回:
+        - str: 缓存键
+        """
+        url = midas_api.base_url
+        with self._lock:
+            run = self._runs.get(url)
+        return json.dumps({"URL": url, "RUN": run, "Argument": argument}, sort_keys=True, ensure_ascii=False)
+
+    def get(self, key):
+        """获取缓存结果，不存在时返回None"""
+        with self._lock:
+            return self._tables.get(key, (None, None))[1]
+
+    def put(self, key, response):
+        """保存结果到缓存"""
+        with self._lock:
+            self._tables[key] = (midas_api.base_url, response)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._tables
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tables)
+
+    def invalidate(self, url=None):
+        """
+        清空缓存并更新分析指纹(模型重新分析或打开新模型后调用)
+
+        参数:
+        - url: str, 只清除该连接的缓存，默认清除全部连接
+        """
+        with self._lock:
+            if url is None:
+                self._tables.clear()
+                self._runs.clear()
+            else:
+                self._runs.pop(url, None)
+                for key in [key for key, (owner, _) in self._tables.items() if owner == url]:
+                    del self._tables[key]
+            self.fingerprint += 1
+
+
+# 全局结果缓存实例
+result_cache = ResultCache()
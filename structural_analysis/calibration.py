@@ -0,0 +1,480 @@
+"""模型修正模块，以实测挠度、索力等数据修正模型参数，包括：
+- 修正参数(弹性模量、容重、预应力损失、弹簧刚度等)与模型修改操作的映射
+- 仅提交发生变化的参数，运行分析并只提取测点结果
+- 基于scipy.optimize.least_squares的最小二乘修正
+- 多个MIDAS实例并行计算，全部计算结果缓存
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from queue import Queue
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares
+from .api import midas_api
+from .operations import MidasOperations
+from .pre_processor import PreProcessor, PrestressLoadsProcessor, PointSpringProcessor
+from .post_processor import create_processor
+from .combination import case_key
+from .surrogate import ResponseSurface
+
+
+class CalibrationParameter:
+    """
+    修正参数
+
+    属性:
+    - name: str, 参数名称
+    - initial: float, 初始值
+    - lower: float, 下限
+    - upper: float, 上限
+    - apply: callable, 将参数值写入当前连接的模型的函数，参数为参数值
+    """
+
+    def __init__(self, name, initial, lower, upper, apply):
+        if not lower < upper:
+            raise ValueError(f"参数 {name} 的下限({lower})必须小于上限({upper})")
+        if not lower <= initial <= upper:
+            raise ValueError(f"参数 {name} 的初始值({initial})超出范围[{lower}, {upper}]")
+        self.name = name
+        self.initial = float(initial)
+        self.lower = float(lower)
+        self.upper = float(upper)
+        self.apply = apply
+
+    def to_value(self, u):
+        """归一化变量(0~1)转换为参数值"""
+        return self.lower + u * (self.upper - self.lower)
+
+    def to_unit(self, value):
+        """参数值转换为归一化变量(0~1)"""
+        return (value - self.lower) / (self.upper - self.lower)
+
+
+def material_parameter(name, material_id, props, field="ELAST", lower=None, upper=None, ratio=0.2):
+    """
+    材料属性修正参数(弹性模量、容重等)，通过PreProcessor.define_material写入模型
+
+    参数:
+    - name: str, 参数名称
+    - material_id: int, 材料编号
+    - props: dict, define_material的完整参数(含初始值)
+    - field: str, 修正的属性，如"ELAST"、"DEN"
+    - lower, upper: float, 参数范围，默认为初始值的±ratio
+    - ratio: float, 默认参数范围比例
+
+    返回:
+    - CalibrationParameter: 修正参数
+    """
+    initial = props[field]
+    lower = initial * (1 - ratio) if lower is None else lower
+    upper = initial * (1 + ratio) if upper is None else upper
+
+    def apply(value):
+        PreProcessor.define_material(material_id, **{**props, field: value})
+    return CalibrationParameter(name, initial, lower, upper, apply)
+
+
+def prestress_loss_parameter(name, tendons, jacking, initial=0.1, lower=0.0, upper=0.3):
+    """
+    预应力损失修正参数(有效预应力 = 张拉控制值 × (1 - 损失率))，通过PrestressLoadsProcessor写入模型
+
+    参数:
+    - name: str, 参数名称
+    - tendons: dict, {钢束编号: update_tendon_prestress的其他参数(如tendon_name、load_case)}
+    - jacking: float, 张拉控制值(力或应力)
+    - initial, lower, upper: float, 损失率的初始值和范围
+
+    返回:
+    - CalibrationParameter: 修正参数
+    """
+    def apply(value):
+        processor = PrestressLoadsProcessor()
+        effective = jacking * (1 - value)
+        for tendon_id, kwargs in tendons.items():
+            processor.update_tendon_prestress(tendon_id, **kwargs, begin_value=effective, end_value=effective)
+    return CalibrationParameter(name, initial, lower, upper, apply)
+
+
+def spring_parameter(name, node_ids, stiffness, direction, lower=None, upper=None, ratio=0.5, **kwargs):
+    """
+    节点弹性支撑刚度修正参数，通过PointSpringProcessor.add_linear_springs写入模型
+
+    参数:
+    - name: str, 参数名称
+    - node_ids: array-like, 节点编号
+    - stiffness: array-like, 初始刚度，形状为(6,)或(N, 6)
+    - direction: int, 修正的刚度分量(0~5，依次为SDx, SDy, SDz, SRx, SRy, SRz)，
+      各节点的该分量按同一比例缩放，参数值为比例系数
+    - lower, upper: float, 比例系数范围，默认为1±ratio
+    - ratio: float, 默认参数范围比例
+    - kwargs: add_linear_springs的其他参数(如group_name)
+
+    返回:
+    - CalibrationParameter: 修正参数
+    """
+    base = np.array(stiffness, dtype=np.float64)
+
+    def apply(value):
+        scaled = base.copy()
+        scaled[..., direction] *= value
+        PointSpringProcessor().add_linear_springs(node_ids, scaled, method="PUT", **kwargs)
+    return CalibrationParameter(
+        name, 1.0, 1 - ratio if lower is None else lower, 1 + ratio if upper is None else upper, apply
+    )
+
+
+class Measurement:
+    """
+    实测数据
+
+    属性:
+    - result_type: str, 结果类型(同create_processor)，如"displacement"、"cable_force"
+    - ids: list, 测点节点或单元编号
+    - component: str, 结果分量，如"DZ"、"Tension"
+    - values: ndarray, 实测值(与unit单位一致)，None表示只作为响应量(如敏感性分析)
+    - load_case: str, 荷载工况名称
+    - stage: str, 施工阶段名称或STAGE_STEP名称，None表示提取General结果
+    - part: str, 单元部件，默认取每个单元的第一个部件
+    - weight: float, 权重
+    - scale: float, 残差的归一化系数，默认为实测值绝对值的最大值
+    - unit: tuple, 结果单位(力单位, 长度单位)
+    """
+
+    def __init__(self, result_type, ids, component, values=None, load_case="合计(CS)", stage=None, part=None,
+                 weight=1.0, scale=None, unit=("N", "mm")):
+        self.result_type = result_type
+        self.ids = [int(i) for i in ids]
+        self.component = component
+        self.values = None if values is None else np.asarray(values, dtype=np.float64)
+        if self.values is not None and len(self.values) != len(self.ids):
+            raise ValueError(f"测点数量({len(self.ids)})与实测值数量({len(self.values)})不一致")
+        self.load_case = load_case
+        self.stage = stage
+        self.part = part
+        self.weight = float(weight)
+        measured = np.max(np.abs(self.values)) if self.values is not None and len(self.values) else 0.0
+        self.scale = float(scale or measured or 1.0)
+        self.unit = unit
+
+    def extract(self):
+        """
+        从当前连接的模型中提取测点结果
+
+        返回:
+        - ndarray: 各测点的计算值
+        """
+        return self.extract_cases([self.load_case])[:, 0]
+
+    def extract_cases(self, load_cases):
+        """
+        一次请求提取多个荷载工况的测点结果
+
+        参数:
+        - load_cases: list, 荷载工况名称(带分析类型后缀，如"DL(ST)")
+
+        返回:
+        - ndarray: 形状为(测点数, 工况数)的计算值
+        """
+        processor = create_processor(self.result_type)
+        kwargs = {"force_unit": self.unit[0], "dist_unit": self.unit[1]}
+        if self.stage is None:
+            raw = processor.extract_general(self.ids, list(load_cases), **kwargs)
+        else:
+            raw = processor.extract_construction(self.ids, list(load_cases), [self.stage], **kwargs)
+        if not raw or "error" in raw:
+            raise RuntimeError(f"测点结果提取失败: {self.result_type} {self.component}")
+
+        df = processor.process_general_results(raw)
+        key = "Node" if "Node" in df.columns else "Elem"
+        if self.part is not None and "Part" in df.columns:
+            df = df[df["Part"] == self.part]
+        # 结果表中同名的分量列(如索单元I、J端的Tension)取第一列
+        column = list(df.columns).index(self.component)
+        table = pd.DataFrame({
+            "ID": df[key].to_numpy(), "Load": df["Load"].map(case_key).to_numpy(),
+            "Value": pd.to_numeric(df.iloc[:, column], errors="coerce").to_numpy()
+        }).drop_duplicates(["ID", "Load"])
+        values = table.pivot(index="ID", columns="Load", values="Value").reindex(
+            index=self.ids, columns=[case_key(case) for case in load_cases]
+        )
+        missing = values.isna().any(axis=1)
+        if missing.any():
+            raise RuntimeError(f"以下测点没有计算结果: {values.index[missing].tolist()[:10]}")
+        return values.to_numpy(dtype=np.float64)
+
+    def residual(self, simulated):
+        """归一化加权残差"""
+        if self.values is None:
+            raise ValueError(f"测点 {self.result_type} {self.component} 没有实测值")
+        return self.weight * (simulated - self.values) / self.scale
+
+
+class ModelEvaluator:
+    """
+    模型计算器，按参数值修改模型、运行分析并提取测点结果
+
+    每次计算时在指定的MIDAS实例中只提交与该实例上次取值不同的参数；
+    多组参数的计算分配到空闲实例并行进行，全部计算结果按参数值缓存
+    """
+
+    def __init__(self, parameters, measurements, instances=None):
+        """
+        参数:
+        - parameters: list, CalibrationParameter列表
+        - measurements: list, Measurement列表
+        - instances: list, MIDAS实例连接参数列表，每项为{"base_url": ..., "api_key": ...}，
+          各实例须打开相同的模型；None表示使用全局连接(不并行)
+        """
+        names = [p.name for p in parameters]
+        if len(set(names)) != len(names):
+            raise ValueError("修正参数名称重复")
+        self.parameters = list(parameters)
+        self.measurements = list(measurements)
+        self.instances = list(instances) if instances else [None]
+        self.offsets = np.cumsum([0] + [len(m.ids) for m in self.measurements])
+
+        self._pool = Queue()
+        for k in range(len(self.instances)):
+            self._pool.put(k)
+        self._applied = [None] * len(self.instances)
+        self._cache = {}
+        self._history = []
+        self._lock = threading.Lock()
+        self.surrogate = None
+
+    @property
+    def names(self):
+        """参数名称"""
+        return [p.name for p in self.parameters]
+
+    @property
+    def initial(self):
+        """参数初始值数组"""
+        return np.array([p.initial for p in self.parameters])
+
+    def to_values(self, u):
+        """归一化变量数组转换为参数值数组"""
+        return np.array([p.to_value(x) for p, x in zip(self.parameters, u)])
+
+    def to_units(self, values):
+        """参数值数组转换为归一化变量数组"""
+        return np.array([p.to_unit(v) for p, v in zip(self.parameters, values)])
+
+    def _run(self, instance, values):
+        """在指定实例中提交参数、运行分析并提取测点结果"""
+        connection = self.instances[instance]
+        context = midas_api.connect(**connection) if connection else nullcontext()
+        with context:
+            applied = self._applied[instance]
+            for k, parameter in enumerate(self.parameters):
+                if applied is None or values[k] != applied[k]:
+                    parameter.apply(values[k])
+            self._applied[instance] = values.copy()
+            if MidasOperations.analyze() is None:
+                raise RuntimeError(f"分析失败，参数: {dict(zip(self.names, values.tolist()))}")
+            return np.concatenate([m.extract() for m in self.measurements])
+
+    def use_surrogate(self, kind="gp", tolerance=0.01, radius=0.1, min_samples=None):
+        """
+        启用代理模型，以已完成的计算结果训练，满足信赖域和误差容差时代替真实分析
+
+        参数:
+        - kind, tolerance, radius, min_samples: 同ResponseSurface
+
+        返回:
+        - ResponseSurface: 代理模型，kind为None时关闭代理模型并返回None
+        """
+        if kind is None:
+            self.surrogate = None
+            return None
+        surrogate = ResponseSurface(kind, tolerance, radius, min_samples)
+        with self._lock:
+            for values, simulated in self._history:
+                surrogate.add(self.to_units(values), simulated)
+        self.surrogate = surrogate
+        return surrogate
+
+    def simulate(self, values, exact=False):
+        """
+        计算一组参数的测点结果(占用一个空闲实例，已缓存的直接返回，
+        启用代理模型且预测误差满足容差时返回预测值)
+
+        参数:
+        - values: array-like, 参数值
+        - exact: bool, 是否不使用代理模型
+
+        返回:
+        - ndarray: 按测点顺序排列的计算值
+        """
+        values = np.asarray(values, dtype=np.float64)
+        key = tuple(values.tolist())
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        if self.surrogate is not None and not exact:
+            predicted = self.surrogate.query(self.to_units(values))
+            if predicted is not None:
+                return predicted
+        instance = self._pool.get()
+        try:
+            simulated = self._run(instance, values)
+        finally:
+            self._pool.put(instance)
+        with self._lock:
+            self._cache[key] = simulated
+            self._history.append((values, simulated))
+        if self.surrogate is not None:
+            self.surrogate.add(self.to_units(values), simulated)
+        return simulated
+
+    def simulate_many(self, values):
+        """
+        并行计算多组参数的测点结果
+
+        参数:
+        - values: array-like, 形状为(组数, 参数数)的参数值
+
+        返回:
+        - ndarray: 形状为(组数, 测点数)的计算值
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        with ThreadPoolExecutor(max_workers=len(self.instances)) as executor:
+            return np.array(list(executor.map(midas_api.bind(self.simulate), values)))
+
+    def response_index(self):
+        """
+        测点标识
+
+        返回:
+        - MultiIndex: (结果类型, 分量, 施工阶段, 编号)
+        """
+        return pd.MultiIndex.from_tuples(
+            [(m.result_type, m.component, m.stage, i) for m in self.measurements for i in m.ids],
+            names=["Type", "Component", "Stage", "ID"]
+        )
+
+    def to_frame(self):
+        """
+        全部计算记录
+
+        返回:
+        - DataFrame: 每次计算一行，列为各参数值及各测点计算值(Sim0, Sim1, ...)
+        """
+        with self._lock:
+            history = list(self._history)
+        if not history:
+            return pd.DataFrame(columns=self.names)
+        df = pd.DataFrame(np.array([h[0] for h in history]), columns=self.names)
+        simulated = np.array([h[1] for h in history])
+        sim = pd.DataFrame(simulated, columns=[f"Sim{k}" for k in range(simulated.shape[1])])
+        return pd.concat([df, sim], axis=1)
+
+
+class Calibration(ModelEvaluator):
+    """
+    模型修正
+
+    使用方法:
+    >>> params = [material_parameter("E_C50", 2, c50_props), prestress_loss_parameter("loss", tendons, 1395)]
+    >>> data = [Measurement("displacement", nodes, "DZ", measured_dz, "合计(CS)", stage="CS30")]
+    >>> cal = Calibration(params, data, instances=[
+    ...     {"base_url": "https://localhost:10025/civil", "api_key": key1},
+    ...     {"base_url": "https://localhost:10026/civil", "api_key": key2}
+    ... ])
+    >>> cal.run()
+    >>> cal.to_frame()      # 全部计算记录
+    """
+
+    def __init__(self, parameters, measurements, instances=None, step=0.02):
+        """
+        参数:
+        - parameters: list, CalibrationParameter列表
+        - measurements: list, Measurement列表(须有实测值)
+        - instances: list, MIDAS实例连接参数列表(同ModelEvaluator)
+        - step: float, 有限差分步长(归一化变量)
+        """
+        super().__init__(parameters, measurements, instances)
+        self.step = step
+        self.result = None
+
+    def _residual(self, simulated):
+        """由计算值得到归一化加权残差"""
+        return np.concatenate([
+            m.residual(simulated[self.offsets[k]:self.offsets[k + 1]]) for k, m in enumerate(self.measurements)
+        ])
+
+    def residuals(self, u):
+        """
+        计算残差向量
+
+        参数:
+        - u: array-like, 归一化变量
+
+        返回:
+        - ndarray: 各测点的归一化加权残差
+        """
+        return self._residual(self.simulate(self.to_values(u)))
+
+    def jacobian(self, u):
+        """有限差分雅可比矩阵，各参数的扰动计算并行进行"""
+        u = np.asarray(u, dtype=np.float64)
+        steps = np.where(u + self.step <= 1.0, self.step, -self.step)
+        points = np.vstack([u, u + np.diag(steps)])
+        residuals = np.array([self._residual(sim) for sim in self.simulate_many([self.to_values(p) for p in points])])
+        return ((residuals[1:] - residuals[0]) / steps[:, None]).T
+
+    def run(self, max_nfev=50, **kwargs):
+        """
+        运行模型修正
+
+        参数:
+        - max_nfev: int, 最大迭代计算次数
+        - kwargs: least_squares的其他参数(如ftol、xtol、loss)
+
+        返回:
+        - Series: 修正后的参数值
+        """
+        u0 = self.to_units(self.initial)
+        print(f'开始模型修正，共{len(self.parameters)}个参数，{self.offsets[-1]}个测点，'
+              f'{len(self.instances)}个计算实例')
+        self.result = least_squares(
+            self.residuals, u0, jac=self.jacobian, bounds=(0.0, 1.0), max_nfev=max_nfev, **kwargs
+        )
+        values = pd.Series(self.to_values(self.result.x), index=self.names, name="Value")
+        if self.surrogate is not None:
+            # 修正结果以真实分析复核
+            residual = self._residual(self.simulate(values.to_numpy(), exact=True))
+            self.result.cost = 0.5 * float(residual @ residual)
+            print(f"代理模型回答{self.surrogate.hits}次")
+        print(f"模型修正完成，残差平方和 {2 * self.result.cost:.6g}，共计算{len(self._history)}次")
+        return values
+
+    def apply(self, values=None):
+        """
+        将参数值写入全局连接的模型
+
+        参数:
+        - values: dict/Series, 参数值，默认为修正结果
+        """
+        if values is None:
+            if self.result is None:
+                raise ValueError("尚未运行模型修正")
+            values = dict(zip(self.names, self.to_values(self.result.x)))
+        for parameter in self.parameters:
+            if parameter.name in values:
+                parameter.apply(values[parameter.name])
+
+    def to_frame(self):
+        """
+        全部计算记录
+
+        返回:
+        - DataFrame: 每次计算一行，列为各参数值、Cost(残差平方和)及各测点计算值(Sim0, Sim1, ...)
+        """
+        df = super().to_frame()
+        sim = df.filter(regex=r"^Sim\d+$").to_numpy(dtype=np.float64)
+        cost = [float(r @ r) for r in (self._residual(row) for row in sim)]
+        df.insert(len(self.names), "Cost", cost)
+        return df
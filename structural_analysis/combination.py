@@ -0,0 +1,287 @@
+"""荷载组合模块，由基本荷载工况结果在本地计算荷载组合，包括：
+- 从模型读取或自定义组合系数
+- 一次性提取全部基本工况结果
+- 以稀疏系数矩阵 × 工况结果数组计算组合结果
+支持线性相加、包络、SRSS和绝对值相加四种组合类型
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from .api import midas_api
+from .envelope import stack_results
+
+# MIDAS组合类型编号(iTYPE)与组合类型名称的对应关系
+COMBINATION_TYPES = {
+    0: "ADD",       # 线性相加
+    1: "ENVELOPE",  # 包络
+    2: "ABS",       # 绝对值相加
+    3: "SRSS"       # 平方和开方
+}
+
+_CASE_SUFFIX = re.compile(r"\((ST|CS|CB|CBC|CBS|CBmax|CBmin|MV|SM|RS|TH)\)$")
+
+
+def case_key(name):
+    """
+    去除工况名称末尾的分析类型后缀，用于匹配结果表中的Load列
+
+    示例:
+    >>> case_key("DL(ST)")
+    'DL'
+    """
+    return _CASE_SUFFIX.sub("", str(name).strip())
+
+
+class LoadCombination:
+    """
+    荷载组合定义
+
+    属性:
+    - name: str, 组合名称
+    - factors: dict, {基本工况名称: 组合系数}，工况名称需带分析类型后缀，如"DL(ST)"
+    - comb_type: str, 组合类型("ADD", "ENVELOPE", "ABS", "SRSS")
+    """
+
+    def __init__(self, name, factors, comb_type="ADD"):
+        if comb_type not in COMBINATION_TYPES.values():
+            raise ValueError(
+                f"不支持的组合类型: {comb_type}。支持的类型: {', '.join(COMBINATION_TYPES.values())}"
+            )
+        self.name = name
+        self.factors = dict(factors)
+        self.comb_type = comb_type
+
+    def __repr__(self):
+        return f"LoadCombination({self.name!r}, {self.factors!r}, {self.comb_type!r})"
+
+
+class CombinationEngine:
+    """
+    荷载组合计算引擎
+
+    使用方法:
+    >>> engine = CombinationEngine()
+    >>> engine.load_from_model()
+    >>> force = create_processor("beam_force")
+    >>> df_cases = engine.fetch_cases(force, elems="1 to 31")
+    >>> df_comb = engine.combine(df_cases)
+    """
+
+    def __init__(self, combinations=None):
+        """
+        初始化组合引擎
+
+        参数:
+        - combinations: list, LoadCombination列表(可选)
+        """
+        self.combinations = {}
+        for comb in combinations or []:
+            self.combinations[comb.name] = comb
+
+    def add_combination(self, name, factors, comb_type="ADD"):
+        """
+        添加自定义荷载组合
+
+        参数:
+        - name: str, 组合名称
+        - factors: dict, {基本工况名称: 组合系数}，如{"DL(ST)": 1.2, "LL(ST)": 1.4}
+        - comb_type: str, 组合类型("ADD", "ENVELOPE", "ABS", "SRSS")
+
+        返回:
+        - LoadCombination: 组合定义
+        """
+        comb = LoadCombination(name, factors, comb_type)
+        self.combinations[name] = comb
+        return comb
+
+    def load_from_model(self, endpoint="/db/LCOM-GEN"):
+        """
+        从模型读取荷载组合定义
+
+        参数:
+        - endpoint: str, 组合数据接口，默认为一般组合"/db/LCOM-GEN"
+
+        返回:
+        - dict: {组合名称: LoadCombination}
+        """
+        print('开始查询荷载组合')
+        response = midas_api.request("GET", endpoint, {})
+        table = response.get(endpoint.split("/")[-1], {}) if response else {}
+        if not table:
+            print("荷载组合查询失败")
+            return self.combinations
+
+        for item in table.values():
+            factors = {}
+            for comb in item.get("vCOMB", []):
+                case_name = f'{comb["LCNAME"]}({comb["ANAL"]})'
+                factors[case_name] = factors.get(case_name, 0) + comb["FACTOR"]
+            comb_type = COMBINATION_TYPES.get(item.get("iTYPE", 0), "ADD")
+            self.combinations[item["NAME"]] = LoadCombination(item["NAME"], factors, comb_type)
+
+        print(f"荷载组合查询完成，共{len(table)}个组合")
+        return self.combinations
+
+    def _expand(self, name, factor=1.0, depth=0):
+        """将线性组合(可引用其它线性组合)展开为基本工况系数"""
+        expanded = {}
+        for member in self._members(name, factor, depth):
+            for case, f in member.items():
+                expanded[case] = expanded.get(case, 0) + f
+        return expanded
+
+    def _members(self, name, factor=1.0, depth=0):
+        """
+        获取组合的各组成项，每项展开为{基本工况: 系数}
+
+        组成项引用的线性组合会被展开，引用非线性组合(包络、SRSS等)时无法展开
+        """
+        if depth > 10:
+            raise ValueError(f"荷载组合 {name} 嵌套层数过多")
+
+        members = []
+        for case, f in self.combinations[name].factors.items():
+            nested = case_key(case)
+            if case.endswith("(CB)") and nested in self.combinations:
+                if self.combinations[nested].comb_type != "ADD":
+                    raise ValueError(f"荷载组合 {name} 引用的组合 {nested} 不是线性组合，无法展开")
+                members.append(self._expand(nested, f * factor, depth + 1))
+            else:
+                members.append({case: f * factor})
+        return members
+
+    @property
+    def basic_cases(self):
+        """全部组合引用的基本工况名称列表(按首次出现顺序)"""
+        return self.cases_for()
+
+    def cases_for(self, names=None):
+        """
+        指定组合引用的基本工况名称列表(按首次出现顺序)，只展开指定的组合
+
+        参数:
+        - names: list, 组合名称列表，默认为全部组合
+
+        返回:
+        - list: 基本工况名称
+        """
+        cases = []
+        for name in names or self.combinations:
+            for member in self._members(name):
+                for case in member:
+                    if case not in cases:
+                        cases.append(case)
+        return cases
+
+    def _sparse(self, rows_of_factors, cases):
+        """由{基本工况: 系数}列表生成稀疏系数矩阵"""
+        case_index = {case: j for j, case in enumerate(cases)}
+        rows, cols, data = [], [], []
+        for i, factors in enumerate(rows_of_factors):
+            for case, f in factors.items():
+                rows.append(i)
+                cols.append(case_index[case])
+                data.append(f)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(rows_of_factors), len(cases)))
+
+    def factor_matrix(self, names=None):
+        """
+        生成线性组合的稀疏系数矩阵(各组成项系数之和)
+
+        参数:
+        - names: list, 组合名称列表，默认为全部组合
+
+        返回:
+        - tuple: (matrix, names, cases)
+            - matrix: scipy.sparse.csr_matrix, 形状为(组合数, 基本工况数)
+            - names: list, 组合名称
+            - cases: list, 基本工况名称
+        """
+        names = list(names or self.combinations)
+        cases = self.cases_for(names)
+        matrix = self._sparse([self._expand(name) for name in names], cases)
+        return matrix, names, cases
+
+    def fetch_cases(self, processor, selection=None, names=None, **kwargs):
+        """
+        一次请求提取基本工况的结果
+
+        参数:
+        - processor: PostProcessor, 结果处理器(如create_processor("beam_force"))
+        - selection: 单元/节点选择参数，同extract_general的elems/nodes参数(也可用elems=/nodes=传入)
+        - names: list, 需要计算的组合名称，只提取这些组合引用的基本工况，默认为全部组合
+        - kwargs: 其他extract_general参数(单位、格式等)
+
+        返回:
+        - DataFrame: 基本工况结果的长表
+        """
+        args = () if selection is None else (selection,)
+        raw = processor.extract_general(*args, load_case=self.cases_for(names), **kwargs)
+        return processor.process_general_results(raw)
+
+    def combine(self, results, components=None, names=None):
+        """
+        由基本工况结果计算荷载组合结果
+
+        参数:
+        - results: DataFrame/list, 基本工况结果(fetch_cases的返回值或多个工况结果表)
+        - components: list, 参与组合的分量，默认为全部数值列
+        - names: list, 需要计算的组合名称，默认为全部组合
+
+        返回:
+        - DataFrame: 组合结果长表，Load列为"组合名(CB)"，包络组合输出
+                     "组合名(CBmax)"和"组合名(CBmin)"两组结果；
+                     某结果行缺少系数不为0的基本工况时，该行组合结果为NaN
+        """
+        values, loads, rows, components = stack_results(results, "Load", components)
+        names = list(names or self.combinations)
+        cases = self.cases_for(names)
+
+        # 按去除后缀的名称匹配基本工况与结果表中的Load列
+        load_index = {case_key(load): k for k, load in enumerate(loads)}
+        missing = [case for case in cases if case_key(case) not in load_index]
+        if missing:
+            raise KeyError(f"结果数据中缺少基本工况: {', '.join(missing)}")
+
+        stacked = values[[load_index[case_key(case)] for case in cases]]
+        # 缺失值保留为NaN，使缺少基本工况的结果行组合结果为NaN，而不是按0计算
+        incomplete = np.isnan(stacked).all(axis=2).any(axis=0)
+        if incomplete.any():
+            print(f"{incomplete.sum()}个结果行缺少部分基本工况的结果，其组合结果为NaN")
+        stacked = stacked.reshape(len(cases), -1)
+
+        frames = []
+        linear = [name for name in names if self.combinations[name].comb_type == "ADD"]
+        if linear:
+            matrix = self._sparse([self._expand(name) for name in linear], cases)
+            labels = [f"{name}(CB)" for name in linear]
+            frames.append(self._to_frame(matrix @ stacked, labels, rows, components))
+
+        for name in names:
+            comb_type = self.combinations[name].comb_type
+            if comb_type == "ADD":
+                continue
+            # 各组成项结果: (组成项数, 结果行×分量)
+            member_values = self._sparse(self._members(name), cases) @ stacked
+            if comb_type == "ENVELOPE":
+                combined = np.vstack([member_values.max(axis=0), member_values.min(axis=0)])
+                labels = [f"{name}(CBmax)", f"{name}(CBmin)"]
+            elif comb_type == "ABS":
+                combined = np.abs(member_values).sum(axis=0, keepdims=True)
+                labels = [f"{name}(CB)"]
+            else:
+                combined = np.sqrt(np.square(member_values).sum(axis=0, keepdims=True))
+                labels = [f"{name}(CB)"]
+            frames.append(self._to_frame(combined, labels, rows, components))
+
+        return pd.concat(frames, ignore_index=True)
+
+    def _to_frame(self, combined, labels, rows, components):
+        """将(组合数, 结果行×分量)数组转换为长表"""
+        n_rows = len(rows)
+        df = rows.loc[np.tile(rows.index, len(labels))].reset_index(drop=True)
+        df.insert(1, "Load", np.repeat(labels, n_rows))
+        df[components] = np.asarray(combined).reshape(len(labels) * n_rows, len(components))
+        return df
@@ -0,0 +1,290 @@
+"""计算结果对比模块，对比两次分析的结果表，包括：
+- 按单元(节点)、部件、工况、施工阶段等标识列对齐两次结果
+- 绝对差值和相对差值
+- 变化最大的前N个结果行
+- 按单元、阶段等分组的差值统计
+对齐以整数编码和排序查找完成，逐个分量计算，内存占用与结果行数成正比
+"""
+
+import numpy as np
+import pandas as pd
+from .result_tensor import StageResultTensor
+
+COMPARE_KEYS = ["Elem", "Node", "Part", "Load", "Stage", "Step"]
+
+
+def _as_frame(results):
+    """将DataFrame列表或施工阶段结果张量统一转换为DataFrame"""
+    if isinstance(results, StageResultTensor):
+        return results.to_frame()
+    if isinstance(results, list):
+        return pd.concat(results, ignore_index=True)
+    return results
+
+
+def _occurrence(codes):
+    """同一编码在数组中第几次出现(从0开始)，用于区分标识列完全相同的重复行"""
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.r_[0, np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1]
+    run_start = np.repeat(starts, np.diff(np.r_[starts, len(codes)]))
+    occurrence = np.empty(len(codes), dtype=np.int64)
+    occurrence[order] = np.arange(len(codes)) - run_start
+    return occurrence
+
+
+def align_keys(before, after, keys):
+    """
+    按标识列对齐两个结果表
+
+    参数:
+    - before: DataFrame, 对比基准的结果
+    - after: DataFrame, 对比的结果
+    - keys: list, 标识列
+
+    返回:
+    - tuple: (rows_before, rows_after, only_before, only_after)，均为行位置数组
+        - rows_before, rows_after: 两表中相互匹配的行
+        - only_before, only_after: 仅在一个表中存在的行
+    """
+    n_before = len(before)
+    shape, codes = [], []
+    for key in keys:
+        # 两表一起编码，保证相同的标识值得到相同的编码
+        key_codes, uniques = pd.factorize(pd.concat([before[key], after[key]], ignore_index=True), sort=False)
+        # 缺失值(编码为-1)作为一个单独的标识值
+        key_codes = np.where(key_codes < 0, len(uniques), key_codes)
+        codes.append(key_codes)
+        shape.append(len(uniques) + 1)
+    combined = np.ravel_multi_index(codes, shape) if keys else np.zeros(n_before + len(after), dtype=np.int64)
+    code_before, code_after = combined[:n_before], combined[n_before:]
+
+    order_before, order_after = np.argsort(code_before), np.argsort(code_after)
+    sorted_before, sorted_after = code_before[order_before], code_after[order_after]
+    if (sorted_before[1:] == sorted_before[:-1]).any() or (sorted_after[1:] == sorted_after[:-1]).any():
+        # 存在重复行时按出现顺序逐一匹配
+        radix = max(len(before), len(after), 1)
+        code_before = code_before.astype(np.int64) * radix + _occurrence(code_before)
+        code_after = code_after.astype(np.int64) * radix + _occurrence(code_after)
+        order_before, order_after = np.argsort(code_before), np.argsort(code_after)
+        sorted_before, sorted_after = code_before[order_before], code_after[order_after]
+
+    # 有序查询，按基准结果的原始行顺序输出
+    pos = np.clip(np.searchsorted(sorted_after, sorted_before), 0, max(len(sorted_after) - 1, 0))
+    found_sorted = sorted_after[pos] == sorted_before if len(sorted_after) else np.zeros(n_before, dtype=bool)
+    found = np.zeros(n_before, dtype=bool)
+    found[order_before] = found_sorted
+    match = np.empty(n_before, dtype=np.int64)
+    match[order_before] = order_after[pos] if len(sorted_after) else 0
+
+    rows_before = np.flatnonzero(found)
+    rows_after = match[rows_before]
+    matched_after = np.zeros(len(after), dtype=bool)
+    matched_after[rows_after] = True
+    return rows_before, rows_after, np.flatnonzero(~found), np.flatnonzero(~matched_after)
+
+
+class RunComparison:
+    """
+    两次分析结果的对比
+
+    属性:
+    - keys: list, 对齐使用的标识列
+    - components: list, 对比的分量
+    - rows: DataFrame, 匹配结果行的标识列
+    - before: ndarray, 基准结果，形状为(结果行, 分量)
+    - after: ndarray, 对比结果，形状为(结果行, 分量)
+    - only_before: DataFrame, 仅在基准结果中存在的结果行(标识列)
+    - only_after: DataFrame, 仅在对比结果中存在的结果行(标识列)
+
+    使用方法:
+    >>> cmp = compare_runs(raw_before, raw_after)
+    >>> cmp.top(20, "Moment-y")
+    >>> cmp.group_stats("Elem", "Moment-y")
+    """
+
+    def __init__(self, before, after, keys=None, components=None, dtype=np.float64):
+        """
+        对齐两次分析的结果
+
+        参数:
+        - before: DataFrame/list/StageResultTensor, 对比基准的结果(处理后的结果数据)
+        - after: DataFrame/list/StageResultTensor, 对比的结果
+        - keys: list, 标识列，默认为COMPARE_KEYS中两表共有的列
+        - components: list, 对比的分量，默认为两表共有的数值列
+        - dtype: 数值数组的类型，可用np.float32减少内存
+        """
+        before, after = _as_frame(before), _as_frame(after)
+        if keys is None:
+            keys = [key for key in COMPARE_KEYS if key in before.columns and key in after.columns]
+        if components is None:
+            excluded = set(keys) | {"Index", "NodeI", "NodeJ"}
+            components = [
+                col for col in before.columns
+                if col in after.columns and col not in excluded
+                and pd.api.types.is_numeric_dtype(before[col]) and pd.api.types.is_numeric_dtype(after[col])
+            ]
+        self.keys = list(keys)
+        self.components = list(components)
+
+        rows_before, rows_after, only_before, only_after = align_keys(before, after, self.keys)
+        self.rows = before[self.keys].iloc[rows_before].reset_index(drop=True)
+        self.only_before = before[self.keys].iloc[only_before].reset_index(drop=True)
+        self.only_after = after[self.keys].iloc[only_after].reset_index(drop=True)
+
+        # 逐个分量取值，避免复制整个结果表
+        self.before = np.empty((len(rows_before), len(self.components)), dtype=dtype)
+        self.after = np.empty((len(rows_after), len(self.components)), dtype=dtype)
+        for k, col in enumerate(self.components):
+            self.before[:, k] = before[col].to_numpy(dtype=dtype)[rows_before]
+            self.after[:, k] = after[col].to_numpy(dtype=dtype)[rows_after]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _column(self, component):
+        """分量在数组中的列位置"""
+        if component not in self.components:
+            raise ValueError(f"不存在分量 {component}，可用分量: {', '.join(self.components)}")
+        return self.components.index(component)
+
+    def delta(self, component):
+        """
+        绝对差值(对比结果 - 基准结果)
+
+        参数:
+        - component: str, 分量名称
+
+        返回:
+        - ndarray: 各结果行的差值
+        """
+        k = self._column(component)
+        return self.after[:, k] - self.before[:, k]
+
+    def relative(self, component, floor=None):
+        """
+        相对差值(差值 / |基准结果|)
+
+        参数:
+        - component: str, 分量名称
+        - floor: float, 分母下限，默认为该分量基准结果绝对值最大值的1e-6倍，避免接近0的值放大误差
+
+        返回:
+        - ndarray: 各结果行的相对差值
+        """
+        base = np.abs(self.before[:, self._column(component)])
+        if floor is None:
+            floor = 1e-6 * (np.nanmax(base) if len(base) else 0.0) or np.finfo(float).tiny
+        return self.delta(component) / np.maximum(base, floor)
+
+    def to_frame(self, components=None):
+        """
+        将对比结果转换为DataFrame
+
+        参数:
+        - components: list, 输出的分量，默认为全部分量
+
+        返回:
+        - DataFrame: 标识列及各分量的 {分量}_before、{分量}_after、{分量}_delta、{分量}_rel 列
+        """
+        df = self.rows.copy()
+        for component in components or self.components:
+            k = self._column(component)
+            df[f"{component}_before"] = self.before[:, k]
+            df[f"{component}_after"] = self.after[:, k]
+            df[f"{component}_delta"] = self.delta(component)
+            df[f"{component}_rel"] = self.relative(component)
+        return df
+
+    def top(self, n, component, by="abs"):
+        """
+        差值最大的前n个结果行
+
+        参数:
+        - n: int, 行数
+        - component: str, 分量名称
+        - by: str, 排序依据，"abs"为绝对差值，"rel"为相对差值
+
+        返回:
+        - DataFrame: 标识列及基准值、对比值、差值、相对差值，按差值绝对值降序排列
+        """
+        delta, rel = self.delta(component), self.relative(component)
+        score = np.abs(rel if by == "rel" else delta)
+        score = np.where(np.isnan(score), -np.inf, score)
+        n = min(n, len(score))
+        index = np.argpartition(-score, n - 1)[:n] if n else np.empty(0, dtype=np.intp)
+        index = index[np.argsort(-score[index], kind="stable")]
+
+        k = self._column(component)
+        df = self.rows.iloc[index].reset_index(drop=True)
+        df["Before"] = self.before[index, k]
+        df["After"] = self.after[index, k]
+        df["Delta"] = delta[index]
+        df["Relative"] = rel[index]
+        return df
+
+    def group_stats(self, by, component):
+        """
+        按标识列分组统计差值
+
+        参数:
+        - by: str/list, 分组的标识列，如"Elem"、"Stage"
+        - component: str, 分量名称
+
+        返回:
+        - DataFrame: 每组一行，列为 Count, MaxAbsDelta, MeanDelta, RmsDelta, MaxAbsRelative
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        groups = self.rows.groupby(by, sort=True)
+        codes = groups.ngroup().to_numpy()
+        n_groups = groups.ngroups
+
+        delta = np.nan_to_num(self.delta(component).astype(np.float64))
+        rel = np.nan_to_num(np.abs(self.relative(component)).astype(np.float64))
+        count = np.bincount(codes, minlength=n_groups)
+        max_abs = np.zeros(n_groups)
+        np.maximum.at(max_abs, codes, np.abs(delta))
+        max_rel = np.zeros(n_groups)
+        np.maximum.at(max_rel, codes, rel)
+
+        stats = groups.size().index.to_frame(index=False)
+        stats["Count"] = count
+        stats["MaxAbsDelta"] = max_abs
+        stats["MeanDelta"] = np.bincount(codes, delta, n_groups) / np.maximum(count, 1)
+        stats["RmsDelta"] = np.sqrt(np.bincount(codes, delta ** 2, n_groups) / np.maximum(count, 1))
+        stats["MaxAbsRelative"] = max_rel
+        return stats
+
+    def summary(self):
+        """
+        各分量的差值汇总
+
+        返回:
+        - DataFrame: 每个分量一行，列为 MaxAbsDelta, RmsDelta, MaxAbsRelative
+        """
+        records = []
+        for component in self.components:
+            delta = self.delta(component)
+            records.append({
+                "Component": component,
+                "MaxAbsDelta": np.nanmax(np.abs(delta)) if len(delta) else np.nan,
+                "RmsDelta": np.sqrt(np.nanmean(delta ** 2)) if len(delta) else np.nan,
+                "MaxAbsRelative": np.nanmax(np.abs(self.relative(component))) if len(delta) else np.nan
+            })
+        return pd.DataFrame(records).set_index("Component")
+
+
+def compare_runs(before, after, keys=None, components=None, dtype=np.float64):
+    """
+    对比两次分析的结果(参数同RunComparison)
+
+    返回:
+    - RunComparison: 对比结果
+
+    示例:
+    >>> before = force.process_general_results(force.extract_general(elems="主梁", load_case=cases))
+    >>> # ... 修改模型并重新分析 ...
+    >>> after = force.process_general_results(force.extract_general(elems="主梁", load_case=cases))
+    >>> compare_runs(before, after).top(20, "Moment-y")
+    """
+    return RunComparison(before, after, keys=keys, components=components, dtype=dtype)
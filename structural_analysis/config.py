@@ -1,15 +1,26 @@
 """配置模块,包含全局配置和常量"""
 
-import winreg
+try:
+    import winreg
+except ImportError:
+    # 非Windows环境(如运行测试)无注册表，本地计算模块仍可使用
+    winreg = None
 
 class MidasConfig:
     def __init__(self):
         self.base_url, self.api_key = self._get_midas_connection()
         
     def _get_midas_connection(self):
-        """从注册表获取MIDAS连接信息"""
+        """从注册表获取MIDAS连接信息，未找到时返回(None, None)，需通过midas_api.connect指定连接"""
+        if winreg is None:
+            return None, None
         reg_path = r"SOFTWARE\MIDAS\CVLwNX_CH\CONNECTION"
-        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path) as key:
+        try:
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path)
+        except OSError:
+            print("未在注册表中找到MIDAS连接信息")
+            return None, None
+        with key:
             uri = winreg.QueryValueEx(key, "URI")[0]
             port = winreg.QueryValueEx(key, "PORT")[0]
             api_key = winreg.QueryValueEx(key, "Key")[0]
@@ -0,0 +1,124 @@
+"""绘图数据处理模块，提供结果曲线的向量化点处理和保形降采样功能，包括：
+- 相邻两点平均(PartI/PartJ合并)
+- 最大/最小值分桶降采样
+- LTTB(Largest-Triangle-Three-Buckets)降采样
+降采样会保留每个分桶中的峰值，曲线极值不会丢失
+"""
+
+import numpy as np
+
+
+def pair_average(values):
+    """
+    将相邻两点合并为一个点(取平均值)，长度为奇数时保留最后一个点
+
+    参数:
+    - values: array-like, 原始数据
+
+    返回:
+    - ndarray: 合并后的数据
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_pairs = len(values) // 2
+    averaged = values[:2 * n_pairs].reshape(n_pairs, 2).mean(axis=1)
+    if len(values) % 2:
+        averaged = np.append(averaged, values[-1])
+    return averaged
+
+
+def minmax_downsample(x, y, max_points):
+    """
+    最大/最小值分桶降采样，每个分桶保留最小值点和最大值点
+
+    参数:
+    - x: array-like, 横坐标(需单调)
+    - y: array-like, 纵坐标
+    - max_points: int, 输出点数上限，至少为4(首尾两点和一个分桶的最小、最大值点)
+
+    返回:
+    - tuple: (x, y) 降采样后的数据
+    """
+    if max_points < 4:
+        raise ValueError(f"最大/最小值降采样的输出点数至少为4: {max_points}")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = (max_points - 2) // 2
+    if n <= max_points:
+        return x, y
+
+    # 首尾两点单独保留，其余点等分为n_buckets个分桶
+    bucket_size = int(np.ceil((n - 2) / n_buckets))
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n - 2] = y[1:-1]
+    buckets = padded.reshape(n_buckets, bucket_size)
+
+    valid = ~np.isnan(buckets).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * bucket_size + 1
+    i_min = np.nanargmin(buckets[valid], axis=1) + offsets
+    i_max = np.nanargmax(buckets[valid], axis=1) + offsets
+
+    index = np.unique(np.concatenate([[0, n - 1], i_min, i_max]))
+    return x[index], y[index]
+
+
+def lttb_downsample(x, y, max_points):
+    """
+    LTTB降采样，每个分桶保留与相邻分桶构成最大三角形面积的点
+
+    参数:
+    - x: array-like, 横坐标(需单调)
+    - y: array-like, 纵坐标
+    - max_points: int, 输出点数
+
+    返回:
+    - tuple: (x, y) 降采样后的数据
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    index = np.empty(max_points, dtype=np.intp)
+    index[0], index[-1] = 0, n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        # 下一分桶的平均点
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        avg_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        index[i + 1] = a
+
+    return x[index], y[index]
+
+
+def downsample(x, y, max_points=None, method="minmax"):
+    """
+    按指定方法降采样绘图数据
+
+    参数:
+    - x: array-like, 横坐标
+    - y: array-like, 纵坐标
+    - max_points: int/None, 输出点数上限，None表示不降采样
+    - method: str, 降采样方法("minmax"或"lttb")
+
+    返回:
+    - tuple: (x, y) 降采样后的数据
+    """
+    if max_points is None or len(y) <= max_points:
+        return np.asarray(x), np.asarray(y)
+    if method == "minmax":
+        return minmax_downsample(x, y, max_points)
+    if method == "lttb":
+        return lttb_downsample(x, y, max_points)
+    raise ValueError(f"不支持的降采样方法: {method}。支持的方法: minmax, lttb")
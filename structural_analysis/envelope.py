@@ -0,0 +1,198 @@
+"""包络计算模块，提供荷载工况/施工阶段结果的包络功能，包括：
+- 多工况结果堆叠为(工况, 结果行, 分量)数组
+- 最大值、最小值、绝对值最大值包络
+- 各包络值对应的控制工况(或施工阶段)
+- 包络图绘制
+"""
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from .result_tensor import StageResultTensor
+
+ENVELOPE_KEYS = ["Elem", "Node", "Part"]
+
+
+def stack_results(results, by="Load", components=None, keys=None):
+    """
+    将多个工况(或施工阶段)的结果表对齐堆叠为三维数组
+
+    参数:
+    - results: DataFrame/list, 结果数据:
+        - DataFrame: 包含多个工况的长表，以by列区分工况
+        - list: 每个工况(阶段)一个DataFrame，如process_construction_results的返回值
+    - by: str, 区分工况的列名("Load"或"Stage")
+    - components: list, 参与包络的分量，默认为全部数值列
+    - keys: list, 结果行的标识列，默认为Elem/Node与Part中存在的列
+
+    含Step列(每个阶段多个步骤)时，按Stage区分工况则工况标签为"阶段:步骤"(与StageResultTensor一致)；
+    按其他列区分工况时Stage、Step作为结果行的标识列。标识列或工况为空的行被剔除，同一工况的结果行重复时报错
+
+    返回:
+    - tuple: (values, cases, rows, components)
+        - values: ndarray, 形状为(工况, 结果行, 分量)，缺失值为NaN
+        - cases: Index, 工况标签
+        - rows: DataFrame, 结果行的标识列
+        - components: list, 分量名称
+    """
+    df = pd.concat(results, ignore_index=True) if isinstance(results, list) else results
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    if keys is None:
+        keys = [col for col in ENVELOPE_KEYS if col in df.columns]
+    if components is None:
+        excluded = set(keys) | {"Load", "Stage", "Step", "NodeI", "NodeJ"}
+        components = [
+            col for col in df.columns
+            if col not in excluded and pd.api.types.is_numeric_dtype(df[col])
+        ]
+
+    if by == "Stage" and "Step" in df.columns:
+        labels = df["Stage"].astype(str) + ":" + df["Step"].astype(str)
+        df = df.assign(Stage=labels.where(df["Stage"].notna() & df["Step"].notna()))
+    elif by not in ("Stage", "Step"):
+        keys = list(keys) + [col for col in ["Stage", "Step"] if col in df.columns and col not in keys]
+
+    valid = df[list(keys) + [by]].notna().all(axis=1)
+    if not valid.all():
+        print(f"包络计算忽略{(~valid).sum()}行标识列或工况为空的结果")
+        df = df[valid]
+
+    case_codes, cases = pd.factorize(df[by], sort=False)
+    groups = df.groupby(keys, sort=True)
+    row_codes = groups.ngroup().to_numpy()
+    rows = groups.size().index.to_frame(index=False)
+    if len(np.unique(case_codes.astype(np.int64) * len(rows) + row_codes)) < len(df):
+        raise ValueError(f"同一{by}中存在重复的结果行，请通过keys指定完整的标识列")
+
+    values = np.full((len(cases), len(rows), len(components)), np.nan)
+    values[case_codes, row_codes] = df[components].to_numpy(dtype=np.float64)
+    return values, cases, rows, list(components)
+
+
+def envelope_from_array(values, cases):
+    """
+    对堆叠数组沿工况轴做包络
+
+    参数:
+    - values: ndarray, 形状为(工况, ...)的结果数组，缺失值为NaN
+    - cases: array-like, 工况标签
+
+    返回:
+    - dict: 包含 max, min, absmax 及对应控制工况 max_case, min_case, absmax_case，
+            各项形状均为values.shape[1:]
+    """
+    cases = np.asarray(cases, dtype=object)
+    missing = np.isnan(values)
+    all_missing = missing.all(axis=0)
+
+    i_max = np.where(missing, -np.inf, values).argmax(axis=0)
+    i_min = np.where(missing, np.inf, values).argmin(axis=0)
+    i_abs = np.where(missing, -np.inf, np.abs(values)).argmax(axis=0)
+
+    def take(index):
+        picked = np.take_along_axis(values, index[np.newaxis], axis=0)[0]
+        label = cases[index]
+        label[all_missing] = None
+        return picked, label
+
+    env = {}
+    env["max"], env["max_case"] = take(i_max)
+    env["min"], env["min_case"] = take(i_min)
+    env["absmax"], env["absmax_case"] = take(i_abs)
+    return env
+
+
+def compute_envelope(results, components=None, by="Load", keys=None):
+    """
+    计算结果包络(最大值、最小值、绝对值最大值及其控制工况)
+
+    参数:
+    - results: DataFrame/list/StageResultTensor, 结果数据:
+        - DataFrame: 包含多个荷载工况的长表(如多次extract_general结果拼接)
+        - list: 每个工况(阶段)一个DataFrame
+        - StageResultTensor: 施工阶段结果张量，沿阶段和步骤包络
+    - components: list, 参与包络的分量，默认为全部数值列
+    - by: str, 区分工况的列名("Load"或"Stage")，对StageResultTensor无效
+    - keys: list, 结果行的标识列，默认为Elem/Node与Part中存在的列
+
+    返回:
+    - DataFrame: 每个结果行与分量一行，列包括标识列、Component、
+                 Max、Max_Case、Min、Min_Case、AbsMax、AbsMax_Case
+
+    示例:
+    >>> df = pd.concat([force.process_general_results(force.extract_general(load_case=lc))
+    ...                 for lc in ["cLCB1(CB)", "cLCB2(CB)"]])
+    >>> env = compute_envelope(df, components=["Moment-y"])
+    """
+    if isinstance(results, StageResultTensor):
+        values, cases, rows, components = _stack_tensor(results, components)
+    else:
+        values, cases, rows, components = stack_results(results, by, components, keys)
+
+    env = envelope_from_array(values, cases)
+
+    n_rows, n_comp = len(rows), len(components)
+    out = rows.loc[rows.index.repeat(n_comp)].reset_index(drop=True)
+    out["Component"] = np.tile(components, n_rows)
+    for name, column in [("max", "Max"), ("min", "Min"), ("absmax", "AbsMax")]:
+        out[column] = env[name].reshape(-1)
+        out[f"{column}_Case"] = env[f"{name}_case"].reshape(-1)
+    return out
+
+
+def _stack_tensor(tensor, components=None):
+    """将施工阶段结果张量展开为(阶段×步骤, 单元×部件, 分量)数组"""
+    components = components or tensor.components
+    comp_index = [tensor.components.index(c) for c in components]
+
+    n_stage, n_step, n_elem, n_part, _ = tensor.shape
+    values = np.asarray(tensor.values)[..., comp_index].reshape(
+        n_stage * n_step, n_elem * n_part, len(components)
+    )
+
+    if n_step == 1:
+        cases = list(tensor.stages)
+    else:
+        cases = [f"{stage}:{step}" for stage in tensor.stages for step in tensor.steps]
+
+    rows = pd.DataFrame({
+        tensor.key: np.repeat(tensor.elems, n_part),
+        "Part": np.tile(tensor.parts, n_elem)
+    })
+    if tensor.parts == [""]:
+        rows = rows.drop(columns="Part")
+    return values, cases, rows, list(components)
+
+
+def plot_envelope(env, component, ax=None, title=None, part=None):
+    """
+    绘制包络图(最大值与最小值曲线)
+
+    参数:
+    - env: DataFrame, compute_envelope的返回值
+    - component: str, 绘制的分量
+    - ax: matplotlib.axes, 绘图轴对象，默认新建图形
+    - title: str, 图表标题
+    - part: str, 仅绘制指定部件(如"PartI")，默认全部
+
+    返回:
+    - matplotlib.axes: 绘图轴对象
+    """
+    data = env[env["Component"] == component]
+    if part is not None and "Part" in data.columns:
+        data = data[data["Part"] == part]
+    key = "Elem" if "Elem" in data.columns else "Node"
+
+    if ax is None:
+        plt.figure(figsize=(10, 3), dpi=100)
+        ax = plt.gca()
+
+    ax.plot(data[key], data["Max"], linestyle="-", label="Max")
+    ax.plot(data[key], data["Min"], linestyle="--", label="Min")
+    ax.set_xlabel("单元编号" if key == "Elem" else "节点号", fontsize=10, family='SimSun')
+    ax.set_ylabel(f"{component} (单位)", fontsize=10, family='SimSun')
+    ax.set_title(title or f"{component} 包络图", fontsize=10, family='SimSun')
+    ax.legend()
+    ax.grid(True)
+    return ax
@@ -0,0 +1,321 @@
+"""结果导出模块，将/post/table结果表流式写入列式存储，包括：
+- Parquet：按 表/荷载工况/施工阶段 分区的目录(Hive分区格式)，每次写入生成一个压缩文件
+- HDF5：按 表/荷载工况/施工阶段 分组，每列为可扩展的分块压缩数据集，每次写入追加
+- 按列、荷载工况和施工阶段读取，Parquet支持内存映射读取
+Parquet依赖pyarrow，HDF5依赖h5py，仅在使用对应格式时导入
+"""
+
+import os
+from urllib.parse import quote, unquote
+import pandas as pd
+
+# 分区列，依次为荷载工况和施工阶段
+PARTITION_COLUMNS = ["Load", "Stage"]
+
+FORMATS = ["parquet", "hdf5"]
+
+
+def _require(module, package):
+    """导入可选依赖，未安装时给出安装提示"""
+    try:
+        return __import__(module, fromlist=["_"])
+    except ImportError as e:
+        raise ImportError(f"导出该格式需要安装{package}: pip install {package}") from e
+
+
+def unique_columns(columns):
+    """
+    重复的列名依次加".1"、".2"等后缀(如索单元I、J端的Tension)，首次出现的列名不变
+
+    示例:
+    >>> unique_columns(["Elem", "Tension", "FX", "Tension", "FX"])
+    ['Elem', 'Tension', 'FX', 'Tension.1', 'FX.1']
+    """
+    names = [str(col) for col in columns]
+    used = set(names)
+    seen = set()
+    result = []
+    for name in names:
+        if name in seen:
+            k = 1
+            while f"{name}.{k}" in used:
+                k += 1
+            used.add(f"{name}.{k}")
+            result.append(f"{name}.{k}")
+        else:
+            seen.add(name)
+            result.append(name)
+    return result
+
+
+def table_frame(raw_data):
+    """
+    将/post/table结果转换为DataFrame列表，数值列转换为浮点数，重复的列名加后缀(见unique_columns)
+
+    参数:
+    - raw_data: dict, 接口返回结果，形如{表名: {"HEAD": [...], "DATA": [...]}}
+
+    返回:
+    - list: [(表名, DataFrame), ...]
+    """
+    frames = []
+    for name, table in raw_data.items():
+        if not isinstance(table, dict) or "HEAD" not in table:
+            continue
+        df = pd.DataFrame(table["DATA"], columns=unique_columns(table["HEAD"]))
+        for col in df.columns:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                converted = pd.to_numeric(df[col], errors="coerce")
+                # 全部可转换的列视为数值列(编号、分量)，其余保持字符串(工况、阶段、部件)
+                if converted.notna().sum() == df[col].notna().sum():
+                    df[col] = converted
+        frames.append((name, df))
+    return frames
+
+
+class ResultExporter:
+    """
+    结果表流式导出
+
+    使用方法:
+    >>> with ResultExporter("results/bridge_a", format="parquet") as exporter:
+    ...     for step, df in force.iter_construction(elems="主梁"):
+    ...         exporter.write_frame(df, "BeamForce")
+    >>> read_results("results/bridge_a", "BeamForce", columns=["Elem", "Moment-y"], stages=["CS10"])
+    """
+
+    def __init__(self, path, format="parquet", compression=None, compression_level=None):
+        """
+        参数:
+        - path: str, 导出路径，Parquet为目录，HDF5为文件(.h5)
+        - format: str, "parquet"或"hdf5"
+        - compression: str, 压缩算法，默认Parquet为"zstd"，HDF5为"gzip"
+        - compression_level: int, 压缩级别
+        """
+        if format not in FORMATS:
+            raise ValueError(f"不支持的导出格式: {format}。可用格式: {', '.join(FORMATS)}")
+        self.path = path
+        self.format = format
+        self.compression = compression or ("zstd" if format == "parquet" else "gzip")
+        self.compression_level = compression_level
+        self.rows = 0
+        self._h5 = None
+        if format == "parquet":
+            self._pq = _require("pyarrow.parquet", "pyarrow")
+            self._pa = _require("pyarrow", "pyarrow")
+        else:
+            self._h5py = _require("h5py", "h5py")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """关闭HDF5文件"""
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+
+    def write(self, raw_data):
+        """
+        写入一次/post/table请求的结果
+
+        参数:
+        - raw_data: dict, 接口返回结果(extract_general/extract_construction的返回值)
+
+        返回:
+        - int: 写入的行数
+        """
+        return sum(self.write_frame(df, name) for name, df in table_frame(raw_data))
+
+    def write_frame(self, df, table):
+        """
+        写入一个结果DataFrame，按荷载工况、施工阶段分区，重复的列名加后缀(见unique_columns)
+
+        参数:
+        - df: DataFrame, 结果数据(可为处理后的结果)
+        - table: str, 表名，如"BeamForce"
+
+        返回:
+        - int: 写入的行数
+        """
+        if df.empty:
+            return 0
+        if df.columns.duplicated().any():
+            df = df.set_axis(unique_columns(df.columns), axis=1)
+        keys = [col for col in PARTITION_COLUMNS if col in df.columns]
+        groups = df.groupby(keys, sort=False, dropna=False) if keys else [((), df)]
+        for values, part in groups:
+            values = values if isinstance(values, tuple) else (values,)
+            partition = dict(zip(keys, ["" if pd.isna(v) else str(v) for v in values]))
+            data = part.drop(columns=keys).reset_index(drop=True)
+            if self.format == "parquet":
+                self._write_parquet(table, partition, data)
+            else:
+                self._write_hdf5(table, partition, data)
+        self.rows += len(df)
+        return len(df)
+
+    def _write_parquet(self, table, partition, data):
+        """每次写入在分区目录下生成一个新文件"""
+        folder = os.path.join(
+            self.path, f"table={quote(table, safe='')}",
+            *[f"{key}={quote(value, safe='')}" for key, value in partition.items()]
+        )
+        os.makedirs(folder, exist_ok=True)
+        count = sum(1 for name in os.listdir(folder) if name.endswith(".parquet"))
+        self._pq.write_table(
+            self._pa.Table.from_pandas(data, preserve_index=False),
+            os.path.join(folder, f"part-{count:05d}.parquet"),
+            compression=self.compression, compression_level=self.compression_level
+        )
+
+    def _write_hdf5(self, table, partition, data):
+        """各列追加到分组下的可扩展数据集"""
+        if self._h5 is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._h5 = self._h5py.File(self.path, "a")
+        name = "/".join([quote(table, safe="")] + [quote(value, safe="") or "_" for value in partition.values()])
+        group = self._h5.require_group(name)
+        for key, value in partition.items():
+            group.attrs[key] = value
+        if "columns" not in group.attrs:
+            group.attrs["columns"] = [str(col) for col in data.columns]
+        columns = []
+        for col in data.columns:
+            if pd.api.types.is_numeric_dtype(data[col]):
+                values = data[col].to_numpy()
+                dtype = values.dtype
+            else:
+                values = data[col].astype(str).to_numpy(dtype=object)
+                dtype = self._h5py.string_dtype()
+            dataset_name = quote(str(col), safe="")
+            # 数据集类型在首次写入时确定，写入前检查全部列，避免部分列已追加
+            if dataset_name in group and (group[dataset_name].dtype == object) != (dtype == object):
+                expected = "字符串" if group[dataset_name].dtype == object else "数值"
+                raise ValueError(
+                    f"HDF5导出的列类型与已写入数据不一致: {table}/{col}，应为{expected}列，"
+                    f"可在写入前统一该列类型"
+                )
+            columns.append((dataset_name, values, dtype))
+        for dataset_name, values, dtype in columns:
+            if dataset_name not in group:
+                group.create_dataset(
+                    dataset_name, data=values, dtype=dtype, maxshape=(None,), chunks=True,
+                    compression=self.compression, compression_opts=self.compression_level, shuffle=dtype != object
+                )
+            else:
+                dataset = group[dataset_name]
+                start = dataset.shape[0]
+                dataset.resize(start + len(values), axis=0)
+                dataset[start:] = values
+
+
+def _partition_filter(loads, stages):
+    """分区筛选条件"""
+    selected = {}
+    if loads is not None:
+        selected["Load"] = {loads} if isinstance(loads, str) else set(loads)
+    if stages is not None:
+        selected["Stage"] = {stages} if isinstance(stages, str) else set(stages)
+    return selected
+
+
+def read_results(path, table, columns=None, loads=None, stages=None, memory_map=True):
+    """
+    读取导出的结果，只读取需要的列和分区
+
+    参数:
+    - path: str, 导出路径(Parquet目录或HDF5文件)
+    - table: str, 表名
+    - columns: list, 读取的列，默认全部
+    - loads: str/list, 荷载工况，默认全部
+    - stages: str/list, 施工阶段，默认全部
+    - memory_map: bool, Parquet文件是否以内存映射方式读取
+
+    返回:
+    - DataFrame: 结果数据，含Load、Stage分区列
+    """
+    selected = _partition_filter(loads, stages)
+    if os.path.isdir(path):
+        pq = _require("pyarrow.parquet", "pyarrow")
+        root = os.path.join(path, f"table={quote(table, safe='')}")
+        if not os.path.isdir(root):
+            raise ValueError(f"导出结果中不存在表: {table}")
+        frames = []
+        for folder, dirs, files in os.walk(root):
+            dirs.sort()
+            files = sorted(name for name in files if name.endswith(".parquet"))
+            if not files:
+                continue
+            relative = os.path.relpath(folder, root)
+            partition = dict(
+                (key, unquote(value)) for key, value in
+                (segment.split("=", 1) for segment in relative.split(os.sep) if "=" in segment)
+            )
+            if any(partition.get(key) not in values for key, values in selected.items()):
+                continue
+            for name in files:
+                data = pq.read_table(
+                    os.path.join(folder, name), memory_map=memory_map,
+                    columns=[c for c in columns if c not in partition] if columns else None
+                ).to_pandas()
+                for key, value in partition.items():
+                    if columns is None or key in columns:
+                        data[key] = value or None
+                frames.append(data)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    h5py = _require("h5py", "h5py")
+    frames = []
+    with h5py.File(path, "r") as f:
+        name = quote(table, safe="")
+        if name not in f:
+            raise ValueError(f"导出结果中不存在表: {table}")
+
+        def visit(_, group):
+            if not isinstance(group, h5py.Group) or not any(isinstance(v, h5py.Dataset) for v in group.values()):
+                return
+            partition = {key: str(group.attrs[key]) for key in PARTITION_COLUMNS if key in group.attrs}
+            if any(partition.get(key) not in values for key, values in selected.items()):
+                return
+            data = {}
+            for col in group.attrs.get("columns", [unquote(name) for name in group]):
+                if columns is None or col in columns:
+                    dataset = group[quote(col, safe="")]
+                    data[col] = dataset.asstr()[()] if dataset.dtype == object else dataset[()]
+            data = pd.DataFrame(data)
+            for key, value in partition.items():
+                if columns is None or key in columns:
+                    data[key] = value or None
+            frames.append(data)
+
+        visit(name, f[name])
+        f[name].visititems(visit)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def export_construction(processor, path, table=None, format="parquet", elems=None, load_case="合计(CS)",
+                        stages=None, **kwargs):
+    """
+    逐阶段提取施工阶段结果并写入导出文件，内存中只保留当前阶段的数据
+
+    参数:
+    - processor: PostProcessor, 结果处理对象(如BeamForceProcessor)
+    - path: str, 导出路径
+    - table: str, 表名，默认由处理类名称得到(如"BeamForce")
+    - format: str, "parquet"或"hdf5"
+    - elems, load_case, stages, kwargs: 同iter_construction
+
+    返回:
+    - int: 写入的行数
+    """
+    table = table or type(processor).__name__.replace("Processor", "")
+    with ResultExporter(path, format) as exporter:
+        print(f'开始导出施工阶段结果: {table} -> {path}')
+        for _, df in processor.iter_construction(elems=elems, load_case=load_case, stages=stages, **kwargs):
+            exporter.write_frame(df, table)
+        print(f"施工阶段结果导出完成，共{exporter.rows}行")
+        return exporter.rows
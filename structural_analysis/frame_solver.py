@@ -0,0 +1,514 @@
+"""本地线性静力分析模块，在本机求解三维梁/桁架模型，用于快速预览和与MIDAS结果对比，包括：
+- 读取/db/*格式的节点、单元、材料、截面、支撑、节点弹性支撑和节点荷载数据
+- 单元刚度矩阵向量化生成，SciPy稀疏矩阵组装，多个荷载工况共用一次分解
+- 输出与MIDAS结果表格式相同的Displacements(Global)、BeamForce、TrussForce数据
+结果单位与模型数据单位一致；仅考虑节点荷载，不含单元荷载、自重和施工阶段
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+from .api import midas_api
+
+# 按轴力单元计算的单元类型(桁架、只受拉、只受压、索)
+AXIAL_TYPES = {"TRUSS", "TENSTR", "COMPTR"}
+
+# 截面特性字段(不区分大小写): 面积、抗扭惯性矩、绕局部y轴惯性矩、绕局部z轴惯性矩
+SECTION_FIELDS = {"AREA": "A", "IXX": "J", "IYY": "Iy", "IZZ": "Iz"}
+
+DISPLACEMENT_HEAD = ["Index", "Node", "Load", "DX", "DY", "DZ", "RX", "RY", "RZ", "RW"]
+BEAM_FORCE_HEAD = [
+    "Index", "Elem", "Load", "Part", "Axial", "Shear-y", "Shear-z",
+    "Torsion", "Moment-y", "Moment-z", "Bi-Moment", "T-Moment", "W-Moment"
+]
+TRUSS_FORCE_HEAD = ["Index", "Elem", "Load", "Force-I", "Force-J"]
+
+
+def section_properties(item):
+    """
+    从/db/SECT数据中查找截面特性(数值型截面)
+
+    参数:
+    - item: dict, 单个截面的接口数据
+
+    返回:
+    - dict: {"A", "J", "Iy", "Iz"}，未找到全部特性时返回None
+    """
+    found = {}
+
+    def walk(value):
+        if isinstance(value, dict):
+            for key, sub in value.items():
+                name = SECTION_FIELDS.get(str(key).upper())
+                if name and isinstance(sub, (int, float)) and name not in found:
+                    found[name] = float(sub)
+                else:
+                    walk(sub)
+        elif isinstance(value, list):
+            for sub in value:
+                walk(sub)
+
+    walk(item)
+    return found if len(found) == len(SECTION_FIELDS) else None
+
+
+def local_axes(vectors, angles):
+    """
+    单元局部坐标系(MIDAS约定)
+
+    局部x轴由I端指向J端；非竖直单元的局部z轴位于x轴与整体Z轴所在平面内并指向上方，
+    竖直单元的局部y轴与整体Y轴平行；再绕局部x轴旋转β角(ANGLE)
+
+    参数:
+    - vectors: ndarray, 形状为(单元数, 3)的I→J向量
+    - angles: ndarray, β角(度)
+
+    返回:
+    - ndarray: 形状为(单元数, 3, 3)的旋转矩阵，各行依次为局部x、y、z轴的整体方向
+    """
+    ex = vectors / np.linalg.norm(vectors, axis=1)[:, None]
+    vertical = np.abs(ex[:, 2]) > 1 - 1e-9
+    ey = np.cross(np.array([0.0, 0.0, 1.0]), ex)
+    ey[vertical] = [0.0, 1.0, 0.0]
+    ey /= np.linalg.norm(ey, axis=1)[:, None]
+    ez = np.cross(ex, ey)
+    beta = np.radians(angles)[:, None]
+    ey, ez = np.cos(beta) * ey + np.sin(beta) * ez, -np.sin(beta) * ey + np.cos(beta) * ez
+    return np.stack([ex, ey, ez], axis=1)
+
+
+def local_stiffness(length, E, G, A, J, Iy, Iz):
+    """
+    三维梁单元的局部刚度矩阵(Euler-Bernoulli梁)，自由度顺序为I端、J端的(ux, uy, uz, rx, ry, rz)
+
+    参数:
+    - length, E, G, A, J, Iy, Iz: ndarray, 各单元的长度、弹性模量、剪切模量及截面特性
+
+    返回:
+    - ndarray: 形状为(单元数, 12, 12)的刚度矩阵
+    """
+    L = length
+    k = np.zeros((len(L), 12, 12))
+
+    def put(i, j, value):
+        k[:, i, j] = value
+        k[:, j, i] = value
+
+    for a, b, value in [(0, 6, E * A / L), (3, 9, G * J / L)]:
+        put(a, a, value)
+        put(b, b, value)
+        put(a, b, -value)
+    # 绕局部z轴弯曲(uy, rz)和绕局部y轴弯曲(uz, ry)，二者符号相反
+    for u, r, I, sign in [(1, 5, Iz, 1.0), (2, 4, Iy, -1.0)]:
+        c1, c2, c3, c4 = 12 * E * I / L ** 3, 6 * E * I / L ** 2, 4 * E * I / L, 2 * E * I / L
+        put(u, u, c1)
+        put(u + 6, u + 6, c1)
+        put(u, u + 6, -c1)
+        put(u, r, sign * c2)
+        put(u, r + 6, sign * c2)
+        put(u + 6, r, -sign * c2)
+        put(u + 6, r + 6, -sign * c2)
+        put(r, r, c3)
+        put(r + 6, r + 6, c3)
+        put(r, r + 6, c4)
+    return k
+
+
+class FrameModel:
+    """
+    本地线性静力分析模型
+
+    使用方法:
+    >>> model = FrameModel.from_midas(sections={1: {"A": 8.5e6, "J": 1.2e13, "Iy": 6.1e12, "Iz": 2.3e13}})
+    >>> result = model.solve()
+    >>> DisplacementProcessor().process_general_results(result.displacement_table())
+    >>> model.add_nodal_loads("试算", [21], [[0, 0, -1e5, 0, 0, 0]])   # 修改荷载后毫秒级重算
+    >>> model.solve(["试算"]).beam_force_table()
+    """
+
+    def __init__(self):
+        self.node_ids = np.empty(0, dtype=np.int64)
+        self.coords = np.empty((0, 3))
+        self.elem_ids = np.empty(0, dtype=np.int64)
+        self.elem_nodes = np.empty((0, 2), dtype=np.int64)
+        self.elem_types = np.empty(0, dtype="<U8")
+        self.elem_matl = np.empty(0, dtype=np.int64)
+        self.elem_sect = np.empty(0, dtype=np.int64)
+        self.elem_angle = np.empty(0)
+        self.materials = {}
+        self.sections = {}
+        self.supports = {}
+        self.springs = {}
+        self.loads = {}
+
+    @classmethod
+    def from_tables(cls, tables, sections=None, materials=None):
+        """
+        由/db/*格式的数据建立模型
+
+        参数:
+        - tables: dict, {数据表名称: {编号: 数据}}，使用NODE、ELEM、MATL、SECT、CONS、NSPR、CNLD
+        - sections: dict, {截面ID: {"A", "J", "Iy", "Iz"}}，补充或覆盖SECT中的截面特性
+        - materials: dict, {材料ID: {"E", "nu"}}，补充或覆盖MATL中的材料特性
+
+        返回:
+        - FrameModel: 模型
+        """
+        model = cls()
+        nodes = tables.get("NODE") or {}
+        model.node_ids = np.array([int(k) for k in nodes], dtype=np.int64)
+        model.coords = np.array([[v["X"], v["Y"], v["Z"]] for v in nodes.values()], dtype=np.float64).reshape(-1, 3)
+
+        elems = {k: v for k, v in (tables.get("ELEM") or {}).items() if v.get("TYPE") in AXIAL_TYPES | {"BEAM"}}
+        skipped = len(tables.get("ELEM") or {}) - len(elems)
+        if skipped:
+            print(f"忽略{skipped}个非梁/桁架单元")
+        model.elem_ids = np.array([int(k) for k in elems], dtype=np.int64)
+        model.elem_nodes = np.array([v["NODE"][:2] for v in elems.values()], dtype=np.int64).reshape(-1, 2)
+        model.elem_types = np.array([v["TYPE"] for v in elems.values()], dtype="<U8")
+        model.elem_matl = np.array([v["MATL"] for v in elems.values()], dtype=np.int64)
+        model.elem_sect = np.array([v["SECT"] for v in elems.values()], dtype=np.int64)
+        model.elem_angle = np.array([v.get("ANGLE", 0) for v in elems.values()], dtype=np.float64)
+
+        for key, item in (tables.get("MATL") or {}).items():
+            param = (item.get("PARAM") or [{}])[0]
+            if param.get("ELAST"):
+                model.set_material(int(key), param["ELAST"], param.get("POISN") or 0.0)
+        for key, props in (materials or {}).items():
+            model.set_material(int(key), props["E"], props.get("nu", 0.0))
+        for key, item in (tables.get("SECT") or {}).items():
+            props = section_properties(item)
+            if props:
+                model.set_section(int(key), **props)
+        for key, props in (sections or {}).items():
+            model.set_section(int(key), **props)
+
+        for key, item in (tables.get("CONS") or {}).items():
+            constraint = 0
+            for entry in item.get("ITEMS", []):
+                constraint |= int(entry.get("CONSTRAINT", "0000000")[:6], 2)
+            model.supports[int(key)] = constraint
+        for key, item in (tables.get("NSPR") or {}).items():
+            for entry in item.get("ITEMS", []):
+                if entry.get("TYPE", "LINEAR") == "LINEAR" and entry.get("SDR"):
+                    model.add_springs([int(key)], [entry["SDR"][:6]])
+        for key, item in (tables.get("CNLD") or {}).items():
+            for entry in item.get("ITEMS", []):
+                model.add_nodal_loads(
+                    entry.get("LCNAME"), [int(key)],
+                    [[entry.get(f, 0) or 0 for f in ["FX", "FY", "FZ", "MX", "MY", "MZ"]]]
+                )
+        return model
+
+    @classmethod
+    def from_snapshot(cls, snap, sections=None, materials=None):
+        """
+        由模型快照建立模型(参数同from_tables)
+
+        参数:
+        - snap: Snapshot, 模型快照
+        """
+        return cls.from_tables({table: snap.records(table) for table in snap.tables}, sections, materials)
+
+    @classmethod
+    def from_midas(cls, sections=None, materials=None):
+        """
+        读取当前MIDAS模型的数据建立模型(参数同from_tables)
+        """
+        print('开始读取本地分析所需的模型数据')
+        tables = {}
+        for table in ["NODE", "ELEM", "MATL", "SECT", "CONS", "NSPR", "CNLD"]:
+            response = midas_api.request("GET", f"/db/{table}", {}) or {}
+            tables[table] = next((v for k, v in response.items() if k.upper() == table and isinstance(v, dict)), {})
+        return cls.from_tables(tables, sections, materials)
+
+    @classmethod
+    def from_bridge(cls, bridge, materials, sections):
+        """
+        由参数化桥梁模型(BridgeModel)建立模型，索单元按桁架单元计算
+
+        参数:
+        - bridge: BridgeModel, 参数化桥梁模型
+        - materials: dict, {材料ID: {"E", "nu"}}
+        - sections: dict, {截面ID: {"A", "J", "Iy", "Iz"}}
+
+        返回:
+        - FrameModel: 模型
+        """
+        model = cls()
+        model.node_ids = bridge.node_ids.copy()
+        model.coords = bridge.coords.copy()
+        model.elem_ids = np.concatenate([bridge.beam_ids, bridge.cable_ids])
+        model.elem_nodes = np.vstack([bridge.beam_nodes, bridge.cable_nodes])
+        model.elem_types = np.array(["BEAM"] * len(bridge.beam_ids) + ["TENSTR"] * len(bridge.cable_ids), dtype="<U8")
+        model.elem_matl = np.concatenate([bridge.beam_matl, bridge.cable_matl])
+        model.elem_sect = np.concatenate([bridge.beam_sect, bridge.cable_sect])
+        model.elem_angle = np.zeros(len(model.elem_ids))
+        for key, props in materials.items():
+            model.set_material(int(key), props["E"], props.get("nu", 0.0))
+        for key, props in sections.items():
+            model.set_section(int(key), **props)
+        model.add_supports(bridge.support_nodes, bridge.support_constraints)
+        return model
+
+    def set_material(self, material_id, elast, poisn=0.0):
+        """设置材料的弹性模量和泊松比"""
+        self.materials[int(material_id)] = (float(elast), float(elast) / (2 * (1 + float(poisn))))
+
+    def set_section(self, section_id, A, J=0.0, Iy=0.0, Iz=0.0):
+        """设置截面的面积、抗扭惯性矩和绕局部y、z轴的惯性矩"""
+        self.sections[int(section_id)] = (float(A), float(J), float(Iy), float(Iz))
+
+    def add_supports(self, node_ids, constraints):
+        """
+        添加一般支撑(与已有约束合并)
+
+        参数:
+        - node_ids: array-like, 节点编号
+        - constraints: str/array-like, 约束字符串，如"1111000"(第7位翘曲自由度忽略)
+        """
+        node_ids = np.atleast_1d(node_ids).astype(np.int64)
+        constraints = np.broadcast_to(np.asarray(constraints, dtype=str), node_ids.shape)
+        for node_id, constraint in zip(node_ids.tolist(), constraints.tolist()):
+            self.supports[node_id] = self.supports.get(node_id, 0) | int(constraint[:6], 2)
+
+    def add_springs(self, node_ids, stiffness):
+        """
+        添加线性节点弹性支撑(与已有弹簧刚度叠加)
+
+        参数:
+        - node_ids: array-like, 节点编号
+        - stiffness: array-like, 形状为(6,)或(节点数, 6)的刚度(SDx, SDy, SDz, SRx, SRy, SRz)
+        """
+        node_ids = np.atleast_1d(node_ids).astype(np.int64)
+        stiffness = np.broadcast_to(np.asarray(stiffness, dtype=np.float64), (len(node_ids), 6))
+        for node_id, k in zip(node_ids.tolist(), stiffness):
+            self.springs[node_id] = self.springs.get(node_id, np.zeros(6)) + k
+
+    def add_nodal_loads(self, load_case, node_ids, forces):
+        """
+        添加节点荷载(与同一工况的已有荷载叠加)
+
+        参数:
+        - load_case: str, 荷载工况名称
+        - node_ids: array-like, 节点编号
+        - forces: array-like, 形状为(6,)或(节点数, 6)的荷载(FX, FY, FZ, MX, MY, MZ)
+        """
+        node_ids = np.atleast_1d(node_ids).astype(np.int64)
+        forces = np.broadcast_to(np.asarray(forces, dtype=np.float64), (len(node_ids), 6))
+        case = self.loads.setdefault(load_case, {})
+        for node_id, f in zip(node_ids.tolist(), forces):
+            case[node_id] = case.get(node_id, np.zeros(6)) + f
+
+    def _element_data(self):
+        """单元的旋转矩阵、长度和局部刚度矩阵"""
+        missing_m = sorted(set(self.elem_matl.tolist()) - set(self.materials))
+        missing_s = sorted(set(self.elem_sect.tolist()) - set(self.sections))
+        if missing_m:
+            raise ValueError(f"缺少材料特性(弹性模量)，材料ID: {missing_m[:10]}")
+        if missing_s:
+            raise ValueError(f"缺少截面特性，可通过sections参数或set_section提供，截面ID: {missing_s[:10]}")
+        order = np.argsort(self.node_ids)
+        sorted_ids = self.node_ids[order]
+        pos = np.searchsorted(sorted_ids, self.elem_nodes)
+        pos = np.minimum(pos, len(sorted_ids) - 1)
+        if len(self.elem_nodes) and np.any(sorted_ids[pos] != self.elem_nodes):
+            raise ValueError("单元引用了不存在的节点")
+        index = order[pos]
+
+        vectors = self.coords[index[:, 1]] - self.coords[index[:, 0]]
+        length = np.linalg.norm(vectors, axis=1)
+        if np.any(length <= 0):
+            raise ValueError(f"单元长度为0: {self.elem_ids[length <= 0].tolist()[:10]}")
+        E, G = np.array([self.materials[m] for m in self.elem_matl.tolist()]).reshape(-1, 2).T
+        A, J, Iy, Iz = np.array([self.sections[s] for s in self.elem_sect.tolist()]).reshape(-1, 4).T
+        axial = np.isin(self.elem_types, list(AXIAL_TYPES))
+        J, Iy, Iz = (np.where(axial, 0.0, v) for v in (J, Iy, Iz))
+
+        R = local_axes(vectors, self.elem_angle)
+        T = np.zeros((len(R), 12, 12))
+        for b in range(4):
+            T[:, 3 * b:3 * b + 3, 3 * b:3 * b + 3] = R
+        return index, T, local_stiffness(length, E, G, A, J, Iy, Iz)
+
+    def solve(self, load_cases=None):
+        """
+        线性静力分析，各荷载工况共用一次刚度矩阵分解
+
+        参数:
+        - load_cases: list, 荷载工况名称，默认为全部有荷载的工况
+
+        返回:
+        - FrameResult: 分析结果
+        """
+        load_cases = list(self.loads) if load_cases is None else list(load_cases)
+        n_node = len(self.node_ids)
+        n_dof = 6 * n_node
+        index, T, k_local = self._element_data()
+
+        # 组装整体刚度矩阵
+        k_global = np.swapaxes(T, 1, 2) @ k_local @ T
+        dofs = (6 * index[:, :, None] + np.arange(6)).reshape(-1, 12)
+        rows = np.repeat(dofs, 12, axis=1).ravel()
+        cols = np.tile(dofs, (1, 12)).ravel()
+        K = sp.coo_matrix((k_global.ravel(), (rows, cols)), shape=(n_dof, n_dof)).tocsr()
+
+        node_pos = {node_id: k for k, node_id in enumerate(self.node_ids.tolist())}
+        if self.springs:
+            spring_dofs = np.array([6 * node_pos[n] + np.arange(6) for n in self.springs]).ravel()
+            K = K + sp.csr_matrix(
+                (np.concatenate(list(self.springs.values())), (spring_dofs, spring_dofs)), shape=(n_dof, n_dof)
+            )
+
+        fixed = np.zeros(n_dof, dtype=bool)
+        for node_id, mask in self.supports.items():
+            if node_id in node_pos:
+                bits = np.array([(mask >> (5 - d)) & 1 for d in range(6)], dtype=bool)
+                fixed[6 * node_pos[node_id]:6 * node_pos[node_id] + 6] |= bits
+        # 没有刚度的自由度(如只连接桁架单元的节点转角)自动约束
+        fixed |= K.diagonal() == 0
+        free = np.flatnonzero(~fixed)
+
+        F = np.zeros((n_dof, len(load_cases)))
+        for c, case in enumerate(load_cases):
+            for node_id, f in self.loads.get(case, {}).items():
+                F[6 * node_pos[node_id]:6 * node_pos[node_id] + 6, c] += f
+
+        print(f'开始本地线性静力分析，{n_node}个节点，{len(self.elem_ids)}个单元，{len(load_cases)}个荷载工况')
+        U = np.zeros_like(F)
+        if len(free) and len(load_cases):
+            lu = splu(K[free][:, free].tocsc())
+            U[free] = lu.solve(F[free])
+        reactions = K @ U - F
+        reactions[~fixed] = 0.0
+
+        # 单元局部坐标系下的杆端力
+        u_elem = U[dofs]                                            # (单元, 12, 工况)
+        end_forces = k_local @ (T @ u_elem)
+        print("本地线性静力分析完成")
+        return FrameResult(self, load_cases, U.T.reshape(len(load_cases), n_node, 6),
+                           reactions.T.reshape(len(load_cases), n_node, 6), end_forces)
+
+
+class FrameResult:
+    """
+    本地线性静力分析结果
+
+    属性:
+    - load_cases: list, 荷载工况名称
+    - displacements: ndarray, 形状为(工况, 节点, 6)的节点位移(整体坐标系)
+    - reactions: ndarray, 形状为(工况, 节点, 6)的支座反力
+    - end_forces: ndarray, 形状为(单元, 12, 工况)的单元局部坐标系杆端力
+
+    内力符号: 截面正面(外法线为局部+x)上沿局部坐标正方向的力和扭矩为正(轴力受拉为正)，
+    Moment-y以使局部-z侧受拉为正，Moment-z以使局部-y侧受拉为正
+    """
+
+    def __init__(self, model, load_cases, displacements, reactions, end_forces):
+        self.model = model
+        self.load_cases = load_cases
+        self.displacements = displacements
+        self.reactions = reactions
+        self.end_forces = end_forces
+
+    def internal_forces(self):
+        """
+        I端、J端截面内力
+
+        返回:
+        - ndarray: 形状为(工况, 单元, 2, 6)，最后一维为(Axial, Shear-y, Shear-z, Torsion, Moment-y, Moment-z)
+        """
+        f = np.moveaxis(self.end_forces, 2, 0)                      # (工况, 单元, 12)
+        forces = np.stack([-f[:, :, :6], f[:, :, 6:]], axis=2)
+        forces[..., 4] *= -1
+        return forces
+
+    def _cases(self, load_case):
+        if load_case is None:
+            return list(range(len(self.load_cases)))
+        names = [load_case] if isinstance(load_case, str) else list(load_case)
+        unknown = set(names) - set(self.load_cases)
+        if unknown:
+            raise ValueError(f"结果中不存在荷载工况: {sorted(unknown)}")
+        return [self.load_cases.index(name) for name in names]
+
+    def displacement_table(self, load_case=None):
+        """
+        节点位移结果表(格式同DisplacementProcessor.extract_general的返回值)
+
+        参数:
+        - load_case: str/list, 荷载工况名称，默认为全部工况
+
+        返回:
+        - dict: {"Displacements(Global)": {"HEAD": [...], "DATA": [...]}}
+        """
+        rows = []
+        for c in self._cases(load_case):
+            case = self.load_cases[c]
+            for node_id, d in zip(self.model.node_ids.tolist(), self.displacements[c].tolist()):
+                rows.append([len(rows) + 1, node_id, case, *d, 0.0])
+        return {"Displacements(Global)": {"HEAD": DISPLACEMENT_HEAD, "DATA": rows}}
+
+    def beam_force_table(self, load_case=None):
+        """
+        梁单元内力结果表(格式同BeamForceProcessor.extract_general的返回值)
+
+        参数:
+        - load_case: str/list, 荷载工况名称，默认为全部工况
+
+        返回:
+        - dict: {"BeamForce": {"HEAD": [...], "DATA": [...]}}
+        """
+        model = self.model
+        beams = np.flatnonzero(model.elem_types == "BEAM")
+        forces = self.internal_forces()
+        rows = []
+        for c in self._cases(load_case):
+            case = self.load_cases[c]
+            for e in beams.tolist():
+                elem_id = int(model.elem_ids[e])
+                for end, label in enumerate(["I", "J"]):
+                    part = f"{label}[{int(model.elem_nodes[e, end])}]"
+                    rows.append([len(rows) + 1, elem_id, case, part, *forces[c, e, end].tolist(), 0.0, 0.0, 0.0])
+        return {"BeamForce": {"HEAD": BEAM_FORCE_HEAD, "DATA": rows}}
+
+    def truss_force_table(self, load_case=None):
+        """
+        桁架(索)单元轴力结果表(格式同TrussForceProcessor.extract_general的返回值)
+
+        参数:
+        - load_case: str/list, 荷载工况名称，默认为全部工况
+
+        返回:
+        - dict: {"TrussForce": {"HEAD": [...], "DATA": [...]}}
+        """
+        model = self.model
+        trusses = np.flatnonzero(np.isin(model.elem_types, list(AXIAL_TYPES)))
+        forces = self.internal_forces()
+        rows = []
+        for c in self._cases(load_case):
+            case = self.load_cases[c]
+            for e in trusses.tolist():
+                rows.append([len(rows) + 1, int(model.elem_ids[e]), case, forces[c, e, 0, 0], forces[c, e, 1, 0]])
+        return {"TrussForce": {"HEAD": TRUSS_FORCE_HEAD, "DATA": rows}}
+
+    def reaction_frame(self, load_case=None):
+        """
+        支座反力
+
+        参数:
+        - load_case: str/list, 荷载工况名称，默认为全部工况
+
+        返回:
+        - DataFrame: 列为 Node, Load, FX, FY, FZ, MX, MY, MZ，仅含有约束的节点
+        """
+        model = self.model
+        supported = np.isin(model.node_ids, list(model.supports))
+        frames = []
+        for c in self._cases(load_case):
+            df = pd.DataFrame(self.reactions[c][supported], columns=["FX", "FY", "FZ", "MX", "MY", "MZ"])
+            df.insert(0, "Load", self.load_cases[c])
+            df.insert(0, "Node", model.node_ids[supported])
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,296 @@
+"""参数化桥梁模型生成模块，以数组形式批量生成模型数据，包括：
+- 连续梁：按跨径和节段长度生成主梁节点、单元和支座
+- 斜拉桥：在连续梁基础上生成桥塔、塔上锚点和斜拉索
+- 生成结果通过批量接口分批上传到MIDAS
+所有节点、单元和支座数据均以NumPy数组向量化生成，便于进行参数化方案比选
+"""
+
+import numpy as np
+from .pre_processor import NodeProcessor, BeamElement, CableElement, BoundaryConditionProcessor
+
+
+class BridgeModel:
+    """
+    参数化生成的桥梁模型数据
+
+    属性:
+    - node_ids: ndarray, 节点编号
+    - coords: ndarray, 节点坐标，形状为(节点数, 3)
+    - beam_ids, beam_nodes, beam_matl, beam_sect: 梁单元编号、节点、材料ID、截面ID
+    - cable_ids, cable_nodes, cable_matl, cable_sect, cable_tension: 索单元编号、节点、材料ID、截面ID、初拉力
+    - support_nodes: ndarray, 支座节点编号
+    - support_constraints: ndarray, 支座约束字符串(如"1111000")
+    - groups: dict, {名称: 单元编号数组}，如"girder"、"tower_1"、"cable"
+    - girder_stations, girder_nodes, pier_nodes: 主梁节点里程、主梁节点编号、墩位节点编号
+    """
+
+    def __init__(self):
+        self.node_ids = np.empty(0, dtype=np.int64)
+        self.coords = np.empty((0, 3))
+        self.beam_ids = np.empty(0, dtype=np.int64)
+        self.beam_nodes = np.empty((0, 2), dtype=np.int64)
+        self.beam_matl = np.empty(0, dtype=np.int64)
+        self.beam_sect = np.empty(0, dtype=np.int64)
+        self.cable_ids = np.empty(0, dtype=np.int64)
+        self.cable_nodes = np.empty((0, 2), dtype=np.int64)
+        self.cable_matl = np.empty(0, dtype=np.int64)
+        self.cable_sect = np.empty(0, dtype=np.int64)
+        self.cable_tension = np.empty(0)
+        self.support_nodes = np.empty(0, dtype=np.int64)
+        self.support_constraints = np.empty(0, dtype="<U7")
+        self.groups = {}
+        # 主梁节点里程、主梁节点编号和墩位节点编号(由girder_model生成)
+        self.girder_stations = None
+        self.girder_nodes = None
+        self.pier_nodes = None
+
+    def add_nodes(self, coords):
+        """添加节点，返回新节点编号"""
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        start = self.node_ids[-1] + 1 if len(self.node_ids) else 1
+        ids = np.arange(start, start + len(coords), dtype=np.int64)
+        self.node_ids = np.concatenate([self.node_ids, ids])
+        self.coords = np.vstack([self.coords, coords])
+        return ids
+
+    def _next_elem_id(self):
+        """下一个可用的单元编号(梁单元与索单元统一编号)"""
+        used = np.concatenate([self.beam_ids, self.cable_ids])
+        return int(used.max()) + 1 if len(used) else 1
+
+    def add_beams(self, nodes, matl, sect, group=None):
+        """添加梁单元，返回新单元编号"""
+        nodes = np.asarray(nodes, dtype=np.int64).reshape(-1, 2)
+        start = self._next_elem_id()
+        ids = np.arange(start, start + len(nodes), dtype=np.int64)
+        self.beam_ids = np.concatenate([self.beam_ids, ids])
+        self.beam_nodes = np.vstack([self.beam_nodes, nodes])
+        self.beam_matl = np.concatenate([self.beam_matl, np.broadcast_to(matl, len(ids))])
+        self.beam_sect = np.concatenate([self.beam_sect, np.broadcast_to(sect, len(ids))])
+        if group:
+            self.groups[group] = np.concatenate([self.groups.get(group, ids[:0]), ids])
+        return ids
+
+    def add_cables(self, nodes, matl, sect, tension=0.0, group="cable"):
+        """添加索单元，返回新单元编号"""
+        nodes = np.asarray(nodes, dtype=np.int64).reshape(-1, 2)
+        start = self._next_elem_id()
+        ids = np.arange(start, start + len(nodes), dtype=np.int64)
+        self.cable_ids = np.concatenate([self.cable_ids, ids])
+        self.cable_nodes = np.vstack([self.cable_nodes, nodes])
+        self.cable_matl = np.concatenate([self.cable_matl, np.broadcast_to(matl, len(ids))])
+        self.cable_sect = np.concatenate([self.cable_sect, np.broadcast_to(sect, len(ids))])
+        self.cable_tension = np.concatenate([self.cable_tension, np.broadcast_to(tension, len(ids))])
+        if group:
+            self.groups[group] = np.concatenate([self.groups.get(group, ids[:0]), ids])
+        return ids
+
+    def add_supports(self, node_ids, constraints):
+        """添加支座，constraints为单个约束字符串或每个节点一个约束字符串"""
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.support_nodes = np.concatenate([self.support_nodes, node_ids])
+        self.support_constraints = np.concatenate([
+            self.support_constraints, np.broadcast_to(np.asarray(constraints, dtype="<U7"), len(node_ids))
+        ])
+
+    def summary(self):
+        """
+        模型数据统计
+
+        返回:
+        - dict: 节点、梁单元、索单元和支座数量
+        """
+        return {
+            "nodes": len(self.node_ids),
+            "beams": len(self.beam_ids),
+            "cables": len(self.cable_ids),
+            "supports": len(self.support_nodes)
+        }
+
+    def upload(self, chunk_size=5000, group_name=""):
+        """
+        通过批量接口将模型数据分批上传到MIDAS
+
+        参数:
+        - chunk_size: int, 每批提交的数据条数
+        - group_name: str, 支座所属的边界组名称
+
+        返回:
+        - dict: 各类数据的批次响应结果
+        """
+        print(f"开始上传参数化模型: {self.summary()}")
+        responses = {"nodes": NodeProcessor().create_bulk(self.node_ids, self.coords, chunk_size)}
+        if len(self.beam_ids):
+            responses["beams"] = BeamElement().create_bulk(
+                self.beam_ids, self.beam_nodes, self.beam_matl, self.beam_sect, chunk_size=chunk_size
+            )
+        if len(self.cable_ids):
+            responses["cables"] = CableElement().create_bulk(
+                self.cable_ids, self.cable_nodes, self.cable_matl, self.cable_sect,
+                chunk_size=chunk_size, cable_type=1, tens=self.cable_tension
+            )
+        if len(self.support_nodes):
+            supports = BoundaryConditionProcessor()
+            supports.add_supports(self.support_nodes, self.support_constraints, group_name)
+            responses["supports"] = supports.apply_constraints(chunk_size)
+        print("参数化模型上传完成")
+        return responses
+
+
+def span_stations(spans, segment_length):
+    """
+    按跨径和节段长度划分主梁节点里程，每跨等分为不超过segment_length的节段
+
+    参数:
+    - spans: array-like, 各跨跨径
+    - segment_length: float, 最大节段长度
+
+    返回:
+    - tuple: (stations, pier_index)
+        - stations: ndarray, 主梁节点里程
+        - pier_index: ndarray, 各墩(含两端桥台)在stations中的位置
+    """
+    spans = np.asarray(spans, dtype=np.float64)
+    if np.any(spans <= 0) or segment_length <= 0:
+        raise ValueError("跨径和节段长度必须为正数")
+
+    n_seg = np.maximum(1, np.ceil(spans / segment_length - 1e-9).astype(np.int64))
+    pier_index = np.concatenate([[0], np.cumsum(n_seg)])
+    boundaries = np.concatenate([[0.0], np.cumsum(spans)])
+
+    # 各节点所在跨的起点里程 + 跨内序号 × 该跨节段长度
+    span_of = np.repeat(np.arange(len(spans)), n_seg)
+    local = np.arange(pier_index[-1]) - pier_index[span_of]
+    stations = boundaries[span_of] + local * (spans / n_seg)[span_of]
+    return np.append(stations, boundaries[-1]), pier_index
+
+
+def girder_model(spans, segment_length, matl=1, sect=1, fixed_pier=0,
+                 fixed="1111000", sliding="0111000", origin=(0.0, 0.0, 0.0), model=None):
+    """
+    生成连续梁模型(主梁沿X方向)
+
+    参数:
+    - spans: array-like, 各跨跨径，如[40, 60, 40]
+    - segment_length: float, 最大节段长度
+    - matl: int, 主梁材料ID
+    - sect: int, 主梁截面ID
+    - fixed_pier: int, 固定支座所在墩的序号(0为起点桥台)
+    - fixed: str, 固定支座约束
+    - sliding: str, 活动支座约束
+    - origin: tuple, 主梁起点坐标
+    - model: BridgeModel, 在已有模型上继续生成，默认新建
+
+    返回:
+    - BridgeModel: 模型数据，主梁单元编号保存在groups["girder"]，
+                   主梁节点与墩位节点保存在girder_nodes与pier_nodes属性
+
+    示例:
+    >>> model = girder_model([40, 60, 40], 2.0)
+    >>> model.upload()
+    """
+    model = model or BridgeModel()
+    stations, pier_index = span_stations(spans, segment_length)
+
+    coords = np.zeros((len(stations), 3)) + np.asarray(origin, dtype=np.float64)
+    coords[:, 0] += stations
+    nodes = model.add_nodes(coords)
+    model.add_beams(np.column_stack([nodes[:-1], nodes[1:]]), matl, sect, group="girder")
+
+    if not 0 <= fixed_pier < len(pier_index):
+        raise ValueError(f"固定支座墩号超出范围: {fixed_pier}")
+    constraints = np.full(len(pier_index), sliding, dtype="<U7")
+    constraints[fixed_pier] = fixed
+    model.add_supports(nodes[pier_index], constraints)
+
+    model.girder_stations = stations
+    model.girder_nodes = nodes
+    model.pier_nodes = nodes[pier_index]
+    return model
+
+
+def cable_stayed_model(spans, segment_length, towers, tower_height, cables_per_side,
+                       cable_spacing, first_cable_offset, anchor_bottom, anchor_spacing,
+                       tower_segment=None, cable_tension=0.0, matl=None, sect=None,
+                       fixed_pier=None, origin=(0.0, 0.0, 0.0)):
+    """
+    生成单索面斜拉桥模型(主梁沿X方向，桥塔沿Z方向)
+
+    参数:
+    - spans: array-like, 各跨跨径，如[100, 250, 100]
+    - segment_length: float, 主梁最大节段长度
+    - towers: list, 设塔的墩号(0为起点桥台)，如[1, 2]
+    - tower_height: float, 桥塔高度(自主梁顶面起算)
+    - cables_per_side: int, 每个桥塔单侧斜拉索数量
+    - cable_spacing: float, 梁上锚点间距
+    - first_cable_offset: float, 第一根索梁上锚点到桥塔的距离
+    - anchor_bottom: float, 塔上最低锚点高度(自主梁顶面起算，须大于0)
+    - anchor_spacing: float, 塔上锚点间距
+    - tower_segment: float, 桥塔最大节段长度，默认同segment_length
+    - cable_tension: float/array-like, 索初拉力(单值或每根索一个值)
+    - matl: dict, 材料ID，键为"girder"、"tower"、"cable"
+    - sect: dict, 截面ID，键为"girder"、"tower"、"cable"
+    - fixed_pier: int, 固定支座所在墩号，默认为第一个桥塔
+    - origin: tuple, 主梁起点坐标
+
+    返回:
+    - BridgeModel: 模型数据，单元编号分组保存在groups("girder"、"tower_<墩号>"、"cable")
+
+    示例:
+    >>> model = cable_stayed_model([100, 250, 100], 5.0, towers=[1, 2], tower_height=80,
+    ...                            cables_per_side=12, cable_spacing=8, first_cable_offset=12,
+    ...                            anchor_bottom=40, anchor_spacing=3)
+    >>> model.upload()
+    """
+    matl = {"girder": 1, "tower": 1, "cable": 2, **(matl or {})}
+    sect = {"girder": 1, "tower": 2, "cable": 3, **(sect or {})}
+    tower_segment = tower_segment or segment_length
+    towers = list(towers)
+
+    model = girder_model(
+        spans, segment_length, matl["girder"], sect["girder"],
+        fixed_pier=towers[0] if fixed_pier is None else fixed_pier, origin=origin
+    )
+    stations, girder_nodes = model.girder_stations, model.girder_nodes
+
+    offsets = first_cable_offset + np.arange(cables_per_side) * cable_spacing
+    anchor_heights = np.round(anchor_bottom + np.arange(cables_per_side) * anchor_spacing, 6)
+    # 塔底节点即主梁墩顶节点，塔上锚点须高于主梁顶面
+    if anchor_heights[0] <= 0:
+        raise ValueError(f"塔上最低锚点高度必须大于0: {anchor_bottom}")
+    if anchor_heights[-1] > tower_height:
+        raise ValueError(f"塔上最高锚点({anchor_heights[-1]})超过桥塔高度({tower_height})")
+
+    for pier in towers:
+        base = model.pier_nodes[pier]
+        x_tower = stations[np.searchsorted(girder_nodes, base)]
+
+        # 桥塔节点：按节段等分并包含全部塔上锚点高度，塔底与主梁墩顶节点共用
+        n_seg = max(1, int(np.ceil(tower_height / tower_segment - 1e-9)))
+        levels = np.union1d(np.round(np.linspace(0.0, tower_height, n_seg + 1), 6), anchor_heights)[1:]
+        coords = np.zeros((len(levels), 3)) + model.coords[np.searchsorted(model.node_ids, base)]
+        coords[:, 2] += levels
+        tower_nodes = np.concatenate([[base], model.add_nodes(coords)])
+        model.add_beams(
+            np.column_stack([tower_nodes[:-1], tower_nodes[1:]]),
+            matl["tower"], sect["tower"], group=f"tower_{pier}"
+        )
+
+        # 梁上锚点取距离锚点里程最近的主梁节点，内侧索锚于塔上低位锚点
+        anchor_x = np.concatenate([x_tower - offsets, x_tower + offsets])
+        if anchor_x.min() < stations[0] or anchor_x.max() > stations[-1]:
+            raise ValueError(f"墩{pier}处桥塔的梁上锚点超出主梁范围")
+        nearest = np.clip(np.searchsorted(stations, anchor_x), 1, len(stations) - 1)
+        nearest -= (anchor_x - stations[nearest - 1]) < (stations[nearest] - anchor_x)
+        girder_anchor = girder_nodes[nearest]
+        tower_anchor = tower_nodes[1:][np.searchsorted(levels, anchor_heights)]
+
+        model.add_cables(
+            np.column_stack([girder_anchor, np.tile(tower_anchor, 2)]),
+            matl["cable"], sect["cable"], group="cable"
+        )
+
+    model.cable_tension = np.broadcast_to(
+        np.asarray(cable_tension, dtype=np.float64), len(model.cable_ids)
+    ).copy()
+    return model
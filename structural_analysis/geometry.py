@@ -0,0 +1,327 @@
+"""几何索引模块，由节点和单元数据计算结构里程，包括：
+- 节点坐标与单元连接关系数组
+- 单元长度的向量化计算
+- 沿指定单元路径或结构组的累计里程
+- 结果数据到实际里程的映射
+几何数据按模型缓存，修改节点、单元或打开新模型后失效
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from .api import midas_api
+
+_PART_FRACTION = re.compile(r"(\d+)\s*/\s*(\d+)")
+
+
+def _part_fraction(parts):
+    """
+    将结果表的部件标签转换为单元内的相对位置(I端为0，J端为1，"1/4"等为对应比例)
+
+    参数:
+    - parts: array-like, 部件标签，如"PartI"、"I[1]"、"J[2]"、"1/4"
+
+    返回:
+    - ndarray: 相对位置
+    """
+    parts = pd.Series(parts, dtype=str).str.replace("Part", "", regex=False).str.strip()
+    fraction = np.full(len(parts), 0.5)
+    fraction[parts.str.startswith("I").to_numpy()] = 0.0
+    fraction[parts.str.startswith("J").to_numpy()] = 1.0
+    ratio = parts.str.extract(_PART_FRACTION).astype(float)
+    has_ratio = ratio[0].notna().to_numpy()
+    fraction[has_ratio] = (ratio[0] / ratio[1]).to_numpy()[has_ratio]
+    return fraction
+
+
+class GeometryIndex:
+    """
+    模型几何索引
+
+    属性:
+    - node_ids: ndarray, 节点编号(升序)
+    - coords: ndarray, 节点坐标，形状为(节点数, 3)
+    - elem_ids: ndarray, 单元编号(升序)
+    - elem_nodes: ndarray, 单元I、J端节点编号，形状为(单元数, 2)
+    - elem_types: ndarray, 单元类型
+
+    使用方法:
+    >>> path = geometry_index.chainage(group="主梁")
+    >>> df = geometry_index.map_stations(force.process_general_results(raw), path)
+    """
+
+    def __init__(self):
+        self.node_ids = None
+        self.coords = None
+        self.elem_ids = None
+        self.elem_nodes = None
+        self.elem_types = None
+        self._groups = None
+
+    @property
+    def loaded(self):
+        """几何数据是否已加载"""
+        return self.node_ids is not None
+
+    def invalidate(self):
+        """清除缓存的几何数据(修改节点、单元或打开新模型后调用)"""
+        self.node_ids = None
+        self.coords = None
+        self.elem_ids = None
+        self.elem_nodes = None
+        self.elem_types = None
+        self._groups = None
+
+    def load(self, force=False):
+        """
+        从模型读取节点和单元数据，已加载时直接使用缓存
+
+        参数:
+        - force: bool, 是否强制重新读取
+
+        返回:
+        - GeometryIndex: 当前对象
+        """
+        if self.loaded and not force:
+            return self
+
+        print('开始读取模型几何数据')
+        node_response = midas_api.request("GET", "/db/NODE", {})
+        elem_response = midas_api.request("GET", "/db/ELEM", {})
+        nodes = (node_response or {}).get("NODE", {})
+        elems = (elem_response or {}).get("ELEM", {})
+        if not nodes:
+            raise ValueError("未读取到节点数据，无法建立几何索引")
+
+        node_ids = np.array([int(k) for k in nodes], dtype=np.int64)
+        coords = np.array([[v["X"], v["Y"], v["Z"]] for v in nodes.values()], dtype=np.float64)
+        order = np.argsort(node_ids)
+        self.node_ids, self.coords = node_ids[order], coords[order]
+
+        # 仅保留两节点的线单元(梁、桁架、索等)
+        line_elems = {k: v for k, v in elems.items() if len([n for n in v["NODE"] if n]) == 2}
+        elem_ids = np.array([int(k) for k in line_elems], dtype=np.int64)
+        elem_nodes = np.array(
+            [v["NODE"][:2] for v in line_elems.values()], dtype=np.int64
+        ).reshape(-1, 2)
+        elem_types = np.array([v.get("TYPE", "") for v in line_elems.values()], dtype=object)
+        order = np.argsort(elem_ids)
+        self.elem_ids, self.elem_nodes, self.elem_types = (
+            elem_ids[order], elem_nodes[order], elem_types[order]
+        )
+        self._groups = None
+
+        print(f"几何数据读取完成，共{len(self.node_ids)}个节点，{len(self.elem_ids)}个线单元")
+        return self
+
+    def _lookup(self, sorted_ids, ids, label):
+        """在升序编号数组中查找位置，编号不存在时报错"""
+        ids = np.asarray(ids, dtype=np.int64)
+        pos = np.searchsorted(sorted_ids, ids)
+        pos = np.clip(pos, 0, len(sorted_ids) - 1)
+        missing = sorted_ids[pos] != ids
+        if missing.any():
+            raise ValueError(f"模型中不存在以下{label}: {ids[missing][:10].tolist()}")
+        return pos
+
+    def node_coords(self, node_ids):
+        """
+        获取节点坐标
+
+        参数:
+        - node_ids: array-like, 节点编号
+
+        返回:
+        - ndarray: 形状为(节点数, 3)的坐标数组
+        """
+        self.load()
+        return self.coords[self._lookup(self.node_ids, node_ids, "节点")]
+
+    def element_lengths(self, elem_ids=None):
+        """
+        计算单元长度
+
+        参数:
+        - elem_ids: array-like, 单元编号，默认为全部线单元
+
+        返回:
+        - ndarray: 单元长度
+        """
+        self.load()
+        if elem_ids is None:
+            elem_nodes = self.elem_nodes
+        else:
+            elem_nodes = self.elem_nodes[self._lookup(self.elem_ids, elem_ids, "单元")]
+        start = self.node_coords(elem_nodes[:, 0])
+        end = self.node_coords(elem_nodes[:, 1])
+        return np.linalg.norm(end - start, axis=1)
+
+    def group_elements(self, group_name):
+        """
+        获取结构组中的单元编号
+
+        参数:
+        - group_name: str, 结构组名称
+
+        返回:
+        - ndarray: 单元编号
+        """
+        if self._groups is None:
+            response = midas_api.request("GET", "/db/GRUP", {})
+            self._groups = {
+                item["NAME"]: item for item in (response or {}).get("GRUP", {}).values()
+            }
+        if group_name not in self._groups:
+            raise ValueError(f"模型中不存在结构组: {group_name}")
+        return np.asarray(self._groups[group_name].get("E_LIST", []), dtype=np.int64)
+
+    def _order_path(self, elem_ids, elem_nodes):
+        """
+        按节点连接关系将单元排列为连续路径，并统一单元方向
+
+        返回:
+        - tuple: (单元编号, 沿路径方向的I、J端节点)，无法构成单一路径时按原顺序返回
+        """
+        degree = pd.Series(elem_nodes.ravel()).value_counts()
+        if len(elem_ids) < 2 or degree.max() > 2:
+            return elem_ids, elem_nodes
+
+        # 从路径端点(仅连接一个单元的节点)出发依次连接相邻单元
+        node_elems = {}
+        for k, (ni, nj) in enumerate(elem_nodes):
+            node_elems.setdefault(ni, []).append(k)
+            node_elems.setdefault(nj, []).append(k)
+        ends = degree.index[degree == 1]
+        first_i, first_j = elem_nodes[0]
+        if first_i in ends or not len(ends):
+            node = first_i
+        elif first_j in ends:
+            node = first_j
+        else:
+            node = min(ends)
+
+        order, oriented, used = [], [], np.zeros(len(elem_ids), dtype=bool)
+        while True:
+            candidates = [k for k in node_elems.get(node, []) if not used[k]]
+            if not candidates:
+                break
+            k = candidates[0]
+            used[k] = True
+            ni, nj = elem_nodes[k]
+            next_node = nj if ni == node else ni
+            order.append(k)
+            oriented.append((node, next_node))
+            node = next_node
+
+        if not used.all():
+            return elem_ids, elem_nodes
+        return elem_ids[order], np.array(oriented, dtype=np.int64)
+
+    def chainage(self, elems=None, group=None, start=0.0, ordered=True):
+        """
+        计算沿单元路径的累计里程
+
+        参数:
+        - elems: array-like, 路径上的单元编号
+        - group: str, 结构组名称(与elems二选一)
+        - start: float, 起点里程
+        - ordered: bool, 是否按节点连接关系自动排序单元，False时按传入顺序
+
+        返回:
+        - DataFrame: 列为 Elem, NodeI, NodeJ, Length, Start, End(沿路径方向)
+        """
+        self.load()
+        if group is not None:
+            elems = self.group_elements(group)
+        if elems is None:
+            raise ValueError("需要指定路径单元elems或结构组group")
+
+        elem_ids = np.asarray(elems, dtype=np.int64)
+        elem_nodes = self.elem_nodes[self._lookup(self.elem_ids, elem_ids, "单元")]
+        if ordered:
+            elem_ids, elem_nodes = self._order_path(elem_ids, elem_nodes)
+
+        lengths = np.linalg.norm(
+            self.node_coords(elem_nodes[:, 1]) - self.node_coords(elem_nodes[:, 0]), axis=1
+        )
+        ends = start + np.cumsum(lengths)
+        return pd.DataFrame({
+            "Elem": elem_ids,
+            "NodeI": elem_nodes[:, 0],
+            "NodeJ": elem_nodes[:, 1],
+            "Length": lengths,
+            "Start": ends - lengths,
+            "End": ends
+        })
+
+    def node_stations(self, path):
+        """
+        获取路径上各节点的里程
+
+        参数:
+        - path: DataFrame, chainage的返回值
+
+        返回:
+        - Series: 以节点编号为索引的里程
+        """
+        nodes = np.append(path["NodeI"].to_numpy(), path["NodeJ"].to_numpy()[-1:])
+        stations = np.append(path["Start"].to_numpy(), path["End"].to_numpy()[-1:])
+        return pd.Series(stations, index=pd.Index(nodes, name="Node"), name="Station")
+
+    def station_values(self, df, path):
+        """
+        计算结果表各行对应的里程，不在路径上的行为NaN
+
+        参数:
+        - df: DataFrame, 单元结果(含Elem列，可含Part列)或节点结果(含Node列)
+        - path: DataFrame, chainage的返回值
+
+        返回:
+        - ndarray: 各行的里程
+        """
+        if path.empty:
+            return np.full(len(df), np.nan)
+        self.load()
+        if "Elem" in df.columns:
+            keys, sorted_ids = df["Elem"].to_numpy(dtype=np.int64), path["Elem"].to_numpy()
+        else:
+            stations = self.node_stations(path)
+            keys, sorted_ids = df["Node"].to_numpy(dtype=np.int64), stations.index.to_numpy()
+
+        order = np.argsort(sorted_ids)
+        sorted_ids = sorted_ids[order]
+        pos = np.clip(np.searchsorted(sorted_ids, keys), 0, len(sorted_ids) - 1)
+        found = sorted_ids[pos] == keys
+        rows = order[pos]
+
+        if "Elem" in df.columns:
+            fraction = _part_fraction(df["Part"]) if "Part" in df.columns else 0.5
+            start = path["Start"].to_numpy()[rows]
+            values = start + fraction * path["Length"].to_numpy()[rows]
+            # 单元方向与路径方向相反时，I端位于路径的较大里程处
+            reversed_elem = self.elem_nodes[
+                self._lookup(self.elem_ids, path["Elem"].to_numpy()[rows], "单元"), 0
+            ] != path["NodeI"].to_numpy()[rows]
+            values = np.where(reversed_elem, 2 * start + path["Length"].to_numpy()[rows] - values, values)
+        else:
+            values = stations.to_numpy()[rows]
+        return np.where(found, values, np.nan)
+
+    def map_stations(self, df, path):
+        """
+        为结果表添加Station(里程)列，并按里程排序，不在路径上的行被剔除
+
+        参数:
+        - df: DataFrame, 处理后的结果数据
+        - path: DataFrame, chainage的返回值
+
+        返回:
+        - DataFrame: 添加Station列后的结果
+        """
+        df = df.copy()
+        df["Station"] = self.station_values(df, path)
+        return df.dropna(subset=["Station"]).sort_values("Station", kind="stable")
+
+
+# 全局几何索引实例
+geometry_index = GeometryIndex()
@@ -0,0 +1,300 @@
+"""影响矩阵模块，计算控制点结果对各索单位初拉力的影响矩阵，用于斜拉桥索力优化，包括：
+- 每根索一个荷载工况，工况和初拉力批量添加
+- 全部工况一次分析，每类控制点结果一次多工况请求提取
+- 影响矩阵按模型刚度数据的指纹缓存在磁盘
+- 向量化的有界最小二乘索力求解(可同时求解多组目标)
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from scipy.optimize import lsq_linear
+from .api import midas_api, response_failed
+from .operations import MidasOperations
+from .pre_processor import StaticLoadsProcessor, PrestressLoadsProcessor
+from .snapshot import SNAPSHOT_TABLES
+from .validation import model_validator
+
+# 影响矩阵缓存目录
+INFLUENCE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".easy_midas", "influence")
+
+# 影响结构刚度的数据表，用于计算模型指纹(含施工阶段控制点时另加STAG)
+STIFFNESS_TABLES = ["NODE", "ELEM", "MATL", "SECT", "CONS", "NSPR", "ELNK", "RIGD"]
+
+
+def model_fingerprint(tables=STIFFNESS_TABLES):
+    """
+    读取模型刚度相关数据并计算指纹，模型修改后指纹改变
+
+    参数:
+    - tables: list, 参与计算的数据表
+
+    返回:
+    - str: SHA1指纹
+    """
+    digest = hashlib.sha1()
+    for table in tables:
+        response = midas_api.request("GET", SNAPSHOT_TABLES.get(table, f"/db/{table}"), {}) or {}
+        digest.update(json.dumps(response, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class InfluenceMatrix:
+    """
+    单位初拉力影响矩阵
+
+    属性:
+    - matrix: ndarray, 形状为(控制点数, 索数)，第j列为索j单位初拉力引起的控制点结果
+    - cables: ndarray, 索单元编号
+    - index: MultiIndex, 控制点标识(Type, Component, Stage, ID)
+
+    使用方法:
+    >>> im = InfluenceBuilder(cables, responses).build()
+    >>> tensions = im.solve(targets, base=dead_load_response, bounds=(1e6, 6e6))
+    >>> im.response(tensions) + dead_load_response
+    """
+
+    def __init__(self, matrix, cables, index):
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        self.cables = np.asarray(cables, dtype=np.int64)
+        self.index = index
+        if self.matrix.shape != (len(index), len(self.cables)):
+            raise ValueError(f"影响矩阵形状{self.matrix.shape}与控制点数({len(index)})、索数({len(self.cables)})不一致")
+
+    def to_frame(self):
+        """
+        转换为DataFrame
+
+        返回:
+        - DataFrame: 行为控制点，列为索单元编号
+        """
+        return pd.DataFrame(self.matrix, index=self.index, columns=pd.Index(self.cables, name="Cable"))
+
+    def response(self, tensions):
+        """
+        索力引起的控制点结果
+
+        参数:
+        - tensions: array-like, 形状为(索数,)或(索数, 组数)的初拉力
+
+        返回:
+        - ndarray: 控制点结果
+        """
+        return self.matrix @ np.asarray(tensions, dtype=np.float64)
+
+    def solve(self, targets, weights=None, base=None, bounds=None, reference=None, smoothing=0.0):
+        """
+        求解使控制点结果最接近目标值的初拉力
+
+        目标函数: Σ (w_i · (M·t + base - target)_i)² + smoothing · ||t - reference||²
+
+        参数:
+        - targets: array-like, 形状为(控制点数,)或(控制点数, 组数)的目标值，NaN表示该控制点不参与
+        - weights: array-like, 控制点权重，默认为1
+        - base: array-like, 其他荷载引起的控制点结果(如恒载)，形状同targets的一列或与targets相同
+        - bounds: tuple, (下限, 上限)，可为标量或长度为索数的数组，None表示不限
+        - reference: array-like, 正则化的参考初拉力，默认为0
+        - smoothing: float, 正则化系数，控制点少于索数时用于保证解唯一
+
+        返回:
+        - Series/DataFrame: 各索初拉力，多组目标时每组一列
+        """
+        M = self.matrix
+        n_resp, n_cable = M.shape
+        targets = np.asarray(targets, dtype=np.float64)
+        single = targets.ndim == 1
+        T = targets.reshape(n_resp, -1)
+        base = np.zeros(n_resp) if base is None else np.asarray(base, dtype=np.float64)
+        B = np.broadcast_to(base.reshape(n_resp, -1), T.shape)
+        w = np.ones(n_resp) if weights is None else np.asarray(weights, dtype=np.float64)
+        reference = np.zeros(n_cable) if reference is None else np.broadcast_to(
+            np.asarray(reference, dtype=np.float64), (n_cable,)
+        )
+        lower, upper = (-np.inf, np.inf) if bounds is None else bounds
+        lower = np.broadcast_to(np.asarray(lower, dtype=np.float64), (n_cable,))
+        upper = np.broadcast_to(np.asarray(upper, dtype=np.float64), (n_cable,))
+        bounded = np.isfinite(lower).any() or np.isfinite(upper).any()
+
+        rhs = w[:, None] * (T - B)
+        active = ~np.isnan(rhs)
+        reg = np.sqrt(smoothing) * np.eye(n_cable)
+        tensions = np.empty((n_cable, T.shape[1]))
+
+        # 控制点组合相同的目标一起求解
+        patterns, groups = np.unique(active.T, axis=0, return_inverse=True)
+        for g, pattern in enumerate(patterns):
+            cols = np.flatnonzero(groups.ravel() == g)
+            A = np.vstack([w[pattern, None] * M[pattern], reg])
+            b = np.vstack([rhs[pattern][:, cols], np.repeat(np.sqrt(smoothing) * reference[:, None], len(cols), axis=1)])
+            if not bounded:
+                tensions[:, cols] = np.linalg.lstsq(A, b, rcond=None)[0]
+                continue
+            for k, col in enumerate(cols):
+                tensions[:, col] = lsq_linear(A, b[:, k], bounds=(lower, upper), method="bvls").x
+
+        if single:
+            return pd.Series(tensions[:, 0], index=pd.Index(self.cables, name="Cable"), name="Tension")
+        return pd.DataFrame(tensions, index=pd.Index(self.cables, name="Cable"))
+
+    def save(self, path):
+        """
+        保存为.npz文件
+
+        参数:
+        - path: str, 文件路径
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        index = self.index.to_frame(index=False).fillna("").astype(str)
+        np.savez(path, matrix=self.matrix, cables=self.cables, index_names=np.array(index.columns, dtype=str),
+                 **{f"index_{k}": index[name].to_numpy(dtype=str) for k, name in enumerate(index.columns)})
+
+    @classmethod
+    def load(cls, path):
+        """
+        读取.npz文件
+
+        参数:
+        - path: str, 文件路径
+
+        返回:
+        - InfluenceMatrix: 影响矩阵
+        """
+        with np.load(path, allow_pickle=False) as data:
+            names = data["index_names"].tolist()
+            frame = pd.DataFrame({name: data[f"index_{k}"] for k, name in enumerate(names)})
+            frame = frame.astype(object).where(frame != "", None)
+            if "ID" in frame:
+                frame["ID"] = frame["ID"].astype(np.int64)
+            return cls(data["matrix"], data["cables"], pd.MultiIndex.from_frame(frame))
+
+
+class InfluenceBuilder:
+    """
+    影响矩阵生成器
+
+    使用方法:
+    >>> responses = [
+    ...     Measurement("displacement", girder_nodes, "DZ"),
+    ...     Measurement("cable_force", cables, "Tension")
+    ... ]
+    >>> im = InfluenceBuilder(cables, responses).build()
+    """
+
+    def __init__(self, cables, responses, prefix="IM_", unit_tension=1.0, item_id=100,
+                 case_type="PS", cache_dir=INFLUENCE_CACHE_DIR, cleanup=True):
+        """
+        参数:
+        - cables: array-like, 索单元编号
+        - responses: list, 控制点定义(Measurement列表，实测值和工况可省略)
+        - prefix: str, 单位荷载工况名称前缀，工况名称为 前缀+索单元编号
+        - unit_tension: float, 单位初拉力大小(影响矩阵按该值归一化)
+        - item_id: int, 初拉力荷载条目编号，避免与单元已有的初拉力冲突
+        - case_type: str, 单位荷载工况的类型
+        - cache_dir: str, 缓存目录，None表示不缓存
+        - cleanup: bool, 提取完成后是否删除单位荷载工况(删除后需重新分析原有工况)
+        """
+        self.cables = np.asarray(cables, dtype=np.int64)
+        if len(np.unique(self.cables)) != len(self.cables):
+            raise ValueError("索单元编号重复")
+        self.responses = list(responses)
+        self.prefix = prefix
+        self.unit_tension = float(unit_tension)
+        self.item_id = item_id
+        self.case_type = case_type
+        self.cache_dir = cache_dir
+        self.cleanup = cleanup
+
+    @property
+    def case_names(self):
+        """单位荷载工况名称"""
+        return [f"{self.prefix}{cable}" for cable in self.cables.tolist()]
+
+    def index(self):
+        """控制点标识"""
+        return pd.MultiIndex.from_tuples(
+            [(m.result_type, m.component, m.stage, i) for m in self.responses for i in m.ids],
+            names=["Type", "Component", "Stage", "ID"]
+        )
+
+    def fingerprint_tables(self):
+        """模型指纹使用的数据表，控制点含施工阶段结果时包括施工阶段定义"""
+        if any(m.stage is not None for m in self.responses):
+            return STIFFNESS_TABLES + ["STAG"]
+        return STIFFNESS_TABLES
+
+    def cache_path(self, model_key=None):
+        """
+        缓存文件路径
+
+        参数:
+        - model_key: str, 模型指纹，默认读取模型数据计算
+
+        返回:
+        - str: 缓存文件路径
+        """
+        spec = {
+            "cables": self.cables.tolist(),
+            "responses": [[m.result_type, m.ids, m.component, m.stage, m.part, list(m.unit)] for m in self.responses],
+            "unit": self.unit_tension,
+            "model": model_key or model_fingerprint(self.fingerprint_tables())
+        }
+        key = hashlib.sha1(json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"influence_{key[:16]}.npz")
+
+    def build(self, force=False, model_key=None):
+        """
+        生成影响矩阵(已缓存时直接读取)
+
+        参数:
+        - force: bool, 是否忽略缓存重新计算
+        - model_key: str, 模型指纹，默认读取模型数据计算
+
+        返回:
+        - InfluenceMatrix: 影响矩阵
+        """
+        path = self.cache_path(model_key) if self.cache_dir else None
+        if path and os.path.exists(path) and not force:
+            print(f"读取缓存的影响矩阵: {path}")
+            return InfluenceMatrix.load(path)
+
+        names = self.case_names
+        print(f'开始生成影响矩阵，共{len(names)}根索，{sum(len(m.ids) for m in self.responses)}个控制点')
+        completed = False
+        try:
+            added = StaticLoadsProcessor().add_load_cases(pd.DataFrame({"NAME": names, "TYPE": self.case_type}))
+            if any(added[name] is None for name in names):
+                raise RuntimeError("单位荷载工况添加失败")
+            responses = PrestressLoadsProcessor().add_initial_tensions(
+                self.cables, names, self.unit_tension, item_id=self.item_id
+            )
+            if any(response_failed(response) for response in responses):
+                raise RuntimeError("单位初拉力添加失败")
+            if MidasOperations.analyze() is None:
+                raise RuntimeError("影响矩阵分析失败")
+            cases = [f"{name}(ST)" for name in names]
+            matrix = np.vstack([m.extract_cases(cases) for m in self.responses]) / self.unit_tension
+            completed = True
+        finally:
+            # 生成失败时总是删除已添加的单位荷载工况
+            if self.cleanup or not completed:
+                self.remove_cases()
+
+        influence = InfluenceMatrix(matrix, self.cables, self.index())
+        if path:
+            influence.save(path)
+        print("影响矩阵生成完成")
+        return influence
+
+    def remove_cases(self):
+        """删除单位荷载工况(工况中的初拉力一并删除)"""
+        static = StaticLoadsProcessor()
+        names = self.case_names
+        ids = [case_id for case_id in (static.registry.id_of(name) for name in names) if case_id is not None]
+        if not ids:
+            return
+        failed = static.delete_many(ids)
+        deleted = np.setdiff1d(ids, failed)
+        static.registry.remove(deleted)
+        model_validator.unregister("STLD", [name for name in names if static.registry.id_of(name) is None])
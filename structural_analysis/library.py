@@ -0,0 +1,394 @@
+"""材料与截面库模块，在本地维护模型的材料和截面目录，包括：
+- 材料、截面的名称与编号索引
+- 属性完全相同的材料(截面)自动合并为同一编号
+- 新增数据暂存在本地，一次请求批量提交
+- 规范材料属性(如JTG 3362混凝土C30~C60)的本地持久化缓存
+目录数据只读取一次，之后由本地操作同步更新，打开新模型后失效
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from .api import midas_api, response_failed
+from .units import unit_system
+from .validation import model_validator
+
+# 规范材料属性缓存文件
+STANDARD_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".easy_midas", "standard_materials.json")
+
+# 规范材料属性默认值，单位为N、mm
+# ELAST: 弹性模量(MPa)，POISN: 泊松比，THERMAL: 线膨胀系数(1/℃)，DEN: 容重(N/mm³)
+DEFAULT_STANDARDS = {
+    **{
+        grade: {"TYPE": "CONC", "ELAST": elast, "POISN": 0.2, "THERMAL": 1.0e-5, "DEN": 2.6e-5,
+                "CODE": "JTG 3362-2018"}
+        for grade, elast in [
+            ("C30", 3.00e4), ("C35", 3.15e4), ("C40", 3.25e4), ("C45", 3.35e4),
+            ("C50", 3.45e4), ("C55", 3.55e4), ("C60", 3.60e4)
+        ]
+    },
+    "Q345": {"TYPE": "STEEL", "ELAST": 2.06e5, "POISN": 0.3, "THERMAL": 1.2e-5, "DEN": 7.85e-5,
+             "CODE": "JTG D64-2015"},
+    "Strand1860": {"TYPE": "STEEL", "ELAST": 1.95e5, "POISN": 0.3, "THERMAL": 1.2e-5, "DEN": 7.85e-5,
+                   "CODE": "JTG 3362-2018"}
+}
+
+
+def load_standards(path=STANDARD_CACHE_PATH):
+    """
+    读取规范材料属性缓存，缓存文件不存在时返回默认值(不创建文件，写入须调用save_standards)
+
+    参数:
+    - path: str, 缓存文件路径
+
+    返回:
+    - dict: {材料牌号: 属性}，单位为N、mm
+    """
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {grade: dict(props) for grade, props in DEFAULT_STANDARDS.items()}
+
+
+def save_standards(standards, path=STANDARD_CACHE_PATH):
+    """
+    保存规范材料属性缓存
+
+    参数:
+    - standards: dict, {材料牌号: 属性}，单位为N、mm
+    - path: str, 缓存文件路径
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(standards, f, ensure_ascii=False, indent=2)
+
+
+def material_item(**kwargs):
+    """
+    生成/db/MATL的单条材料数据，参数同PreProcessor.define_material
+
+    返回:
+    - dict: 材料数据
+    """
+    unit = kwargs.pop("unit", None)
+    if unit is not None:
+        for key, quantity in [("ELAST", "stress"), ("DEN", "weight_density"), ("MASS", "mass_density")]:
+            if kwargs.get(key) is not None:
+                kwargs[key] = float(unit_system.to_model(kwargs[key], quantity, unit))
+    return {
+        "TYPE": kwargs.get("TYPE", "USER"),
+        "NAME": kwargs.get("NAME"),
+        "HE_SPEC": kwargs.get("HE_SPEC", 0),
+        "HE_COND": kwargs.get("HE_COND", 0),
+        "PLMT": kwargs.get("PLMT", 0),
+        "P_NAME": kwargs.get("P_NAME", ""),
+        "bMASS_DENS": kwargs.get("bMASS_DENS", True),
+        "DAMP_RAT": kwargs.get("DAMP_RAT", 0),
+        "PARAM": [{
+            "P_TYPE": kwargs.get("P_TYPE", 2),
+            "ELAST": kwargs.get("ELAST"),
+            "POISN": kwargs.get("POISN"),
+            "THERMAL": kwargs.get("THERMAL"),
+            "DEN": kwargs.get("DEN"),
+            "MASS": kwargs.get("MASS")
+        }]
+    }
+
+
+class Library:
+    """
+    模型数据目录基类(材料、截面共用)
+
+    属性:
+    - table: str, 数据表名称，如"MATL"
+    - endpoint: str, 接口路径
+    - name_field: str, 数据中的名称字段
+    """
+
+    def __init__(self, table, endpoint, name_field):
+        self.table = table
+        self.endpoint = endpoint
+        self.name_field = name_field
+        self._items = None
+        self._by_name = None
+        self._by_key = None
+        self._pending = []
+
+    @property
+    def loaded(self):
+        """目录数据是否已读取"""
+        return self._items is not None
+
+    def invalidate(self):
+        """清除目录数据和未提交的数据(打开新模型后调用)"""
+        self._items = None
+        self._by_name = None
+        self._by_key = None
+        self._pending = []
+
+    def property_key(self, item):
+        """属性集合的比较键(不含名称)，键相同的数据视为相同"""
+        return json.dumps({k: v for k, v in item.items() if k != self.name_field}, sort_keys=True, ensure_ascii=False)
+
+    def load(self, force=False):
+        """
+        读取模型中已有的数据，已读取时直接使用缓存
+
+        参数:
+        - force: bool, 是否强制重新读取(未提交的数据会被丢弃)
+
+        返回:
+        - Library: 当前对象
+        """
+        if self.loaded and not force:
+            return self
+        print(f'开始读取{self.table}数据')
+        response = midas_api.request("GET", self.endpoint, {}) or {}
+        records = response.get(self.table) or next(
+            (v for k, v in response.items() if k.upper() == self.table and isinstance(v, dict)), {}
+        )
+        self._items, self._by_name, self._by_key, self._pending = {}, {}, {}, []
+        for key, item in records.items():
+            self._store(int(key), item)
+        return self
+
+    def _store(self, item_id, item):
+        """保存一条数据并更新索引"""
+        self._items[item_id] = item
+        self._by_name[item.get(self.name_field)] = item_id
+        self._by_key.setdefault(self.property_key(item), item_id)
+
+    def record(self, item_id, item):
+        """登记本地已提交的数据(未读取目录数据时忽略)"""
+        if self.loaded:
+            self._store(int(item_id), item)
+
+    def __len__(self):
+        return len(self.load()._items)
+
+    def __contains__(self, name):
+        return name in self.load()._by_name
+
+    def id_of(self, name):
+        """
+        获取数据编号
+
+        参数:
+        - name: str, 名称
+
+        返回:
+        - int: 编号，不存在时返回None
+        """
+        return self.load()._by_name.get(name)
+
+    def add(self, item, dedup=True):
+        """
+        添加数据到本地目录(暂不提交)
+        - 同名且属性相同: 返回已有编号
+        - 同名但属性不同: 修改该数据，提交时更新模型
+        - 属性与已有数据完全相同(dedup=True): 名称登记到已有编号
+
+        参数:
+        - item: dict, 接口格式的单条数据
+        - dedup: bool, 是否合并属性相同的数据
+
+        返回:
+        - int: 数据编号
+        """
+        self.load()
+        name = item.get(self.name_field)
+        key = self.property_key(item)
+        item_id = self._by_name.get(name)
+        if item_id is not None:
+            if self.property_key(self._items[item_id]) == key:
+                return item_id
+            if self._items[item_id].get(self.name_field) == name:
+                return self._update(item_id, item)
+            # 该名称合并到了其他数据，属性不同时单独添加
+            del self._by_name[name]
+        if dedup and key in self._by_key:
+            item_id = self._by_key[key]
+            self._by_name[name] = item_id
+            return item_id
+        return self._append(item)
+
+    def _append(self, item):
+        """以新编号暂存一条数据"""
+        item_id = max(self._items, default=0) + 1
+        self._store(item_id, item)
+        self._pending.append(item_id)
+        return item_id
+
+    def _update(self, item_id, item):
+        """修改已有数据，合并到该编号的其他名称保留原属性"""
+        old = self._items[item_id]
+        name = item.get(self.name_field)
+        print(f"{self.table}数据 {name} 属性已修改，提交时更新模型")
+        aliases = [alias for alias, i in self._by_name.items() if i == item_id and alias != name]
+        old_key = self.property_key(old)
+        if self._by_key.get(old_key) == item_id:
+            del self._by_key[old_key]
+        self._store(item_id, item)
+        if item_id not in self._pending:
+            self._pending.append(item_id)
+        for alias in aliases:
+            del self._by_name[alias]
+            self._append({**old, self.name_field: alias})
+        return item_id
+
+    @property
+    def pending(self):
+        """未提交的数据编号"""
+        return list(self._pending)
+
+    def upload(self, chunk_size=5000):
+        """
+        将未提交的数据一次(分批)提交到模型
+
+        参数:
+        - chunk_size: int, 每批提交的数据条数
+
+        返回:
+        - list: 各批次的响应结果
+        """
+        if not self._pending:
+            print(f"{self.table}数据无变化，无需提交")
+            return []
+        assign = {str(item_id): self._items[item_id] for item_id in self._pending}
+        print(f'开始批量提交{self.table}数据，共{len(assign)}条')
+        responses = midas_api.request_chunked("PUT", self.endpoint, assign, chunk_size)
+        # 提交失败的批次保留在待提交列表中
+        accepted = []
+        for k, response in enumerate(responses):
+            if not response_failed(response):
+                accepted.extend(self._pending[k * chunk_size:(k + 1) * chunk_size])
+        model_validator.register(self.table, accepted)
+        accepted_set = set(accepted)
+        self._pending = [item_id for item_id in self._pending if item_id not in accepted_set]
+        if self._pending:
+            print(f"{self.table}数据提交失败，{len(self._pending)}条未提交")
+        else:
+            print(f"{self.table}数据提交完成")
+        return responses
+
+    def to_frame(self):
+        """
+        将目录数据转换为DataFrame
+
+        返回:
+        - DataFrame: 列为 ID, NAME, Pending
+        """
+        items = self.load()._items
+        ids = sorted(items)
+        return pd.DataFrame({
+            "ID": np.asarray(ids, dtype=np.int64),
+            "NAME": [items[item_id].get(self.name_field) for item_id in ids],
+            "Pending": np.isin(ids, self._pending)
+        })
+
+
+class MaterialLibrary(Library):
+    """
+    材料目录
+
+    使用方法:
+    >>> ids = [material_library.standard(grade) for grade in grades]   # 相同牌号只定义一次
+    >>> material_library.upload()                                        # 一次请求提交全部新材料
+    """
+
+    def __init__(self):
+        super().__init__("MATL", "/db/MATL", "NAME")
+        self._standards = None
+
+    @property
+    def standards(self):
+        """规范材料属性(首次使用时从缓存文件读取)"""
+        if self._standards is None:
+            self._standards = load_standards()
+        return self._standards
+
+    def add_standard(self, grade, persist=True, **props):
+        """
+        添加或修改规范材料属性
+
+        参数:
+        - grade: str, 材料牌号，如"C65"
+        - persist: bool, 是否写入缓存文件
+        - props: TYPE、ELAST、POISN、THERMAL、DEN等属性，单位为N、mm
+        """
+        self.standards[grade] = {**self.standards.get(grade, {}), **props}
+        if persist:
+            save_standards(self.standards)
+
+    def material(self, name, dedup=True, **kwargs):
+        """
+        添加材料到本地目录(暂不提交)
+
+        参数:
+        - name: str, 材料名称
+        - dedup: bool, 是否合并属性相同的材料
+        - kwargs: 材料属性，参数同PreProcessor.define_material
+
+        返回:
+        - int: 材料编号
+        """
+        return self.add(material_item(NAME=name, **kwargs), dedup)
+
+    def standard(self, grade, name=None, **kwargs):
+        """
+        按规范材料牌号添加材料(属性自动换算为模型单位)
+
+        参数:
+        - grade: str, 材料牌号，如"C50"
+        - name: str, 材料名称，默认为牌号
+        - kwargs: 覆盖规范属性的参数
+
+        返回:
+        - int: 材料编号
+        """
+        if grade not in self.standards:
+            raise ValueError(f"规范材料库中不存在牌号: {grade}。可用牌号: {', '.join(self.standards)}")
+        props = {k: v for k, v in self.standards[grade].items() if k != "CODE"}
+        props.update(kwargs)
+        props.setdefault("unit", ("N", "MM"))
+        return self.material(name or grade, **props)
+
+    def define(self, materials, chunk_size=5000):
+        """
+        由表格批量定义材料并提交
+
+        参数:
+        - materials: DataFrame/list, 材料表，每行为material的参数(须含NAME列)，
+          含GRADE列时按规范牌号定义
+        - chunk_size: int, 每批提交的材料数
+
+        返回:
+        - list: 各行对应的材料编号
+        """
+        ids = []
+        for row in pd.DataFrame(materials).to_dict("records"):
+            row = {k: v for k, v in row.items() if not (np.isscalar(v) and pd.isna(v))}
+            name = row.pop("NAME", None)
+            grade = row.pop("GRADE", None)
+            ids.append(self.standard(grade, name, **row) if grade else self.material(name, **row))
+        self.upload(chunk_size)
+        return ids
+
+
+class SectionLibrary(Library):
+    """
+    截面目录
+
+    使用方法:
+    >>> sect_id = section_library.add({"SECTTYPE": "DBUSER", "SECT_NAME": "主梁", ...})
+    >>> section_library.upload()
+    """
+
+    def __init__(self):
+        super().__init__("SECT", "/db/SECT", "SECT_NAME")
+
+
+# 全局材料、截面目录实例
+material_library = MaterialLibrary()
+section_library = SectionLibrary()
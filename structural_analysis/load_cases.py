@@ -0,0 +1,203 @@
+"""荷载工况索引模块，缓存模型中的静力荷载工况，包括：
+- 工况名称与编号的双向索引
+- 按工况类型的索引
+- 空闲工况编号的分配
+工况数据只读取一次，之后由本地的添加、修改、删除操作同步更新，打开新模型后失效
+"""
+
+import numpy as np
+import pandas as pd
+from .api import midas_api
+
+
+class LoadCaseRegistry:
+    """
+    静力荷载工况索引
+
+    使用方法:
+    >>> load_case_registry.id_of("二期恒载")
+    >>> load_case_registry.ids_of_type("D")
+    >>> load_case_registry.allocate(3)
+    """
+
+    def __init__(self):
+        self._cases = None
+        self._by_name = None
+
+    @property
+    def loaded(self):
+        """工况数据是否已读取"""
+        return self._cases is not None
+
+    def invalidate(self):
+        """清除缓存的工况数据(打开新模型后调用)"""
+        self._cases = None
+        self._by_name = None
+
+    def load(self, force=False, response=None):
+        """
+        读取模型中的静力荷载工况，已读取时直接使用缓存
+
+        参数:
+        - force: bool, 是否强制重新读取
+        - response: dict, 已查询到的/db/STLD响应数据，提供时不再发送请求
+
+        返回:
+        - LoadCaseRegistry: 当前对象
+        """
+        if self.loaded and not force and response is None:
+            return self
+        if response is None:
+            print('开始读取荷载工况数据')
+            response = midas_api.request("GET", "/db/STLD", {})
+        table = (response or {}).get("STLD", {})
+        self._cases = {}
+        self._by_name = {}
+        for key, item in table.items():
+            self._store(int(key), item["NAME"], item.get("TYPE", ""), item.get("DESC", ""))
+        return self
+
+    def _store(self, case_id, name, case_type, description):
+        """保存一条工况数据并更新名称索引"""
+        old = self._cases.get(case_id)
+        if old is not None and self._by_name.get(old[0]) == case_id:
+            del self._by_name[old[0]]
+        self._cases[case_id] = (name, case_type, description)
+        self._by_name[name] = case_id
+
+    def record(self, case_ids, names, case_types, descriptions=None):
+        """
+        登记本地新增或修改的工况(未读取工况数据时先读取)
+
+        参数:
+        - case_ids: int/array-like, 工况编号
+        - names: str/array-like, 工况名称
+        - case_types: str/array-like, 工况类型
+        - descriptions: str/array-like, 工况描述，None表示保留原值(新增工况为空)
+        """
+        self.load()
+        case_ids = np.atleast_1d(case_ids).astype(np.int64).tolist()
+        n = len(case_ids)
+        names = np.broadcast_to(np.asarray(names, dtype=object), n).tolist()
+        case_types = np.broadcast_to(np.asarray(case_types, dtype=object), n).tolist()
+        descriptions = np.broadcast_to(np.asarray(descriptions, dtype=object), n).tolist()
+        for case_id, name, case_type, description in zip(case_ids, names, case_types, descriptions):
+            old = self._cases.get(case_id, (None, "", ""))
+            self._store(
+                case_id,
+                old[0] if name is None else name,
+                old[1] if case_type is None else case_type,
+                old[2] if description is None else description
+            )
+
+    def remove(self, case_ids=None):
+        """
+        登记本地删除的工况(未读取工况数据时忽略)
+
+        参数:
+        - case_ids: int/array-like, 工况编号，None表示全部删除
+        """
+        if not self.loaded:
+            return
+        if case_ids is None:
+            self._cases.clear()
+            self._by_name.clear()
+            return
+        for case_id in np.atleast_1d(case_ids).astype(np.int64).tolist():
+            name = self._cases.pop(case_id, (None,))[0]
+            if self._by_name.get(name) == case_id:
+                del self._by_name[name]
+
+    def __len__(self):
+        return len(self.load()._cases)
+
+    def __contains__(self, name):
+        return name in self.load()._by_name
+
+    def id_of(self, name):
+        """
+        获取工况编号
+
+        参数:
+        - name: str, 工况名称
+
+        返回:
+        - int: 工况编号，工况不存在时返回None
+        """
+        return self.load()._by_name.get(name)
+
+    def name_of(self, case_id):
+        """
+        获取工况名称
+
+        参数:
+        - case_id: int/str, 工况编号
+
+        返回:
+        - str: 工况名称，工况不存在时返回None
+        """
+        case = self.load()._cases.get(int(case_id))
+        return None if case is None else case[0]
+
+    def resolve(self, case):
+        """
+        将工况名称或编号统一转换为工况名称
+
+        参数:
+        - case: str/int, 工况名称或编号(整数)
+
+        返回:
+        - str: 工况名称
+        """
+        if isinstance(case, (int, np.integer)):
+            name = self.name_of(case)
+            if name is None:
+                raise ValueError(f"模型中不存在编号为 {case} 的荷载工况")
+            return name
+        return case
+
+    def ids_of_type(self, case_type):
+        """
+        获取指定类型的全部工况编号
+
+        参数:
+        - case_type: str, 工况类型，如"D"
+
+        返回:
+        - ndarray: 工况编号(升序)
+        """
+        ids = [case_id for case_id, case in self.load()._cases.items() if case[1] == case_type]
+        return np.sort(np.asarray(ids, dtype=np.int64))
+
+    def allocate(self, count=1):
+        """
+        分配未使用的工况编号(优先使用已删除工况留下的空位)
+
+        参数:
+        - count: int, 需要的编号数量
+
+        返回:
+        - ndarray: 编号(升序)
+        """
+        used = np.fromiter(self.load()._cases, dtype=np.int64)
+        candidates = np.arange(1, len(used) + count + 1)
+        return candidates[~np.isin(candidates, used)][:count]
+
+    def to_frame(self):
+        """
+        将工况数据转换为DataFrame
+
+        返回:
+        - DataFrame: 列为 ID, NAME, TYPE, DESC，按编号排序
+        """
+        cases = self.load()._cases
+        ids = sorted(cases)
+        return pd.DataFrame(
+            [cases[case_id] for case_id in ids],
+            index=pd.Index(ids, name="ID", dtype=np.int64),
+            columns=["NAME", "TYPE", "DESC"]
+        ).reset_index()
+
+
+# 全局荷载工况索引实例
+load_case_registry = LoadCaseRegistry()
@@ -9,6 +9,13 @@ import subprocess
 import time
 import os
 from .api import midas_api
+from .cache import result_cache
+from .units import unit_system
+from .geometry import geometry_index
+from .validation import model_validator
+from .load_cases import load_case_registry
+from .stages import stage_registry
+from .library import material_library, section_library
 
 class MidasOperations:
     @staticmethod
@@ -72,6 +79,14 @@ class MidasOperations:
         
         # 发送打开文件请求
         response = midas_api.request("POST", "/doc/open", open_file_json)
+        result_cache.invalidate()
+        unit_system.invalidate()
+        geometry_index.invalidate()
+        model_validator.reset()
+        load_case_registry.invalidate()
+        stage_registry.invalidate()
+        material_library.invalidate()
+        section_library.invalidate()
         
         # 检查响应结果
         if response.get("message") == 'MIDAS CIVIL NX command complete':
@@ -95,9 +110,11 @@ class MidasOperations:
         """
         print('开始运行计算')
         response = midas_api.request("POST", "/doc/anal", {})
+        result_cache.invalidate(midas_api.base_url)
         
         # 检查响应消息
         if isinstance(response, dict) and response.get("message") == "MIDAS CIVIL NX command complete":
+            result_cache.mark_analyzed()
             print('计算完成')
             return response
         else:
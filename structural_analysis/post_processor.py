@@ -8,12 +8,33 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .api import midas_api
+from .result_tensor import StageResultTensor
+from .envelope import compute_envelope
+from .batch_plot import render_batch
+from .cache import result_cache
+from .units import CANONICAL_UNIT, convert_table
+from .downsample import downsample, pair_average
+from .geometry import geometry_index
+from .stages import stage_registry
 
 class PostProcessor:
     """后处理基类，提供通用的绘图设置和数据处理功能"""
     
-    def __init__(self):
+    # 单条曲线的最大绘图点数，超过时按分桶降采样(保留峰值)
+    MAX_PLOT_POINTS = 5000
+    
+    # 增量提取施工阶段结果时每个请求包含的阶段步骤数
+    STAGE_CHUNK = 10
+    
+    def __init__(self, use_cache=None):
+        """
+        参数:
+        - use_cache: bool, 是否使用结果缓存，默认仅在本库对当前连接运行分析后使用
+          (True表示确认模型结果未在外部重新计算，False表示总是重新请求)
+        """
+        self.use_cache = use_cache
         self._setup_plot_style()
         
     def _setup_plot_style(self):
@@ -25,6 +46,238 @@ class PostProcessor:
             'font.size': 10
         })
 
+    def _plot_curve(self, ax, x, y, max_points=MAX_PLOT_POINTS, method="minmax"):
+        """
+        绘制结果曲线，点数超过max_points时先降采样
+        
+        参数:
+        - ax: matplotlib.axes, 绘图轴对象
+        - x: array-like, 横坐标
+        - y: array-like, 纵坐标
+        - max_points: int/None, 最大绘图点数，None表示不降采样
+        - method: str, 降采样方法("minmax"保留每个分桶的最大最小值，"lttb"保留曲线形状)
+        """
+        x, y = downsample(x, y, max_points, method)
+        ax.plot(x, y, marker="o", linestyle="-")
+
+    def _request_table(self, data):
+        """
+        提取结果表，结果统一以基准单位请求并缓存，再在本地换算为请求的单位
+        
+        参数:
+        - data: dict, /post/table请求数据，UNIT和STYLES为用户请求的单位和格式
+        
+        返回:
+        - dict: 接口返回格式的结果，数值已换算为请求的单位
+        """
+        argument = data["Argument"]
+        unit = (argument["UNIT"]["FORCE"], argument["UNIT"]["DIST"])
+        styles = argument["STYLES"]
+        
+        canonical = dict(argument)
+        canonical["UNIT"] = {"FORCE": CANONICAL_UNIT[0], "DIST": CANONICAL_UNIT[1]}
+        canonical["STYLES"] = {"FORMAT": "Scientific", "PLACE": 12}
+        
+        if not self._cache_enabled():
+            response = midas_api.request("POST", "/post/table", {"Argument": canonical})
+        elif canonical.get("OPT_CS") and canonical.get("STAGE_STEP"):
+            # 施工阶段结果按(阶段步骤, 结果表)分别缓存，只请求未缓存的阶段步骤
+            response = self._request_stage_table(canonical)
+        else:
+            key = result_cache.make_key(canonical)
+            response = result_cache.get(key)
+            if response is None:
+                response = midas_api.request("POST", "/post/table", {"Argument": canonical})
+                if not response or "error" in response:
+                    return response
+                result_cache.put(key, response)
+        if not response or "error" in response:
+            return response
+        
+        return convert_table(
+            response, CANONICAL_UNIT, unit,
+            format_style=styles.get("FORMAT"), decimal_places=styles.get("PLACE")
+        )
+
+    def _cache_enabled(self):
+        """当前请求是否使用结果缓存"""
+        return result_cache.active() if self.use_cache is None else self.use_cache
+
+    @staticmethod
+    def _stage_step_mask(stages, steps, stage_step):
+        """
+        结果行是否属于指定的阶段步骤(如"CS1:002(最后)")
+        
+        参数:
+        - stages: array-like, 各行的Stage列
+        - steps: array-like/None, 各行的Step列，None表示结果不含Step列
+        - stage_step: str, 阶段步骤名称
+        
+        返回:
+        - ndarray: 布尔数组
+        """
+        stage, _, step = stage_step.partition(":")
+        mask = np.asarray(stages, dtype=str) == stage
+        if step and steps is not None:
+            step_number = step.split("(")[0].strip()
+            row_numbers = pd.Series(np.asarray(steps, dtype=str)).str.split("(").str[0].str.strip()
+            mask &= (row_numbers == step_number).to_numpy()
+        return mask
+
+    def _request_stage_table(self, canonical):
+        """
+        按阶段步骤增量提取施工阶段结果(基准单位)
+        
+        各阶段步骤的结果以单独的键缓存，只请求缓存中缺少的阶段步骤，结果按请求的阶段顺序合并
+        
+        参数:
+        - canonical: dict, 基准单位的请求参数
+        
+        返回:
+        - dict: 接口返回格式的结果
+        """
+        steps = list(canonical["STAGE_STEP"])
+        keys = {step: result_cache.make_key({**canonical, "STAGE_STEP": [step]}) for step in steps}
+        cached = {step: result_cache.get(key) for step, key in keys.items()}
+        missing = [step for step in steps if cached[step] is None]
+        
+        if missing:
+            response = midas_api.request("POST", "/post/table", {"Argument": {**canonical, "STAGE_STEP": missing}})
+            if not response or "error" in response:
+                return response
+            table_name = canonical["TABLE_NAME"]
+            table = response.get(table_name) or next(
+                (v for v in response.values() if isinstance(v, dict) and "HEAD" in v), {"HEAD": [], "DATA": []}
+            )
+            head, rows = table["HEAD"], table["DATA"]
+            data = np.array(rows, dtype=object).reshape(len(rows), len(head))
+            stage_col = data[:, head.index("Stage")] if "Stage" in head else np.full(len(rows), "")
+            step_col = data[:, head.index("Step")] if "Step" in head else None
+            if step_col is not None:
+                # 以MIDAS返回的步骤名称为准
+                stage_registry.record_steps(stage_col, step_col)
+            for step in missing:
+                mask = self._stage_step_mask(stage_col, step_col, step)
+                cached[step] = {table_name: {**table, "DATA": [row for row, keep in zip(rows, mask) if keep]}}
+                result_cache.put(keys[step], cached[step])
+        
+        # 按请求的阶段顺序合并各阶段步骤的结果
+        merged = {}
+        for step in steps:
+            for table_name, table in cached[step].items():
+                if table_name not in merged:
+                    merged[table_name] = {**table, "DATA": list(table["DATA"])}
+                else:
+                    merged[table_name]["DATA"].extend(table["DATA"])
+        return merged
+
+    def iter_construction(self, elems=None, load_case="合计(CS)", stages=None, chunk_size=None,
+                          workers=4, **kwargs):
+        """
+        增量提取施工阶段结果，逐个阶段步骤返回(生成器)
+        
+        已缓存的阶段步骤不再请求，其余阶段步骤分组后并行请求，按到达顺序依次返回，
+        可在后续阶段仍在提取时处理已返回的阶段
+        
+        参数:
+        - elems: 单元(节点)选择参数，同extract_construction
+        - load_case: str/list, 荷载工况名称
+        - stages: list, 阶段名称或STAGE_STEP名称，None表示全部阶段(各阶段最后一步)
+        - chunk_size: int, 每个请求包含的阶段步骤数，默认为STAGE_CHUNK
+        - workers: int, 并行请求数
+        - kwargs: 其他可选参数(同extract_construction)
+        
+        返回:
+        - generator: 依次产生(阶段步骤名称, 处理后的DataFrame)
+        
+        示例:
+        >>> for step, df in force.iter_construction(elems="主梁", stages=stage_registry.names):
+        ...     dashboard.draw(step, df)
+        """
+        steps = stage_registry.resolve(stage_registry.names if stages is None else stages)
+        chunk_size = chunk_size or self.STAGE_CHUNK
+        chunks = [steps[i:i + chunk_size] for i in range(0, len(steps), chunk_size)]
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        futures = {}
+        try:
+            futures = {
+                executor.submit(midas_api.bind(self.extract_construction), elems, load_case, chunk, **kwargs): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                raw = future.result()
+                if not raw or "error" in raw:
+                    raise RuntimeError(f"施工阶段结果提取失败: {futures[future]}")
+                df = self.process_general_results(raw)
+                step_col = df["Step"] if "Step" in df.columns else None
+                for step in futures[future]:
+                    yield step, df[self._stage_step_mask(df["Stage"], step_col, step)]
+        finally:
+            # 提前结束迭代时取消尚未开始的请求
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _process_load_case_selection(self, load_case):
+        """
+        处理荷载工况选择的辅助方法
+        
+        参数:
+        - load_case: str/list, 单个荷载工况名称或工况名称列表
+        
+        返回:
+        - list: 符合MIDAS接口要求的工况名称列表
+        """
+        if isinstance(load_case, (list, tuple)):
+            return list(load_case)
+        return [load_case]
+
+    def process_construction_tensor(self, raw_data, components=None, path=None):
+        """
+        处理施工阶段结果数据，返回阶段 × 步骤 × 单元 × 部件 × 分量的结果张量
+        
+        参数:
+        - raw_data: dict, extract_construction返回的原始结果
+        - components: list, 需要保存的分量，默认为全部数值列
+        - path: str, 存储目录，指定时结果写入磁盘内存映射文件
+        
+        返回:
+        - StageResultTensor: 施工阶段结果张量
+        """
+        df = self.process_general_results(raw_data)
+        return StageResultTensor.from_dataframe(df, components=components, path=path)
+
+    def envelope(self, results, components=None, by="Load"):
+        """
+        计算多个荷载工况或施工阶段结果的包络
+        
+        参数:
+        - results: DataFrame/list/StageResultTensor, 处理后的结果数据
+        - components: list, 参与包络的分量，默认为全部数值列
+        - by: str, 区分工况的列名("Load"或"Stage")
+        
+        返回:
+        - DataFrame: 各结果行、各分量的最大值、最小值、绝对值最大值及控制工况
+        """
+        return compute_envelope(results, components=components, by=by)
+
+    def render_batch(self, results, components, output_dir, workers=None, **kwargs):
+        """
+        批量输出结果图(无界面，不调用plt.show())，每个阶段/工况与分量输出一张图片
+        
+        参数:
+        - results: list/dict/DataFrame/StageResultTensor, 处理后的结果数据
+        - components: str/list, 绘制的分量
+        - output_dir: str, 输出目录
+        - workers: int, 并行进程数，None为CPU核数，0或1表示在当前进程中依次绘制
+        - kwargs: 其他参数(by, fmt, figsize, dpi, title)，见batch_plot.render_batch
+        
+        返回:
+        - list: 输出图片路径列表
+        """
+        return render_batch(self, results, components, output_dir, workers=workers, **kwargs)
+
 
 class BeamForceProcessor(PostProcessor):
     """梁单元内力处理类"""
@@ -69,7 +322,7 @@ class BeamForceProcessor(PostProcessor):
             - str: "101 to 105" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -94,11 +347,11 @@ class BeamForceProcessor(PostProcessor):
                     "Torsion", "Moment-y", "Moment-z", "Bi-Moment", "T-Moment", "W-Moment"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "PARTS": kwargs.get("parts", ["PartI", "PartJ"])
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, elems=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -110,8 +363,8 @@ class BeamForceProcessor(PostProcessor):
             - str: "101 to 105" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         """
         data = {
@@ -131,13 +384,13 @@ class BeamForceProcessor(PostProcessor):
                     "Torsion", "Moment-y", "Moment-z", "Bi-Moment", "T-Moment", "W-Moment"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "PARTS": kwargs.get("parts", ["PartI", "PartJ"]),
                 "OPT_CS": True,
-                "STAGE_STEP": stages
+                "STAGE_STEP": stage_registry.resolve(stages)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -170,7 +423,7 @@ class BeamForceProcessor(PostProcessor):
         - df: DataFrame/list, 结果数据
         - component: str, 绘制的内力分量
         - title: str, 图表标题
-        - kwargs: 其他绘图参数
+        - kwargs: 其他绘图参数，max_points为最大绘图点数(默认5000，None表示不降采样)，method为降采样方法("minmax"或"lttb")，path为geometry_index.chainage返回的路径(以里程为横坐标)
         """
         if isinstance(df, list):  # 施工阶段结果
             fig, axes = plt.subplots(len(df), 1, 
@@ -182,29 +435,34 @@ class BeamForceProcessor(PostProcessor):
             for i, stage_df in enumerate(df):
                 stage_name = stage_df["Stage"].iloc[0]
                 self._plot_single_result(stage_df, component, axes[i], 
-                                       title=f"施工阶段 {stage_name} - {component} 分布图")
+                                       title=f"施工阶段 {stage_name} - {component} 分布图", **kwargs)
                 
         else:  # General结果
             plt.figure(figsize=(10, 3), dpi=100)
             self._plot_single_result(df, component, plt.gca(), 
-                                   title=title or f"{component} 分布图")
+                                   title=title or f"{component} 分布图", **kwargs)
         
         plt.tight_layout()
         plt.show()
         
-    def _plot_single_result(self, df, component, ax, title):
-        """绘制单个结果图"""
-        elem_values = df["Elem"].unique()
+    def _plot_single_result(self, df, component, ax, title, max_points=PostProcessor.MAX_PLOT_POINTS,
+                            method="minmax", path=None):
+        """绘制单个结果图，指定path(geometry_index.chainage的返回值)时以里程为横坐标"""
+        if path is not None:
+            df = geometry_index.map_stations(df, path)
         comp_values = df[component].values
         
-        x = np.append(elem_values, [elem_values[-1]+1])
-        y = [comp_values[0]] + [
-            (comp_values[i] + comp_values[i+1])/2 
-            for i in range(1, len(comp_values)-2, 2)
-        ] + [comp_values[-1]]
+        # 相邻单元的J端与I端取平均，首尾保留端部值
+        if path is not None:
+            stations = df["Station"].values
+            x = np.concatenate([stations[:1], pair_average(stations[1:-1]), stations[-1:]])
+        else:
+            elem_values = df["Elem"].unique()
+            x = np.append(elem_values, [elem_values[-1]+1])
+        y = np.concatenate([comp_values[:1], pair_average(comp_values[1:-1]), comp_values[-1:]])
         
-        ax.plot(x, y, marker="o", linestyle="-")
-        ax.set_xlabel("单元编号", fontsize=10, family='SimSun')
+        self._plot_curve(ax, x, y, max_points, method)
+        ax.set_xlabel("里程" if path is not None else "单元编号", fontsize=10, family='SimSun')
         ax.set_ylabel(f"{component} (单位)", fontsize=10, family='SimSun')
         ax.set_title(title, fontsize=10, family='SimSun')
         ax.grid(True)
@@ -257,7 +515,7 @@ class BeamStressProcessor(PostProcessor):
             - str: "101 to 105" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -283,11 +541,11 @@ class BeamStressProcessor(PostProcessor):
                     "Cb1(-y+z)", "Cb2(+y+z)", "Cb3(+y-z)", "Cb4(-y-z)"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "PARTS": kwargs.get("parts", ["PartI", "PartJ"])
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, elems=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -299,8 +557,8 @@ class BeamStressProcessor(PostProcessor):
             - str: "101 to 105" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         """
         data = {
@@ -321,13 +579,13 @@ class BeamStressProcessor(PostProcessor):
                     "Cb1(-y+z)", "Cb2(+y+z)", "Cb3(+y-z)", "Cb4(-y-z)"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "PARTS": kwargs.get("parts", ["PartI", "PartJ"]),
                 "OPT_CS": True,
-                "STAGE_STEP": stages
+                "STAGE_STEP": stage_registry.resolve(stages)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -361,7 +619,7 @@ class BeamStressProcessor(PostProcessor):
         - df: DataFrame/list, 结果数据
         - component: str, 绘制的应力分量
         - title: str, 图表标题
-        - kwargs: 其他绘图参数
+        - kwargs: 其他绘图参数，max_points为最大绘图点数(默认5000，None表示不降采样)，method为降采样方法("minmax"或"lttb")，path为geometry_index.chainage返回的路径(以里程为横坐标)
         """
         if isinstance(df, list):  # 施工阶段结果
             fig, axes = plt.subplots(len(df), 1, 
@@ -373,17 +631,18 @@ class BeamStressProcessor(PostProcessor):
             for i, stage_df in enumerate(df):
                 stage_name = stage_df["Stage"].iloc[0]
                 self._plot_single_result(stage_df, component, axes[i], 
-                                       title=f"施工阶段 {stage_name} - {component} 分布图")
+                                       title=f"施工阶段 {stage_name} - {component} 分布图", **kwargs)
                 
         else:  # General结果
             plt.figure(figsize=(10, 3), dpi=100)
             self._plot_single_result(df, component, plt.gca(), 
-                                   title=title or f"{component} 分布图")
+                                   title=title or f"{component} 分布图", **kwargs)
         
         plt.tight_layout()
         plt.show()
         
-    def _plot_single_result(self, df, component, ax, title):
+    def _plot_single_result(self, df, component, ax, title, max_points=PostProcessor.MAX_PLOT_POINTS,
+                            method="minmax", path=None):
         """
         绘制单个应力结果图
         
@@ -392,6 +651,9 @@ class BeamStressProcessor(PostProcessor):
         - component: str, 要绘制的应力分量
         - ax: matplotlib.axes, 绘图轴对象
         - title: str, 图表标题
+        - max_points: int/None, 最大绘图点数，None表示不降采样
+        - method: str, 降采样方法("minmax"或"lttb")
+        - path: DataFrame, geometry_index.chainage的返回值，指定时以里程为横坐标
         """
         '''
         # 直接绘制单元编号和应力值
@@ -408,22 +670,19 @@ class BeamStressProcessor(PostProcessor):
             label.set_fontname("Times New Roman")
         '''
 
-        # 提取单元编号和应力分量
-        elem_values = df["Elem"].values
+        # 提取单元编号(或里程)和应力分量
+        if path is not None:
+            df = geometry_index.map_stations(df, path)
+        elem_values = df["Station" if path is not None else "Elem"].values
         stress_values = df[component].values
 
-        # 平滑处理：将每两点合并为一个点
-        x = [(elem_values[i] + elem_values[i + 1]) / 2 for i in range(0, len(elem_values) - 1, 2)]
-        y = [(stress_values[i] + stress_values[i + 1]) / 2 for i in range(0, len(stress_values) - 1, 2)]
-
-        # 如果长度是奇数，保留最后一个点
-        if len(elem_values) % 2 != 0:
-            x.append(elem_values[-1])
-            y.append(stress_values[-1])
+        # 平滑处理：将每两点合并为一个点(长度为奇数时保留最后一个点)
+        x = pair_average(elem_values)
+        y = pair_average(stress_values)
     
         # 绘制应力分布图
-        ax.plot(x, y, marker="o", linestyle="-")
-        ax.set_xlabel("单元编号", fontsize=10, family='SimSun')
+        self._plot_curve(ax, x, y, max_points, method)
+        ax.set_xlabel("里程" if path is not None else "单元编号", fontsize=10, family='SimSun')
         ax.set_ylabel(f"{component} (单位)", fontsize=10, family='SimSun')
         ax.set_title(title, fontsize=10, family='SimSun')
         ax.grid(True)
@@ -444,7 +703,7 @@ class BeamStressProcessorSevenDOF(BeamStressProcessor):
         
         参数:
         - elems: list/None, 提取的单元范围
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -470,11 +729,11 @@ class BeamStressProcessorSevenDOF(BeamStressProcessor):
                     "Cb(min/max)", "Cb1(-y+z)", "Cb2(+y+z)", "Cb3(+y-z)", "Cb4(-y-z)"
                 ],
                 "NODE_ELEMS": {"TO": elems},
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "PARTS": kwargs.get("parts", ["PartI", "PartJ"])
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, elems=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -482,8 +741,8 @@ class BeamStressProcessorSevenDOF(BeamStressProcessor):
         
         参数:
         - elems: list/None, 提取的单元范围
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         """
         data = {
@@ -504,13 +763,13 @@ class BeamStressProcessorSevenDOF(BeamStressProcessor):
                     "Cb(min/max)", "Cb1(-y+z)", "Cb2(+y+z)", "Cb3(+y-z)", "Cb4(-y-z)"
                 ],
                 "NODE_ELEMS": {"TO": elems},
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "PARTS": kwargs.get("parts", ["PartI", "PartJ"]),
                 "OPT_CS": True,
-                "STAGE_STEP": stages
+                "STAGE_STEP": stage_registry.resolve(stages)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -549,7 +808,7 @@ class BeamStressProcessorSevenDOF(BeamStressProcessor):
         - df: DataFrame/list, 结果数据
         - component: str, 绘制的应力分量
         - title: str, 图表标题
-        - kwargs: 其他绘图参数
+        - kwargs: 其他绘图参数，max_points为最大绘图点数(默认5000，None表示不降采样)，method为降采样方法("minmax"或"lttb")，path为geometry_index.chainage返回的路径(以里程为横坐标)
         """
         if isinstance(df, list):  # 施工阶段结果
             fig, axes = plt.subplots(len(df), 1, 
@@ -561,17 +820,18 @@ class BeamStressProcessorSevenDOF(BeamStressProcessor):
             for i, stage_df in enumerate(df):
                 stage_name = stage_df["Stage"].iloc[0]
                 self._plot_single_result(stage_df, component, axes[i], 
-                                         title=f"施工阶段 {stage_name} - {component} 分布图")
+                                         title=f"施工阶段 {stage_name} - {component} 分布图", **kwargs)
                 
         else:  # General结果
             plt.figure(figsize=(10, 3), dpi=100)
             self._plot_single_result(df, component, plt.gca(), 
-                                     title=title or f"{component} 分布图")
+                                     title=title or f"{component} 分布图", **kwargs)
         
         plt.tight_layout()
         plt.show()
         
-    def _plot_single_result(self, df, component, ax, title):
+    def _plot_single_result(self, df, component, ax, title, max_points=PostProcessor.MAX_PLOT_POINTS,
+                            method="minmax", path=None):
         """
         绘制单个应力结果图
         
@@ -580,23 +840,23 @@ class BeamStressProcessorSevenDOF(BeamStressProcessor):
         - component: str, 要绘制的应力分量
         - ax: matplotlib.axes, 绘图轴对象
         - title: str, 图表标题
-        """
-        # 提取单元编号和应力分量
-        elem_values = df["Elem"].values
+        - max_points: int/None, 最大绘图点数，None表示不降采样
+        - method: str, 降采样方法("minmax"或"lttb")
+        - path: DataFrame, geometry_index.chainage的返回值，指定时以里程为横坐标
+        """
+        # 提取单元编号(或里程)和应力分量
+        if path is not None:
+            df = geometry_index.map_stations(df, path)
+        elem_values = df["Station" if path is not None else "Elem"].values
         stress_values = df[component].values
 
-        # 平滑处理：将每两点合并为一个点
-        x = [(elem_values[i] + elem_values[i + 1]) / 2 for i in range(0, len(elem_values) - 1, 2)]
-        y = [(stress_values[i] + stress_values[i + 1]) / 2 for i in range(0, len(stress_values) - 1, 2)]
-
-        # 如果长度是奇数，保留最后一个点
-        if len(elem_values) % 2 != 0:
-            x.append(elem_values[-1])
-            y.append(stress_values[-1])
+        # 平滑处理：将每两点合并为一个点(长度为奇数时保留最后一个点)
+        x = pair_average(elem_values)
+        y = pair_average(stress_values)
     
         # 绘制应力分布图
-        ax.plot(x, y, marker="o", linestyle="-")
-        ax.set_xlabel("单元编号", fontsize=10, family='SimSun')
+        self._plot_curve(ax, x, y, max_points, method)
+        ax.set_xlabel("里程" if path is not None else "单元编号", fontsize=10, family='SimSun')
         ax.set_ylabel(f"{component} (单位)", fontsize=10, family='SimSun')
         ax.set_title(title, fontsize=10, family='SimSun')
         ax.grid(True)
@@ -650,7 +910,7 @@ class TrussForceProcessor(PostProcessor):
             - str: "33 to 36" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -671,10 +931,10 @@ class TrussForceProcessor(PostProcessor):
                 },
                 "COMPONENTS": ["Elem", "Load", "Force-I", "Force-J"],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case]
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, elems=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -686,8 +946,8 @@ class TrussForceProcessor(PostProcessor):
             - str: "33 to 36" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         """
         data = {
@@ -704,12 +964,12 @@ class TrussForceProcessor(PostProcessor):
                 },
                 "COMPONENTS": ["Elem", "Load", "Stage", "Step", "Force-I", "Force-J"],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "OPT_CS": True,
-                "STAGE_STEP": stages
+                "STAGE_STEP": stage_registry.resolve(stages)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -818,7 +1078,7 @@ class TrussStressProcessor(PostProcessor):
             - str: "33 to 36" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -839,10 +1099,10 @@ class TrussStressProcessor(PostProcessor):
                 },
                 "COMPONENTS": ["Elem", "Load", "Stress-I", "Stress-J"],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case]
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, elems=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -854,8 +1114,8 @@ class TrussStressProcessor(PostProcessor):
             - str: "33 to 36" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         """
         data = {
@@ -872,12 +1132,12 @@ class TrussStressProcessor(PostProcessor):
                 },
                 "COMPONENTS": ["Elem", "Load", "Stage", "Step", "Stress-I", "Stress-J"],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "OPT_CS": True,
-                "STAGE_STEP": stages
+                "STAGE_STEP": stage_registry.resolve(stages)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -984,7 +1244,7 @@ class CableForceProcessor(PostProcessor):
             - str: "101 to 105" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -1008,10 +1268,10 @@ class CableForceProcessor(PostProcessor):
                     "Tension", "FX", "FY", "FZ", "Tension", "FX", "FY", "FZ"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case]
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, elems=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -1023,8 +1283,8 @@ class CableForceProcessor(PostProcessor):
             - str: "101 to 105" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         """
         data = {
@@ -1044,12 +1304,12 @@ class CableForceProcessor(PostProcessor):
                     "Tension", "FX", "FY", "FZ", "Tension", "FX", "FY", "FZ"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "OPT_CS": True,
-                "STAGE_STEP": stages
+                "STAGE_STEP": stage_registry.resolve(stages)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -1158,7 +1418,7 @@ class CableEfficiencyProcessor(PostProcessor):
             - str: "1 to 3" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -1183,10 +1443,10 @@ class CableEfficiencyProcessor(PostProcessor):
                     "ExA(mod)", "Efficiency"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case]
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, elems=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -1198,8 +1458,8 @@ class CableEfficiencyProcessor(PostProcessor):
             - str: "101 to 105" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         """
         data = {
@@ -1220,12 +1480,12 @@ class CableEfficiencyProcessor(PostProcessor):
                     "ExA(mod)", "Efficiency"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "OPT_CS": True,
-                "STAGE_STEP": stages
+                "STAGE_STEP": stage_registry.resolve(stages)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -1294,7 +1554,7 @@ class CableConfigurationProcessor(PostProcessor):
             - str: "1 to 3" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -1320,10 +1580,10 @@ class CableConfigurationProcessor(PostProcessor):
                     "SkewAngle/IEnd", "SkewAngle/JEnd"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case]
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, elems=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -1335,8 +1595,8 @@ class CableConfigurationProcessor(PostProcessor):
             - str: "101 to 105" (指定单元范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定单元，提取所有单元
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         """
         data = {
@@ -1357,12 +1617,12 @@ class CableConfigurationProcessor(PostProcessor):
                     "HorizontalDistance", "VerticalDistance", "Gradient"
                 ],
                 "NODE_ELEMS": self._process_elem_selection(elems),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "OPT_CS": True,
-                "STAGE_STEP": stages
+                "STAGE_STEP": stage_registry.resolve(stages)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -1432,7 +1692,7 @@ class DisplacementProcessor(PostProcessor):
             - str: "101 to 105" (指定节点范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定节点，提取所有节点
-        - load_case: str, 荷载工况名称
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
         - kwargs: 可选参数，包括:
             - force_unit: str, 力单位
             - dist_unit: str, 距离单位
@@ -1455,10 +1715,10 @@ class DisplacementProcessor(PostProcessor):
                     "Node", "Load", "DX", "DY", "DZ", "RX", "RY", "RZ", "RW"
                 ],
                 "NODE_ELEMS": self._process_node_selection(nodes),
-                "LOAD_CASE_NAMES": [load_case]
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case)
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def extract_construction(self, nodes=None, load_case="合计(CS)", stages=None, **kwargs):
         """
@@ -1470,8 +1730,8 @@ class DisplacementProcessor(PostProcessor):
             - str: "101 to 105" (指定节点范围)
             - str: "SG1" (指定结构组名称)
             - None: 不指定节点，提取所有节点
-        - load_case: str, 荷载工况名称
-        - stages: list, 施工阶段列表
+        - load_case: str/list, 荷载工况名称，传入列表时一次提取多个工况
+        - stages: list, 施工阶段列表，可为阶段名称(取阶段最后一步)或STAGE_STEP名称
         - kwargs: 其他可选参数(同extract_general)
         - disp_opt: str, 位移选项("Accumulative", "Current", "Real")
         """
@@ -1492,13 +1752,13 @@ class DisplacementProcessor(PostProcessor):
                     "DX", "DY", "DZ", "RX", "RY", "RZ"
                 ],
                 "NODE_ELEMS": self._process_node_selection(nodes),
-                "LOAD_CASE_NAMES": [load_case],
+                "LOAD_CASE_NAMES": self._process_load_case_selection(load_case),
                 "OPT_CS": True,
-                "STAGE_STEP": stages,
+                "STAGE_STEP": stage_registry.resolve(stages),
                 "DISP_OPT": kwargs.get("disp_opt", "Accumulative")
             }
         }
-        return midas_api.request("POST", "/post/table", data)
+        return self._request_table(data)
 
     def process_general_results(self, raw_data):
         """处理General分析结果数据"""
@@ -1528,7 +1788,7 @@ class DisplacementProcessor(PostProcessor):
         - df: DataFrame/list, 结果数据
         - component: str, 绘制的位移分量
         - title: str, 图表标题
-        - kwargs: 其他绘图参数
+        - kwargs: 其他绘图参数，max_points为最大绘图点数(默认5000，None表示不降采样)，method为降采样方法("minmax"或"lttb")，path为geometry_index.chainage返回的路径(以里程为横坐标)
         """
         if isinstance(df, list):  # 施工阶段结果
             fig, axes = plt.subplots(len(df), 1, 
@@ -1540,20 +1800,24 @@ class DisplacementProcessor(PostProcessor):
             for i, stage_df in enumerate(df):
                 stage_name = stage_df["Stage"].iloc[0]
                 self._plot_single_result(stage_df, component, axes[i], 
-                                       title=f"施工阶段 {stage_name} - {component} 分布图")
+                                       title=f"施工阶段 {stage_name} - {component} 分布图", **kwargs)
                 
         else:  # General结果
             plt.figure(figsize=(10, 3), dpi=100)
             self._plot_single_result(df, component, plt.gca(), 
-                                   title=title or f"{component} 分布图")
+                                   title=title or f"{component} 分布图", **kwargs)
         
         plt.tight_layout()
         plt.show()
         
-    def _plot_single_result(self, df, component, ax, title):
-        """绘制单个位移结果图"""
-        ax.plot(df["Node"], df[component], marker="o", linestyle="-")
-        ax.set_xlabel("节点号", fontsize=10, family='SimSun')
+    def _plot_single_result(self, df, component, ax, title, max_points=PostProcessor.MAX_PLOT_POINTS,
+                            method="minmax", path=None):
+        """绘制单个位移结果图，指定path(geometry_index.chainage的返回值)时以里程为横坐标"""
+        if path is not None:
+            df = geometry_index.map_stations(df, path)
+        x = df["Station" if path is not None else "Node"].values
+        self._plot_curve(ax, x, df[component].values, max_points, method)
+        ax.set_xlabel("里程" if path is not None else "节点号", fontsize=10, family='SimSun')
         ax.set_ylabel(f"{component} (单位)", fontsize=10, family='SimSun')
         ax.set_title(title, fontsize=10, family='SimSun')
         ax.grid(True)
@@ -1,6 +1,15 @@
 """预处理功能模块"""
 
-from .api import midas_api
+import numpy as np
+import pandas as pd
+from .api import midas_api, response_failed
+from .units import unit_system
+from .geometry import geometry_index
+from .spatial import NodeSpatialIndex
+from .validation import model_validator, check_constraints
+from .load_cases import load_case_registry
+from .stages import build_stage_assign, stage_registry
+from .library import material_item, material_library
 
 class PreProcessor:
     """预处理功能类"""
@@ -28,6 +37,10 @@ class PreProcessor:
             }
         }
         response = midas_api.request("PUT", "/db/unit", data)
+        if response_failed(response):
+            print("单位设置失败")
+            return response
+        unit_system.set_model_unit(force_unit, dist_unit)
         print(f"定义位移单位为{dist_unit}，力单位为{force_unit}")
         return response
         
@@ -53,30 +66,13 @@ class PreProcessor:
             - THERMAL: float, 热膨胀系数
             - DEN: float, 容重
             - MASS: float, 质量
+            - unit: tuple, 输入参数的单位(力单位, 长度单位)，如("N", "mm")，
+              指定时ELAST、DEN、MASS自动换算为模型单位(set_units设置的单位)
         """
-        data = {
-            "Assign": {
-                str(material_id): {
-                    "TYPE": kwargs.get("TYPE", "USER"),
-                    "NAME": kwargs.get("NAME"),
-                    "HE_SPEC": kwargs.get("HE_SPEC", 0),
-                    "HE_COND": kwargs.get("HE_COND", 0),
-                    "PLMT": kwargs.get("PLMT", 0),
-                    "P_NAME": kwargs.get("P_NAME", ""),
-                    "bMASS_DENS": kwargs.get("bMASS_DENS", True),
-                    "DAMP_RAT": kwargs.get("DAMP_RAT", 0),
-                    "PARAM": [{
-                        "P_TYPE": kwargs.get("P_TYPE", 2),
-                        "ELAST": kwargs.get("ELAST"),
-                        "POISN": kwargs.get("POISN"),
-                        "THERMAL": kwargs.get("THERMAL"),
-                        "DEN": kwargs.get("DEN"),
-                        "MASS": kwargs.get("MASS")
-                    }]
-                }
-            }
-        }
+        data = {"Assign": {str(material_id): material_item(**kwargs)}}
         response = midas_api.request("PUT", "/db/matl", data)
+        model_validator.register("MATL", [material_id])
+        material_library.record(material_id, data["Assign"][str(material_id)])
         print(f'材料ID{material_id} {kwargs.get("NAME")}修改完成')
         return response
 
@@ -94,6 +90,22 @@ class NodeProcessor:
         print("节点查询失败")
         return None
 
+    def spatial_index(self, force=False):
+        """
+        获取节点空间索引(KD树)，用于按坐标查询节点
+        
+        参数:
+        - force: bool, 是否重新读取节点数据并重建索引
+        
+        返回:
+        - NodeSpatialIndex: 空间索引，支持nearest、within_radius、in_box、duplicates查询
+        
+        示例:
+        >>> index = NodeProcessor().spatial_index()
+        >>> node_ids, _ = index.nearest([[0, 0, 0], [60, 0, 0]])
+        """
+        return NodeSpatialIndex.from_model(force=force)
+
     def create(self, node_data):
         """
         创建新节点
@@ -103,12 +115,42 @@ class NodeProcessor:
         """
         print('开始创建节点')
         response = midas_api.request("POST", "/db/NODE", node_data)
+        geometry_index.invalidate()
+        model_validator.register("NODE", [int(key) for key in node_data.get("Assign", {})])
         if response:
             print("节点创建完成")
             return response
         print("节点创建失败")
         return None
 
+    def create_bulk(self, node_ids, coords, chunk_size=5000):
+        """
+        批量创建节点，数据分批提交
+        
+        参数:
+        - node_ids: array-like, 节点编号
+        - coords: array-like, 形状为(节点数, 3)的坐标数组
+        - chunk_size: int, 每批提交的节点数
+        
+        返回:
+        - list: 各批次的响应结果
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        if len(node_ids) != len(coords):
+            raise ValueError(f"节点编号数量({len(node_ids)})与坐标数量({len(coords)})不一致")
+        
+        assign = {
+            str(node_id): {"X": x, "Y": y, "Z": z}
+            for node_id, (x, y, z) in zip(node_ids.tolist(), coords.tolist())
+        }
+        print(f'开始批量创建节点，共{len(assign)}个')
+        responses = midas_api.request_chunked("POST", "/db/NODE", assign, chunk_size)
+        geometry_index.invalidate()
+        model_validator.register("NODE", node_ids)
+        print("节点批量创建完成")
+        return responses
+
     def update(self, node_data):
         """
         更新节点数据
@@ -118,6 +160,7 @@ class NodeProcessor:
         """
         print('开始更新节点数据')
         response = midas_api.request("PUT", "/db/NODE", node_data)
+        geometry_index.invalidate()
         if response:
             print("节点更新完成")
             return response
@@ -128,6 +171,8 @@ class NodeProcessor:
         """删除所有节点"""
         print('开始删除所有节点')
         response = midas_api.request("DELETE", "/db/NODE", {})
+        geometry_index.invalidate()
+        model_validator.unregister("NODE")
         if response:
             print("节点删除完成")
             return response
@@ -143,8 +188,33 @@ class NodeProcessor:
         """
         print(f'开始删除节点 {node_id}')
         response = midas_api.request("DELETE", f"/db/NODE/{node_id}")
+        geometry_index.invalidate()
+        model_validator.unregister("NODE", [int(node_id)])
         return response
 
+    def delete_many(self, node_ids):
+        """
+        批量删除节点，编号压缩为区间分批删除，失败时改为并发逐个删除
+        
+        参数:
+        - node_ids: array-like, 节点编号
+        
+        返回:
+        - ndarray: 删除失败的节点编号
+        
+        示例:
+        >>> failed = NodeProcessor().delete_many(range(1001, 21001))
+        """
+        print(f'开始批量删除节点，共{len(np.unique(node_ids))}个')
+        deleted, failed = midas_api.delete_many("/db/NODE", node_ids)
+        geometry_index.invalidate()
+        model_validator.unregister("NODE", deleted)
+        if len(failed):
+            print(f"节点批量删除完成，{len(failed)}个节点删除失败: {failed[:10].tolist()}")
+        else:
+            print("节点批量删除完成")
+        return failed
+
 
 class ElementProcessor:
     """单元处理基类"""
@@ -176,9 +246,61 @@ class ElementProcessor:
         - kwargs: 其他参数(用于Cable单元)
         """
         element_data = self._prepare_element_data(element_id, matl, sect, nodes, angle, **kwargs)
+        model_validator.check_element_payload(element_data)
         print(f'开始创建{self.element_type}单元，编号 {element_id}')
+        geometry_index.invalidate()
         return midas_api.request("PUT", "/db/ELEM", element_data)
 
+    def create_bulk(self, element_ids, nodes, matl, sect, angle=0, chunk_size=5000, **kwargs):
+        """
+        批量创建单元，数据分批提交
+        
+        参数:
+        - element_ids: array-like, 单元编号
+        - nodes: array-like, 形状为(单元数, 2)的节点编号数组
+        - matl: int/array-like, 材料ID(单值或每个单元一个值)
+        - sect: int/array-like, 截面ID(单值或每个单元一个值)
+        - angle: float/array-like, 单元旋转角度
+        - chunk_size: int, 每批提交的单元数
+        - kwargs: 索单元参数stype, cable_type, non_len, tens(单值或每个单元一个值)
+        
+        返回:
+        - list: 各批次的响应结果
+        """
+        element_ids = np.asarray(element_ids, dtype=np.int64)
+        n = len(element_ids)
+        nodes = np.asarray(nodes, dtype=np.int64).reshape(n, -1)
+        model_validator.check_elements(nodes, matl, sect)
+        nodes = nodes.tolist()
+        columns = {
+            "MATL": np.broadcast_to(matl, n).tolist(),
+            "SECT": np.broadcast_to(sect, n).tolist(),
+            "ANGLE": np.broadcast_to(angle, n).tolist()
+        }
+        
+        # 处理Cable单元的特殊参数
+        if self.element_type == "TENSTR":
+            cable_type = kwargs.get("cable_type", 3)
+            columns["STYPE"] = np.broadcast_to(kwargs.get("stype", 3), n).tolist()
+            columns["CABLE"] = [cable_type] * n
+            if cable_type == 3:
+                columns["NON_LEN"] = np.broadcast_to(kwargs.get("non_len", 1.0), n).tolist()
+            elif cable_type in [1, 2]:
+                columns["TENS"] = np.broadcast_to(kwargs.get("tens", 0), n).tolist()
+        
+        names = list(columns)
+        assign = {}
+        for k, (element_id, element_nodes) in enumerate(zip(element_ids.tolist(), nodes)):
+            item = {"TYPE": self.element_type, "NODE": element_nodes}
+            item.update(zip(names, (columns[name][k] for name in names)))
+            assign[str(element_id)] = item
+        
+        print(f'开始批量创建{self.element_type}单元，共{n}个')
+        geometry_index.invalidate()
+        responses = midas_api.request_chunked("PUT", "/db/ELEM", assign, chunk_size)
+        print(f"{self.element_type}单元批量创建完成")
+        return responses
+
     def update(self, element_id, matl, sect, nodes, angle=0, **kwargs):
         """更新单元数据，参数同create方法"""
         return self.create(element_id, matl, sect, nodes, angle, **kwargs)
@@ -186,13 +308,34 @@ class ElementProcessor:
     def delete_all(self):
         """删除所有单元"""
         print(f'开始删除所有{self.element_type}单元')
+        geometry_index.invalidate()
         return midas_api.request("DELETE", "/db/ELEM")
 
     def delete_single(self, element_id):
         """删除单个单元"""
         print(f'开始删除单个{self.element_type}单元，编号 {element_id}')
+        geometry_index.invalidate()
         return midas_api.request("DELETE", f"/db/ELEM/{element_id}")
 
+    def delete_many(self, element_ids):
+        """
+        批量删除单元，编号压缩为区间分批删除，失败时改为并发逐个删除
+        
+        参数:
+        - element_ids: array-like, 单元编号
+        
+        返回:
+        - ndarray: 删除失败的单元编号
+        """
+        print(f'开始批量删除{self.element_type}单元，共{len(np.unique(element_ids))}个')
+        _, failed = midas_api.delete_many("/db/ELEM", element_ids)
+        geometry_index.invalidate()
+        if len(failed):
+            print(f"单元批量删除完成，{len(failed)}个单元删除失败: {failed[:10].tolist()}")
+        else:
+            print("单元批量删除完成")
+        return failed
+
     def _prepare_element_data(self, element_id, matl, sect, nodes, angle, **kwargs):
         """准备单元数据"""
         data = {
@@ -243,13 +386,199 @@ class BoundaryConditionProcessor:
     """
     边界条件处理基类，提供边界条件的基本操作功能
     
+    边界条件以紧凑数组保存：节点编号数组、7位自由度掩码数组(UX为最高位，RW为最低位)
+    和边界组编号数组，应用时仅提交上次应用后修改过的数据
+    
     属性:
-    - cons_json: dict, 存储边界条件分配的数据结构
+    - cons_json: dict, 由数组生成的边界条件分配数据(只读)
     """
     
+    # 数据接口路径(子类覆盖)
+    ENDPOINT = "/db/cons"
+    
+    # 约束字符串各位(UX, UY, UZ, RX, RY, RZ, RW)对应的掩码权重
+    DOF_WEIGHTS = np.array([64, 32, 16, 8, 4, 2, 1], dtype=np.uint8)
+    
     def __init__(self):
         """初始化边界条件处理器"""
-        self.cons_json = {"Assign": {}}
+        self._node_ids = np.empty(0, dtype=np.int64)
+        self._masks = np.empty(0, dtype=np.uint8)
+        self._group_codes = np.empty(0, dtype=np.int32)
+        self._dirty = np.empty(0, dtype=bool)
+        self._groups = []
+
+    @property
+    def cons_json(self):
+        """由数组生成的边界条件分配数据"""
+        return self._assign_json(np.ones(len(self._node_ids), dtype=bool))
+
+    def _assign_json(self, selected):
+        """生成选中数据的{"Assign": {...}}格式数据"""
+        constraints = [format(mask, "07b") for mask in self._masks[selected].tolist()]
+        groups = [self._groups[code] for code in self._group_codes[selected].tolist()]
+        return {
+            "Assign": {
+                str(node_id): {
+                    "ITEMS": [
+                        {
+                            "ID": 1,  # ID固定为1
+                            "GROUP_NAME": group,
+                            "CONSTRAINT": constraint
+                        }
+                    ]
+                }
+                for node_id, constraint, group in zip(
+                    self._node_ids[selected].tolist(), constraints, groups
+                )
+            }
+        }
+
+    @classmethod
+    def to_masks(cls, constraints, count=None):
+        """
+        将约束转换为7位自由度掩码数组
+        
+        参数:
+        - constraints: 约束，支持:
+            - str或字符串数组: 如"1111000"
+            - int或整数数组: 掩码值0~127(UX为最高位)
+            - 形状为(N, 7)的0/1数组
+        - count: int, 约束为单个值时扩展的数量
+        
+        返回:
+        - ndarray: uint8掩码数组
+        """
+        values = np.asarray(constraints)
+        if values.dtype.kind in "US":
+            check_constraints(values.ravel())
+            chars = values.astype("<U8").ravel().view(np.uint32).reshape(-1, 8)[:, :7]
+            masks = ((chars == ord("1")) * cls.DOF_WEIGHTS).sum(axis=1)
+        elif values.ndim == 2 and values.shape[1] == 7:
+            masks = (values.astype(bool) * cls.DOF_WEIGHTS).sum(axis=1)
+        else:
+            masks = values.ravel().astype(np.int64)
+            if np.any((masks < 0) | (masks > 127)):
+                raise ValueError("约束掩码应为0~127之间的整数")
+        masks = masks.astype(np.uint8)
+        if count is not None and len(masks) == 1:
+            masks = np.repeat(masks, count)
+        return masks
+
+    @staticmethod
+    def _broadcast_rows(values, count, width=None, default=0):
+        """
+        将单个值、单行或逐行数据扩展为count行，返回列表(用于生成批量数据)
+        
+        参数:
+        - values: 数据，None时使用default
+        - count: int, 行数
+        - width: int, 每行的长度，None表示每行为单个值
+        - default: 默认值
+        """
+        values = np.asarray(default if values is None else values)
+        shape = (count,) if width is None else (count, width)
+        if values.ndim == len(shape) - 1 or values.ndim == 0:
+            values = np.broadcast_to(values, shape)
+        if values.shape != shape:
+            raise ValueError(f"数据形状{values.shape}与所需形状{shape}不一致")
+        return values.tolist()
+
+    def _group_code(self, group_name):
+        """获取边界组名称对应的编号"""
+        if group_name not in self._groups:
+            self._groups.append(group_name)
+        return self._groups.index(group_name)
+
+    def add_supports(self, node_ids, mask, group_name=""):
+        """
+        批量添加(或修改)节点边界条件，数据仅保存在本地，调用apply_constraints后提交
+        
+        参数:
+        - node_ids: array-like, 节点编号
+        - mask: 约束，单个值或每个节点一个值，支持约束字符串、0~127掩码或(N, 7)的0/1数组
+        - group_name: str, 边界组名称
+        
+        返回:
+        - int: 新增或发生变化的边界条件数量
+        
+        示例:
+        >>> bc = BoundaryConditionProcessor()
+        >>> bc.add_supports(np.arange(1001, 21001), "1110000", group_name="土弹簧")
+        >>> bc.apply_constraints()
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        masks = self.to_masks(mask, len(node_ids))
+        if len(masks) != len(node_ids):
+            raise ValueError(f"节点数量({len(node_ids)})与约束数量({len(masks)})不一致")
+        code = self._group_code(group_name)
+        
+        # 输入中重复的节点以最后一次为准
+        _, last = np.unique(node_ids[::-1], return_index=True)
+        keep = len(node_ids) - 1 - last
+        node_ids, masks = node_ids[keep], masks[keep]
+        
+        pos = np.searchsorted(self._node_ids, node_ids)
+        exists = pos < len(self._node_ids)
+        exists[exists] = self._node_ids[pos[exists]] == node_ids[exists]
+        
+        # 已有节点：仅约束或边界组变化时标记为待提交
+        p = pos[exists]
+        changed = (self._masks[p] != masks[exists]) | (self._group_codes[p] != code)
+        self._masks[p] = masks[exists]
+        self._group_codes[p] = code
+        self._dirty[p] |= changed
+        
+        # 新节点：合并后按节点编号排序
+        new = ~exists
+        if new.any():
+            node_ids_all = np.concatenate([self._node_ids, node_ids[new]])
+            order = np.argsort(node_ids_all, kind="stable")
+            self._node_ids = node_ids_all[order]
+            self._masks = np.concatenate([self._masks, masks[new]])[order]
+            self._group_codes = np.concatenate(
+                [self._group_codes, np.full(new.sum(), code, dtype=np.int32)]
+            )[order]
+            self._dirty = np.concatenate([self._dirty, np.ones(new.sum(), dtype=bool)])[order]
+        
+        return int(changed.sum() + new.sum())
+
+    def _remove(self, node_ids=None):
+        """从本地数组中移除边界条件，node_ids为None时全部移除"""
+        if node_ids is None:
+            keep = np.zeros(len(self._node_ids), dtype=bool)
+        else:
+            keep = ~np.isin(self._node_ids, np.asarray(node_ids, dtype=np.int64))
+        self._node_ids = self._node_ids[keep]
+        self._masks = self._masks[keep]
+        self._group_codes = self._group_codes[keep]
+        self._dirty = self._dirty[keep]
+
+    def __len__(self):
+        return len(self._node_ids)
+
+    def __contains__(self, node_id):
+        pos = np.searchsorted(self._node_ids, int(node_id))
+        return pos < len(self._node_ids) and self._node_ids[pos] == int(node_id)
+
+    @property
+    def pending(self):
+        """上次应用后新增或修改、尚未提交的节点编号"""
+        return self._node_ids[self._dirty]
+
+    def to_frame(self):
+        """
+        以DataFrame查看本地边界条件
+        
+        返回:
+        - DataFrame: 列为 Node, Constraint, Mask, Group, Pending
+        """
+        return pd.DataFrame({
+            "Node": self._node_ids,
+            "Constraint": [format(mask, "07b") for mask in self._masks.tolist()],
+            "Mask": self._masks,
+            "Group": [self._groups[code] for code in self._group_codes.tolist()],
+            "Pending": self._dirty
+        })
 
     def query(self):
         """
@@ -266,6 +595,21 @@ class BoundaryConditionProcessor:
         print("边界条件查询失败")
         return None
 
+    def load_from_model(self):
+        """
+        读取模型中已有的边界条件到本地数组(视为已提交)
+        
+        返回:
+        - int: 读取的边界条件数量
+        """
+        response = self.query()
+        table = (response or {}).get("CONS", {})
+        for group_name in {item["ITEMS"][0].get("GROUP_NAME", "") for item in table.values()}:
+            nodes = [key for key, item in table.items() if item["ITEMS"][0].get("GROUP_NAME", "") == group_name]
+            self.add_supports(nodes, [table[key]["ITEMS"][0]["CONSTRAINT"] for key in nodes], group_name)
+        self._dirty[:] = False
+        return len(table)
+
     def add_constraint(self, node_id, constraint_str, group_name=""):
         """
         为指定节点添加边界条件（POST操作）
@@ -281,18 +625,9 @@ class BoundaryConditionProcessor:
         返回:
         - bool: 操作是否成功
         """
+        check_constraints(constraint_str)
         try:
-            node_id = str(node_id)
-            # 创建固定格式的约束条件
-            self.cons_json["Assign"][node_id] = {
-                "ITEMS": [
-                    {
-                        "ID": 1,  # ID固定为1
-                        "GROUP_NAME": group_name,
-                        "CONSTRAINT": constraint_str
-                    }
-                ]
-            }
+            self.add_supports([int(node_id)], constraint_str, group_name)
             print(f"节点 {node_id} 添加边界条件成功: {constraint_str}")
             return True
         except Exception as e:
@@ -311,22 +646,13 @@ class BoundaryConditionProcessor:
         返回:
         - bool: 操作是否成功
         """
+        check_constraints(constraint_str)
         try:
-            node_id = str(node_id)
-            if node_id not in self.cons_json["Assign"]:
+            if node_id not in self:
                 print(f"节点 {node_id} 不存在边界条件，无法更新")
                 return False
                 
-            # 更新约束条件，保持ID为1
-            self.cons_json["Assign"][node_id] = {
-                "ITEMS": [
-                    {
-                        "ID": 1,
-                        "GROUP_NAME": group_name,
-                        "CONSTRAINT": constraint_str
-                    }
-                ]
-            }
+            self.add_supports([int(node_id)], constraint_str, group_name)
             print(f"节点 {node_id} 边界条件更新成功: {constraint_str}")
             return True
         except Exception as e:
@@ -344,7 +670,7 @@ class BoundaryConditionProcessor:
         response = midas_api.request("DELETE", "/db/cons", {})
         if response:
             print("边界条件删除完成")
-            self.cons_json["Assign"].clear()  # 清空本地存储
+            self._remove()  # 清空本地存储
             return response
         print("边界条件删除失败")
         return None
@@ -362,26 +688,57 @@ class BoundaryConditionProcessor:
         print(f'开始删除节点 {node_id} 的边界条件')
         response = midas_api.request("DELETE", f"/db/cons/{node_id}")
         if response:
-            if str(node_id) in self.cons_json["Assign"]:
-                del self.cons_json["Assign"][str(node_id)]  # 更新本地存储
+            self._remove([int(node_id)])  # 更新本地存储
             print(f"节点 {node_id} 的边界条件删除完成")
             return response
         print(f"节点 {node_id} 的边界条件删除失败")
         return None
 
-    def apply_constraints(self):
+    def delete_many(self, ids):
         """
-        将边界条件应用到模型
+        批量删除边界数据，编号压缩为区间分批删除，失败时改为并发逐个删除
+        
+        参数:
+        - ids: array-like, 节点编号(弹性连接为连接编号)
         
         返回:
-        - dict: API响应结果
+        - ndarray: 删除失败的编号
+        """
+        print(f'开始批量删除{self.ENDPOINT}数据，共{len(np.unique(ids))}个')
+        deleted, failed = midas_api.delete_many(self.ENDPOINT, ids)
+        if self.ENDPOINT == BoundaryConditionProcessor.ENDPOINT:
+            self._remove(deleted)  # 更新本地存储
+        if len(failed):
+            print(f"批量删除完成，{len(failed)}个编号删除失败: {failed[:10].tolist()}")
+        else:
+            print("批量删除完成")
+        return failed
+
+    def apply_constraints(self, chunk_size=5000, full=False):
         """
-        response = midas_api.request("PUT", "/db/cons", self.cons_json)
-        if response:
-            print("边界条件应用成功")
+        将边界条件应用到模型，仅分批提交上次应用后新增或修改的数据
+        
+        参数:
+        - chunk_size: int, 每批提交的边界条件数量
+        - full: bool, 是否提交全部边界条件
+        
+        返回:
+        - list: 各批次的API响应结果
+        """
+        selected = np.ones(len(self._node_ids), dtype=bool) if full else self._dirty.copy()
+        if not selected.any():
+            print("边界条件无变化，无需应用")
+            return []
+        
+        payload = self._assign_json(selected)
+        model_validator.check_constraint_payload(payload)
+        responses = midas_api.request_chunked("PUT", "/db/cons", payload["Assign"], chunk_size)
+        if all(response and "error" not in response for response in responses):
+            self._dirty[selected] = False
+            print(f"边界条件应用成功，共提交{selected.sum()}个节点")
         else:
             print("边界条件应用失败")
-        return response
+        return responses
 
 class SupportProcessor(BoundaryConditionProcessor):
     """
@@ -430,14 +787,17 @@ class SupportProcessor(BoundaryConditionProcessor):
         """
         return self.delete_constraint(node_id)
 
-    def apply_supports(self):
+    def apply_supports(self, chunk_size=5000):
         """
-        应用所有支撑设置
+        应用支撑设置(仅提交上次应用后新增或修改的支撑)
+        
+        参数:
+        - chunk_size: int, 每批提交的支撑数量
         
         返回:
-        - dict: API响应结果
+        - list: 各批次的API响应结果
         """
-        return self.apply_constraints()
+        return self.apply_constraints(chunk_size)
 
     def query_supports(self):
         """
@@ -474,6 +834,8 @@ class PointSpringProcessor(BoundaryConditionProcessor):
     提供弹性支撑的添加、修改、删除功能
     """
     
+    ENDPOINT = "/db/NSPR"
+    
     def query(self):
         """查询弹性支撑数据"""
         print('开始查询弹性支撑数据')
@@ -533,6 +895,100 @@ class PointSpringProcessor(BoundaryConditionProcessor):
         print(f"节点 {node_id} 添加{spring_type}弹性支撑失败")
         return False
 
+    def add_linear_springs(self, node_ids, stiffness, fixed=None, damping=False, Cr=None,
+                           group_name="", chunk_size=5000, method="POST"):
+        """
+        批量添加线性弹性支撑，数据分批提交
+        
+        参数:
+        - node_ids: array-like, 节点编号
+        - stiffness: array-like, 刚度，形状为(N, 6)或(6,)，依次为SDx, SDy, SDz, SRx, SRy, SRz
+        - fixed: array-like, 是否固定，形状为(N, 6)或(6,)的布尔数组，默认全部不固定
+        - damping: bool, 是否开启阻尼
+        - Cr: array-like, 阻尼系数，形状为(N, 6)或(6,)
+        - group_name: str, 边界组名称
+        - chunk_size: int, 每批提交的节点数
+        - method: str, "POST"为添加，"PUT"为修改已有的弹性支撑
+        
+        返回:
+        - list: 各批次的响应结果
+        
+        示例:
+        >>> k = np.column_stack([kx, ky, kz, np.zeros((n, 3))])   # 桩土弹簧刚度
+        >>> spring.add_linear_springs(pile_nodes, k, group_name="桩土弹簧")
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        n = len(node_ids)
+        model_validator.check_nodes(node_ids)
+        sdr = self._broadcast_rows(np.asarray(stiffness, dtype=np.float64), n, 6)
+        f_s = self._broadcast_rows(None if fixed is None else np.asarray(fixed, dtype=bool), n, 6, False)
+        cr = self._broadcast_rows(Cr, n, 6)
+        
+        assign = {
+            str(node_id): {
+                "ITEMS": [{
+                    "ID": 1,
+                    "TYPE": "LINEAR",
+                    "F_S": f_s[k],
+                    "SDR": sdr[k],
+                    "DAMPING": damping,
+                    "Cr": cr[k],
+                    "GROUP_NAME": group_name
+                }]
+            }
+            for k, node_id in enumerate(node_ids.tolist())
+        }
+        print(f'开始批量添加线性弹性支撑，共{n}个节点')
+        responses = midas_api.request_chunked(method, "/db/NSPR", assign, chunk_size)
+        print("线性弹性支撑批量添加完成")
+        return responses
+
+    def add_nonlinear_springs(self, node_ids, spring_type, direction, stiffness, group_name="",
+                              DV=None, chunk_size=5000):
+        """
+        批量添加非线性(仅受压/仅受拉)弹性支撑，数据分批提交
+        
+        参数:
+        - node_ids: array-like, 节点编号
+        - spring_type: str/array-like, 支撑类型("COMP"/"TENS")，单值或每个节点一个值
+        - direction: int/array-like, 作用方向(0~6)，单值或每个节点一个值
+        - stiffness: float/array-like, 刚度值，单值或每个节点一个值
+        - group_name: str, 边界组名称
+        - DV: array-like, 方向向量，形状为(N, 3)或(3,)
+        - chunk_size: int, 每批提交的节点数
+        
+        返回:
+        - list: 各批次的响应结果
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        n = len(node_ids)
+        model_validator.check_nodes(node_ids)
+        types = self._broadcast_rows(np.asarray(spring_type, dtype=str), n)
+        invalid = set(types) - {"COMP", "TENS"}
+        if invalid:
+            raise ValueError(f"不支持的弹性支撑类型: {', '.join(sorted(invalid))}")
+        directions = self._broadcast_rows(np.asarray(direction, dtype=np.int64), n)
+        stiff = self._broadcast_rows(np.asarray(stiffness, dtype=np.float64), n)
+        dv = self._broadcast_rows(DV, n, 3)
+        
+        assign = {
+            str(node_id): {
+                "ITEMS": [{
+                    "ID": 1,
+                    "TYPE": types[k],
+                    "GROUP_NAME": group_name,
+                    "DIR": directions[k],
+                    "DV": dv[k],
+                    "STIFF": stiff[k]
+                }]
+            }
+            for k, node_id in enumerate(node_ids.tolist())
+        }
+        print(f'开始批量添加非线性弹性支撑，共{n}个节点')
+        responses = midas_api.request_chunked("POST", "/db/NSPR", assign, chunk_size)
+        print("非线性弹性支撑批量添加完成")
+        return responses
+
     def update(self, node_id, spring_data):
         """
         更新弹性支撑数据
@@ -618,6 +1074,8 @@ class RigidLinkProcessor(BoundaryConditionProcessor):
     - BoundaryConditionProcessor: 边界条件处理基类
     """
     
+    ENDPOINT = "/db/RIGD"
+    
     def query(self):
         """
         查询刚性连接数据（GET操作）
@@ -662,6 +1120,50 @@ class RigidLinkProcessor(BoundaryConditionProcessor):
             print(f"添加刚性连接失败: {str(e)}")
             return False
 
+    def add_rigid_links(self, master_nodes, slave_nodes, dof="111111", group_name="", chunk_size=5000):
+        """
+        批量添加刚性连接，同一主节点的多个从节点合并为一条数据，数据分批提交
+        
+        参数:
+        - master_nodes: array-like, 主节点编号，形状为(N,)
+        - slave_nodes: 从节点编号，形状为(N,)(每个主节点一个从节点)、(N, k)的数组或长度为N的列表的列表
+        - dof: str/array-like, 自由度组合字符串(如"111111")，单值或每行一个值
+        - group_name: str, 边界组名称
+        - chunk_size: int, 每批提交的主节点数
+        
+        返回:
+        - list: 各批次的响应结果
+        """
+        master_nodes = np.asarray(master_nodes, dtype=np.int64).ravel()
+        n = len(master_nodes)
+        if isinstance(slave_nodes, np.ndarray):
+            slaves = slave_nodes.astype(np.int64).reshape(n, -1).tolist()
+        else:
+            # 列表中可以是单个从节点或从节点列表(各主节点的从节点数量可以不同)
+            slaves = [np.atleast_1d(row).astype(np.int64).tolist() for row in slave_nodes]
+        if len(slaves) != n:
+            raise ValueError(f"主节点数量({n})与从节点数量({len(slaves)})不一致")
+        dofs = self._broadcast_rows(np.asarray(dof, dtype=str), n)
+        
+        df = pd.DataFrame({"MASTER": master_nodes, "DOF": dofs, "S_NODE": slaves}).explode("S_NODE")
+        model_validator.check_nodes(np.concatenate([master_nodes, df["S_NODE"].to_numpy(dtype=np.int64)]))
+        
+        # 同一主节点、同一自由度组合的从节点合并，不同自由度组合作为不同ITEMS
+        grouped = df.groupby(["MASTER", "DOF"], sort=True)["S_NODE"].agg(lambda s: sorted(set(s)))
+        assign = {}
+        for (master, item_dof), s_node in grouped.items():
+            items = assign.setdefault(str(master), {"ITEMS": []})["ITEMS"]
+            items.append({
+                "ID": len(items) + 1,
+                "GROUP_NAME": group_name,
+                "DOF": item_dof,
+                "S_NODE": [int(node) for node in s_node]
+            })
+        print(f'开始批量添加刚性连接，共{len(assign)}个主节点')
+        responses = midas_api.request_chunked("POST", "/db/RIGD", assign, chunk_size)
+        print("刚性连接批量添加完成")
+        return responses
+
     def update_rigid_link(self, node_id, dof, s_node, group_name=""):
         """
         更新节点的刚性连接（PUT操作）
@@ -762,6 +1264,8 @@ class ElasticLinkProcessor(BoundaryConditionProcessor):
     - 仅受压类型 (Compression-only Type)
     """
 
+    ENDPOINT = "/db/ELNK"
+
     def query(self):
         """
         查询所有弹性连接数据（GET操作）
@@ -868,6 +1372,71 @@ class ElasticLinkProcessor(BoundaryConditionProcessor):
             print(f"添加{link_type}连接失败: {str(e)}")
             return False
 
+    def add_links(self, link_ids, node_pairs, link_type="GEN", angle=0, sdr=None, rs=None,
+                  bshear=True, dr=None, bngr_name="", chunk_size=5000):
+        """
+        批量添加弹性连接，数据分批提交
+        
+        参数:
+        - link_ids: array-like, 弹性连接编号
+        - node_pairs: array-like, 形状为(N, 2)的节点对数组
+        - link_type: str/array-like, 连接类型("GEN"/"RIGID"/"TENS"/"COMP")，单值或每个连接一个值
+        - angle: float/array-like, 局部坐标系角度
+        - sdr: array-like, 刚度，形状为(N, 6)或(6,)，对GEN、TENS、COMP类型有效
+        - rs: array-like, 约束释放状态，形状为(N, 6)或(6,)的布尔数组，对GEN类型有效
+        - bshear: bool, 是否考虑剪切变形，对GEN类型有效
+        - dr: array-like, 剪切弹簧位置比例，形状为(N, 2)或(2,)，对GEN类型有效
+        - bngr_name: str, 连接组名称
+        - chunk_size: int, 每批提交的连接数
+        
+        返回:
+        - list: 各批次的响应结果
+        
+        示例:
+        >>> k = np.tile([1e6, 1e4, 1e4, 0, 0, 0], (n, 1))      # 支座刚度
+        >>> link.add_links(np.arange(1, n + 1), np.column_stack([pier_top, girder_bottom]), sdr=k)
+        """
+        link_ids = np.asarray(link_ids, dtype=np.int64).ravel()
+        n = len(link_ids)
+        node_pairs = np.asarray(node_pairs, dtype=np.int64).reshape(n, 2)
+        model_validator.check_nodes(node_pairs)
+        
+        types = self._broadcast_rows(np.asarray(link_type, dtype=str), n)
+        invalid = set(types) - {"GEN", "RIGID", "TENS", "COMP"}
+        if invalid:
+            raise ValueError(f"不支持的连接类型: {', '.join(sorted(invalid))}")
+        nodes = node_pairs.tolist()
+        angles = self._broadcast_rows(np.asarray(angle, dtype=np.float64), n)
+        sdrs = self._broadcast_rows(None if sdr is None else np.asarray(sdr, dtype=np.float64), n, 6)
+        rss = self._broadcast_rows(None if rs is None else np.asarray(rs, dtype=bool), n, 6, False)
+        drs = self._broadcast_rows(None if dr is None else np.asarray(dr, dtype=np.float64), n, 2, 0.5)
+        
+        assign = {}
+        for k, link_id in enumerate(link_ids.tolist()):
+            item = {"NODE": nodes[k], "LINK": types[k], "ANGLE": angles[k]}
+            if types[k] == "GEN":
+                item.update({"R_S": rss[k], "SDR": sdrs[k], "bSHEAR": bshear, "DR": drs[k]})
+            elif types[k] != "RIGID":
+                item["SDR"] = sdrs[k]
+            item["BNGR_NAME"] = bngr_name
+            assign[str(link_id)] = item
+        print(f'开始批量添加弹性连接，共{n}个')
+        responses = midas_api.request_chunked("POST", "/db/ELNK", assign, chunk_size)
+        print("弹性连接批量添加完成")
+        return responses
+
+    def add_general_links(self, link_ids, node_pairs, sdr, **kwargs):
+        """
+        批量添加一般弹性连接，参数同add_links(link_type固定为"GEN")
+        """
+        return self.add_links(link_ids, node_pairs, "GEN", sdr=sdr, **kwargs)
+
+    def add_nonlinear_links(self, link_ids, node_pairs, link_type, sdr, **kwargs):
+        """
+        批量添加仅受拉/仅受压连接，参数同add_links(link_type为"TENS"或"COMP")
+        """
+        return self.add_links(link_ids, node_pairs, link_type, sdr=sdr, **kwargs)
+
     def update_link(self, link_id, data):
         """
         更新弹性连接（PUT操作）
@@ -995,6 +1564,7 @@ class LoadProcessor:
         
     def add(self, elem_id, data):
         """添加荷载"""
+        model_validator.check_load_payload(data)
         print(f'开始添加{self.load_type}荷载到单元 {elem_id}')
         response = midas_api.request("POST", self.base_url, data)
         if response:
@@ -1005,6 +1575,7 @@ class LoadProcessor:
         
     def update(self, elem_id, data):
         """更新荷载"""
+        model_validator.check_load_payload(data)
         print(f'开始更新单元 {elem_id} 的{self.load_type}荷载')
         response = midas_api.request("PUT", self.base_url, data)
         if response:
@@ -1033,6 +1604,24 @@ class LoadProcessor:
         print(f"删除所有{self.load_type}荷载失败")
         return None
 
+    def delete_many(self, elem_ids):
+        """
+        批量删除荷载，编号压缩为区间分批删除，失败时改为并发逐个删除
+        
+        参数:
+        - elem_ids: array-like, 荷载数据编号(单元、节点或工况编号)
+        
+        返回:
+        - ndarray: 删除失败的编号
+        """
+        print(f'开始批量删除{self.load_type}荷载，共{len(np.unique(elem_ids))}个')
+        _, failed = midas_api.delete_many(self.base_url, elem_ids)
+        if len(failed):
+            print(f"{self.load_type}荷载批量删除完成，{len(failed)}个删除失败: {failed[:10].tolist()}")
+        else:
+            print(f"{self.load_type}荷载批量删除完成")
+        return failed
+
 
 class PrestressLoadsProcessor(LoadProcessor):
     """预应力荷载处理类"""
@@ -1305,11 +1894,52 @@ class PrestressLoadsProcessor(LoadProcessor):
         
         return self.update(elem_id, tension_data)
 
+    def add_initial_tensions(self, elem_ids, load_cases, tensions, group_name="", item_id=1, chunk_size=5000):
+        """
+        批量添加初拉力，数据分批提交
+
+        参数:
+        - elem_ids: array-like, 单元编号
+        - load_cases: str/array-like, 荷载工况名称，可为单个名称或与单元一一对应
+        - tensions: float/array-like, 初拉力大小
+        - group_name: str, 荷载组名称
+        - item_id: int, 荷载条目编号，单元已有初拉力时使用不同的编号
+        - chunk_size: int, 每批提交的单元数
+
+        返回:
+        - list: 各批次的响应结果
+        """
+        elem_ids = np.atleast_1d(elem_ids).astype(np.int64)
+        load_cases = np.broadcast_to(np.asarray(load_cases, dtype=object), elem_ids.shape)
+        tensions = np.broadcast_to(np.asarray(tensions, dtype=np.float64), elem_ids.shape)
+        assign = {
+            str(elem_id): {
+                "ITEMS": [{
+                    "ID": item_id,
+                    "LCNAME": load_case,
+                    "GROUP_NAME": group_name,
+                    "TENSION": tension
+                }]
+            }
+            for elem_id, load_case, tension in zip(elem_ids.tolist(), load_cases.tolist(), tensions.tolist())
+        }
+        model_validator.check_load_payload({"Assign": assign})
+        print(f'开始批量添加初拉力，共{len(assign)}个单元')
+        responses = midas_api.request_chunked("POST", self.base_url, assign, chunk_size)
+        failed = any(response_failed(response) for response in responses)
+        print("初拉力批量添加失败" if failed else "初拉力批量添加完成")
+        return responses
+
 class StaticLoadsProcessor(LoadProcessor):
-    """静力荷载处理类"""
+    """静力荷载处理类
+    
+    荷载工况通过全局工况索引(registry)查找名称和编号，工况数据只读取一次，
+    之后由本类的添加、修改、删除操作同步更新
+    """
     
     def __init__(self):
         super().__init__("STATIC", "/db/STLD")
+        self.registry = load_case_registry
         self.load_case_types = {
             'CS': '施工阶段荷载',
             'L': '活荷载',
@@ -1327,6 +1957,7 @@ class StaticLoadsProcessor(LoadProcessor):
         print('开始查询静力荷载工况')
         response = midas_api.request("GET", self.base_url, {})
         if response:
+            self.registry.load(response=response)
             print("静力荷载工况查询完成")
             return response
         print("静力荷载工况查询失败")
@@ -1337,7 +1968,7 @@ class StaticLoadsProcessor(LoadProcessor):
         添加静力荷载工况
         
         参数:
-        - case_id: int/str, 工况编号
+        - case_id: int/str, 工况编号，None时自动分配未使用的编号
         - name: str, 工况名称
         - case_type: str, 工况类型（'CS','L','PS','W','CR','SH','T','TPG','D'）
         - description: str, 工况描述（可选）
@@ -1347,6 +1978,8 @@ class StaticLoadsProcessor(LoadProcessor):
         """
         if case_type not in self.load_case_types:
             raise ValueError(f"不支持的工况类型: {case_type}。支持的类型: {', '.join(self.load_case_types.keys())}")
+        if case_id is None:
+            case_id = int(self.registry.allocate(1)[0])
             
         case_data = {
             "Assign": {
@@ -1359,7 +1992,90 @@ class StaticLoadsProcessor(LoadProcessor):
         }
         
         print(f'开始添加静力荷载工况 {name}')
-        return self.add(case_id, case_data)
+        response = self.add(case_id, case_data)
+        if not response_failed(response):
+            self.registry.record(case_id, name, case_type, case_data["Assign"][str(case_id)]["DESC"])
+            model_validator.register("STLD", [name])
+        return response
+
+    def add_load_cases(self, cases, chunk_size=5000):
+        """
+        由表格批量添加静力荷载工况，名称已存在的工况不重复添加，数据分批提交
+        
+        参数:
+        - cases: DataFrame/list, 工况表，列(键)为NAME、TYPE，可含DESC和ID(缺省时自动分配编号)
+        - chunk_size: int, 每批提交的工况数
+        
+        返回:
+        - dict: {工况名称: 工况编号}，包含已存在的工况
+        
+        示例:
+        >>> static.add_load_cases(pd.DataFrame({"NAME": ["一期恒载", "二期恒载"], "TYPE": "D"}))
+        """
+        df = pd.DataFrame(cases).drop_duplicates("NAME").reset_index(drop=True)
+        if "DESC" not in df:
+            df["DESC"] = ""
+        invalid = set(df["TYPE"]) - set(self.load_case_types)
+        if invalid:
+            raise ValueError(f"不支持的工况类型: {', '.join(sorted(invalid))}。支持的类型: {', '.join(self.load_case_types.keys())}")
+        
+        result = {name: self.registry.id_of(name) for name in df["NAME"]}
+        new = df[[result[name] is None for name in df["NAME"]]].copy()
+        if new.empty:
+            print("荷载工况均已存在，无需添加")
+            return result
+        
+        ids = new["ID"] if "ID" in new else pd.Series(np.nan, index=new.index)
+        missing = ids.isna().to_numpy()
+        ids = ids.to_numpy(dtype=np.float64, copy=True)
+        # 自动分配的编号避开表中指定的编号
+        free = self.registry.allocate(len(ids))
+        ids[missing] = free[~np.isin(free, ids[~missing])][:missing.sum()]
+        new["ID"] = ids.astype(np.int64)
+        new["DESC"] = [
+            desc or self.load_case_types[case_type]
+            for desc, case_type in zip(new["DESC"].fillna(""), new["TYPE"])
+        ]
+        
+        assign = {
+            str(case_id): {"NAME": name, "TYPE": case_type, "DESC": desc}
+            for case_id, name, case_type, desc in new[["ID", "NAME", "TYPE", "DESC"]].itertuples(index=False)
+        }
+        print(f'开始批量添加静力荷载工况，共{len(assign)}个')
+        responses = midas_api.request_chunked("POST", self.base_url, assign, chunk_size)
+        # 只登记提交成功的批次
+        succeeded = np.zeros(len(new), dtype=bool)
+        for k, response in enumerate(responses):
+            succeeded[k * chunk_size:(k + 1) * chunk_size] = not response_failed(response)
+        added = new[succeeded]
+        if not added.empty:
+            self.registry.record(added["ID"], added["NAME"], added["TYPE"], added["DESC"])
+            model_validator.register("STLD", added["NAME"].tolist())
+            result.update(zip(added["NAME"], added["ID"].tolist()))
+        if succeeded.all():
+            print("静力荷载工况批量添加完成")
+        else:
+            print(f"静力荷载工况批量添加失败，{(~succeeded).sum()}个工况未添加")
+        return result
+
+    def load_case_id(self, name, case_type="D", description=""):
+        """
+        获取工况编号，工况不存在时自动添加
+        
+        参数:
+        - name: str, 工况名称
+        - case_type: str, 工况不存在时添加的工况类型
+        - description: str, 工况描述
+        
+        返回:
+        - int: 工况编号
+        """
+        case_id = self.registry.id_of(name)
+        if case_id is None:
+            case_id = int(self.registry.allocate(1)[0])
+            if response_failed(self.add_load_case(case_id, name, case_type, description)):
+                raise ValueError(f"荷载工况 {name} 添加失败")
+        return case_id
         
     def update_load_case(self, case_id, **kwargs):
         """
@@ -1383,7 +2099,7 @@ class StaticLoadsProcessor(LoadProcessor):
                 str(case_id): {
                     "NAME": kwargs.get('name'),
                     "TYPE": kwargs.get('case_type'),
-                    "DESC": kwargs.get('description', '')
+                    "DESC": kwargs.get('description')
                 }
             }
         }
@@ -1394,8 +2110,19 @@ class StaticLoadsProcessor(LoadProcessor):
             if v is not None
         }
         
+        # 重命名时需要原名称，以便从校验数据中移除
+        old_name = self.registry.name_of(case_id) if kwargs.get('name') is not None else None
+        
         print(f'开始更新静力荷载工况 {case_id}')
-        return self.update(case_id, case_data)
+        response = self.update(case_id, case_data)
+        if not response_failed(response):
+            # 未指定的字段保留原值
+            self.registry.record(case_id, kwargs.get('name'), kwargs.get('case_type'), kwargs.get('description'))
+            if kwargs.get('name') is not None:
+                if old_name is not None and old_name != kwargs['name']:
+                    model_validator.unregister("STLD", [old_name])
+                model_validator.register("STLD", [kwargs['name']])
+        return response
         
     def delete_load_case(self, case_id):
         """
@@ -1408,7 +2135,13 @@ class StaticLoadsProcessor(LoadProcessor):
         - dict: API响应结果
         """
         print(f'开始删除静力荷载工况 {case_id}')
-        return self.delete(case_id)
+        response = self.delete(case_id)
+        if not response_failed(response) and self.registry.loaded:
+            name = self.registry.name_of(case_id)
+            self.registry.remove(case_id)
+            if name is not None:
+                model_validator.unregister("STLD", [name])
+        return response
         
     def delete_all_load_cases(self):
         """
@@ -1418,7 +2151,11 @@ class StaticLoadsProcessor(LoadProcessor):
         - dict: API响应结果
         """
         print('开始删除所有静力荷载工况')
-        return self.delete_all()
+        response = self.delete_all()
+        if not response_failed(response):
+            model_validator.unregister("STLD")
+            self.registry.remove()
+        return response
         
     def query_self_weight(self):
         """
@@ -1436,13 +2173,14 @@ class StaticLoadsProcessor(LoadProcessor):
         
         参数:
         - case_id: int/str, 自重荷载编号
-        - load_case: str, 荷载工况名称，默认为"自重"
+        - load_case: str/int, 荷载工况名称或工况编号，默认为"自重"
         - group_name: str, 荷载组名称，默认为空字符串
         - fv: list, 自重方向向量[x, y, z]，默认为[0, 0, -1]
         
         返回:
         - dict: API响应结果
         """
+        load_case = self.registry.resolve(load_case)
         if fv is None:
             fv = [0, 0, -1]
             
@@ -1534,7 +2272,7 @@ class StaticLoadsProcessor(LoadProcessor):
         
         参数:
         - node_id: int/str, 节点编号
-        - load_case: str, 荷载工况名称
+        - load_case: str/int, 荷载工况名称或工况编号
         - group_name: str, 荷载组名称，默认为空字符串
         - fx: float, X方向集中力，默认为0
         - fy: float, Y方向集中力，默认为0
@@ -1546,6 +2284,7 @@ class StaticLoadsProcessor(LoadProcessor):
         返回:
         - dict: API响应结果
         """
+        load_case = self.registry.resolve(load_case)
         load_data = {
             "Assign": {
                 str(node_id): {
@@ -2010,10 +2749,15 @@ class TemperatureLoadsProcessor(LoadProcessor):
         return self.delete_all()
 
 class ConstructionStageProcessor(LoadProcessor):
-    """施工阶段处理类"""
+    """施工阶段处理类
+    
+    阶段列表缓存在全局施工阶段缓存(registry)中，定义阶段后同步更新，
+    结果提取时可直接由阶段名称得到STAGE_STEP名称
+    """
 
     def __init__(self):
         super().__init__("CONSTRUCTION_STAGE", "/db/STAG")
+        self.registry = stage_registry
 
     def query_construction_stages(self):
         """
@@ -2025,7 +2769,55 @@ class ConstructionStageProcessor(LoadProcessor):
         print('开始查询施工阶段')
         response = midas_api.request("GET", self.base_url, {})
         if response:
+            self.registry.load(response=response)
             print("施工阶段查询完成")
             return response
         print("施工阶段查询失败")
         return None
+
+    def define_stages(self, stages, actions=None, chunk_size=100, replace=False):
+        """
+        由施工阶段表批量定义施工阶段，数据分批提交
+        
+        参数:
+        - stages: DataFrame/list, 阶段表，列为NAME、DURATION，可含ID、SAVE_RESULT、SAVE_STEP、ADD_STEP
+        - actions: DataFrame/list, 激活/钝化表，列为STAGE、ACTION("ACT"/"DACT")、
+          KIND("ELEM"/"BNGR"/"LOAD")、GROUP，可含VALUE(详见stages.build_stage_assign)
+        - chunk_size: int, 每批提交的阶段数
+        - replace: bool, 是否先删除模型中已有的全部施工阶段
+        
+        返回:
+        - list: 各批次的响应结果
+        
+        示例:
+        >>> segments = [f"{k}#块" for k in range(1, 21)]
+        >>> stages = pd.DataFrame({"NAME": [f"CS{k}" for k in range(1, 21)], "DURATION": 7})
+        >>> actions = pd.DataFrame({"STAGE": stages["NAME"], "ACTION": "ACT", "KIND": "ELEM", "GROUP": segments})
+        >>> ConstructionStageProcessor().define_stages(stages, actions)
+        """
+        if replace and response_failed(self.delete_all()):
+            raise RuntimeError("已有施工阶段删除失败")
+        start_id = 1 if replace else self.registry.next_id()
+        assign = build_stage_assign(stages, actions, start_id)
+        print(f'开始批量定义施工阶段，共{len(assign)}个')
+        responses = midas_api.request_chunked("POST", self.base_url, assign, chunk_size)
+        # 只登记提交成功的批次
+        keys = list(assign)
+        accepted = {}
+        for k, response in enumerate(responses):
+            if not response_failed(response):
+                accepted.update((key, assign[key]) for key in keys[k * chunk_size:(k + 1) * chunk_size])
+        if accepted:
+            self.registry.record(accepted)
+        if len(accepted) == len(assign):
+            print("施工阶段批量定义完成")
+        else:
+            print(f"施工阶段批量定义失败，{len(assign) - len(accepted)}个阶段未定义")
+        return responses
+
+    def delete_all(self):
+        """删除所有施工阶段"""
+        response = super().delete_all()
+        if not response_failed(response):
+            self.registry.remove()
+        return response
@@ -0,0 +1,260 @@
+"""施工阶段结果张量模块，提供列式的施工阶段结果容器，包括：
+- 阶段 × 步骤 × 单元 × 部件 × 分量 的稠密NumPy数组
+- 按阶段、按单元的O(1)切片
+- 单元时程视图
+- 基于内存映射的磁盘存储
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+
+
+class StageResultTensor:
+    """
+    施工阶段结果张量
+
+    属性:
+    - values: ndarray/memmap, 形状为(阶段, 步骤, 单元, 部件, 分量)的结果数组，缺失值为NaN
+    - stages: list, 施工阶段标签
+    - steps: list, 步骤标签
+    - elems: ndarray, 单元(或节点)编号，升序排列
+    - parts: list, 部件标签(如PartI, PartJ)，无部件列时为[""]
+    - components: list, 结果分量名称
+    - key: str, 单元/节点编号列名("Elem"或"Node")
+    """
+
+    VALUES_FILE = "values.npy"
+    LABELS_FILE = "labels.json"
+
+    def __init__(self, values, stages, steps, elems, parts, components, key="Elem"):
+        self.values = values
+        self.stages = list(stages)
+        self.steps = list(steps)
+        self.elems = np.asarray(elems)
+        self.parts = list(parts)
+        self.components = list(components)
+        self.key = key
+
+        self._stage_index = {s: i for i, s in enumerate(self.stages)}
+        self._step_index = {s: i for i, s in enumerate(self.steps)}
+        self._elem_index = {int(e): i for i, e in enumerate(self.elems)}
+        self._part_index = {p: i for i, p in enumerate(self.parts)}
+        self._comp_index = {c: i for i, c in enumerate(self.components)}
+
+    @classmethod
+    def from_dataframe(cls, df, components=None, path=None, dtype=np.float64):
+        """
+        由施工阶段结果DataFrame构建结果张量
+
+        参数:
+        - df: DataFrame, process_general_results处理后的施工阶段结果(含Stage列)，
+          每个(阶段, 步骤, 单元, 部件)只能有一行，多个荷载工况须分别构建
+        - components: list, 需要保存的分量，默认为全部数值列
+        - path: str, 存储目录，指定时数组直接写入磁盘内存映射文件
+        - dtype: numpy数据类型，默认为float64
+
+        返回:
+        - StageResultTensor: 结果张量
+        """
+        key = "Elem" if "Elem" in df.columns else "Node"
+        if "Stage" not in df.columns:
+            raise ValueError("结果数据中缺少Stage列，无法构建施工阶段结果张量")
+
+        # 索结果表中存在重复列名，仅保留第一次出现的列
+        df = df.loc[:, ~df.columns.duplicated()]
+
+        axis_columns = [key, "Load", "Stage", "Step", "Part", "NodeI", "NodeJ"]
+        if components is None:
+            components = [
+                col for col in df.columns
+                if col not in axis_columns and pd.api.types.is_numeric_dtype(df[col])
+            ]
+
+        stage_codes, stages = pd.factorize(df["Stage"], sort=False)
+        if "Step" in df.columns:
+            # 保持MIDAS结果中的步骤顺序
+            step_codes, steps = pd.factorize(df["Step"], sort=False)
+        else:
+            step_codes, steps = np.zeros(len(df), dtype=np.intp), [""]
+        elem_codes, elems = pd.factorize(df[key].astype(np.int64), sort=True)
+        if "Part" in df.columns:
+            part_codes, parts = pd.factorize(df["Part"], sort=False)
+        else:
+            part_codes, parts = np.zeros(len(df), dtype=np.intp), [""]
+
+        shape = (len(stages), len(steps), len(elems), len(parts), len(components))
+        codes = (stage_codes, step_codes, elem_codes, part_codes)
+        if any((np.asarray(c) < 0).any() for c in codes):
+            raise ValueError("结果数据的Stage、Step或Part列存在空值，无法构建施工阶段结果张量")
+        flat = np.ravel_multi_index(codes, shape[:4])
+        if len(np.unique(flat)) < len(flat):
+            loads = df["Load"].nunique() if "Load" in df.columns else 1
+            hint = f"(结果含{loads}个荷载工况，请按工况分别构建)" if loads > 1 else ""
+            raise ValueError(f"结果数据中存在重复的(阶段, 步骤, {key}, 部件)行{hint}")
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            values = np.lib.format.open_memmap(
+                os.path.join(path, cls.VALUES_FILE), mode="w+", dtype=dtype, shape=shape
+            )
+            values[...] = np.nan
+        else:
+            values = np.full(shape, np.nan, dtype=dtype)
+
+        values[stage_codes, step_codes, elem_codes, part_codes, :] = (
+            df[list(components)].to_numpy(dtype=dtype)
+        )
+
+        tensor = cls(values, stages, steps, elems, parts, components, key=key)
+        if path is not None:
+            values.flush()
+            tensor._write_labels(path)
+        return tensor
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        从磁盘加载结果张量
+
+        参数:
+        - path: str, save或from_dataframe(path=...)写入的目录
+        - mmap_mode: str/None, 内存映射模式("r", "r+", "c")，None表示完整读入内存
+
+        返回:
+        - StageResultTensor: 结果张量
+        """
+        values = np.load(os.path.join(path, cls.VALUES_FILE), mmap_mode=mmap_mode)
+        with open(os.path.join(path, cls.LABELS_FILE), "r", encoding="utf-8") as f:
+            labels = json.load(f)
+        return cls(
+            values, labels["stages"], labels["steps"], labels["elems"],
+            labels["parts"], labels["components"], key=labels["key"]
+        )
+
+    def save(self, path):
+        """
+        将结果张量保存到磁盘目录(可通过load以内存映射方式读取)
+
+        参数:
+        - path: str, 存储目录
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, self.VALUES_FILE), np.asarray(self.values))
+        self._write_labels(path)
+
+    def _write_labels(self, path):
+        """写入各维度标签"""
+        labels = {
+            "key": self.key,
+            "stages": [str(s) for s in self.stages],
+            "steps": [str(s) for s in self.steps],
+            "elems": [int(e) for e in self.elems],
+            "parts": [str(p) for p in self.parts],
+            "components": [str(c) for c in self.components]
+        }
+        with open(os.path.join(path, self.LABELS_FILE), "w", encoding="utf-8") as f:
+            json.dump(labels, f, ensure_ascii=False)
+
+    @property
+    def shape(self):
+        """结果数组形状(阶段, 步骤, 单元, 部件, 分量)"""
+        return self.values.shape
+
+    def stage(self, stage):
+        """
+        获取单个施工阶段的结果视图
+
+        参数:
+        - stage: str, 施工阶段标签
+
+        返回:
+        - ndarray: 形状为(步骤, 单元, 部件, 分量)的视图
+        """
+        return self.values[self._stage_index[stage]]
+
+    def element(self, elem_id):
+        """
+        获取单个单元(节点)在全部阶段的结果视图
+
+        参数:
+        - elem_id: int, 单元(节点)编号
+
+        返回:
+        - ndarray: 形状为(阶段, 步骤, 部件, 分量)的视图
+        """
+        return self.values[:, :, self._elem_index[int(elem_id)]]
+
+    def component(self, component):
+        """
+        获取单个分量的结果视图
+
+        参数:
+        - component: str, 分量名称
+
+        返回:
+        - ndarray: 形状为(阶段, 步骤, 单元, 部件)的视图
+        """
+        return self.values[..., self._comp_index[component]]
+
+    def history(self, elem_id, component, part=None, step=None):
+        """
+        获取单元某一分量随施工阶段变化的时程
+
+        参数:
+        - elem_id: int, 单元(节点)编号
+        - component: str, 分量名称
+        - part: str, 部件标签，默认为第一个部件
+        - step: str, 步骤标签，默认取每个阶段的最后一个有效步骤
+
+        返回:
+        - Series: 以施工阶段为索引的时程数据
+        """
+        p = self._part_index[part] if part is not None else 0
+        data = self.values[:, :, self._elem_index[int(elem_id)], p, self._comp_index[component]]
+
+        if step is not None:
+            series = data[:, self._step_index[step]]
+        else:
+            valid = ~np.isnan(data)
+            last = data.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+            series = data[np.arange(data.shape[0]), last]
+
+        return pd.Series(series, index=pd.Index(self.stages, name="Stage"), name=component)
+
+    def to_frame(self, stage=None):
+        """
+        将结果张量(或单个阶段)转换为长表DataFrame
+
+        参数:
+        - stage: str, 施工阶段标签，None表示全部阶段
+
+        返回:
+        - DataFrame: 列为 Stage, Step, Elem/Node, Part, 各分量，已去除缺失行
+        """
+        stages = self.stages if stage is None else [stage]
+        values = self.values if stage is None else self.values[[self._stage_index[stage]]]
+
+        index = pd.MultiIndex.from_product(
+            [stages, self.steps, self.elems, self.parts],
+            names=["Stage", "Step", self.key, "Part"]
+        )
+        df = pd.DataFrame(
+            np.asarray(values).reshape(-1, len(self.components)),
+            index=index, columns=self.components
+        )
+        df = df[df.notna().any(axis=1)].reset_index()
+        if self.parts == [""]:
+            df = df.drop(columns="Part")
+        if self.steps == [""]:
+            df = df.drop(columns="Step")
+        return df
+
+    def to_frames(self):
+        """
+        转换为按阶段分组的DataFrame列表(与process_construction_results返回格式一致)
+
+        返回:
+        - list: 每个施工阶段一个DataFrame
+        """
+        return [self.to_frame(stage) for stage in self.stages]
@@ -0,0 +1,190 @@
+"""敏感性分析模块，计算测点结果对模型参数的有限差分敏感性矩阵，包括：
+- 前差分、中心差分及参数范围边界处自动改用单侧差分
+- 半步长结果的Richardson外推和截断误差估计
+- 全部扰动模型在多个MIDAS实例中并行计算，只提取测点结果
+- 无量纲敏感性(弹性系数)和参数重要性排序
+参数和测点的定义与模型修正模块(calibration)相同，计算结果按参数值缓存
+"""
+
+import numpy as np
+import pandas as pd
+from .calibration import ModelEvaluator
+
+
+class SensitivityAnalysis(ModelEvaluator):
+    """
+    有限差分敏感性分析
+
+    属性:
+    - matrix: DataFrame, 敏感性矩阵(测点 × 参数)，单位为 测点结果单位/参数单位
+    - error: DataFrame, 截断误差估计(refine=True时)
+
+    使用方法:
+    >>> params = [material_parameter("E_C50", 2, c50_props), prestress_loss_parameter("loss", tendons, 1395)]
+    >>> responses = [
+    ...     Measurement("displacement", [11, 21, 31], "DZ", stage="CS30"),
+    ...     Measurement("cable_force", [501, 502], "Tension", stage="CS30")
+    ... ]
+    >>> sa = SensitivityAnalysis(params, responses, instances=connections)
+    >>> sa.run(scheme="central")
+    >>> sa.ranking()
+    """
+
+    SCHEMES = ["forward", "central"]
+
+    def __init__(self, parameters, responses, instances=None, step=0.01, steps=None):
+        """
+        参数:
+        - parameters: list, CalibrationParameter列表
+        - responses: list, Measurement列表(实测值可省略)
+        - instances: list, MIDAS实例连接参数列表(同ModelEvaluator)
+        - step: float, 相对步长，参数的扰动量为 step × |参数值|，参数值为0时为 step × 参数范围
+        - steps: dict, {参数名称: 扰动量}，指定部分参数的绝对步长
+        """
+        super().__init__(parameters, responses, instances)
+        self.step = step
+        self.steps = dict(steps or {})
+        unknown = set(self.steps) - set(self.names)
+        if unknown:
+            raise ValueError(f"步长中引用了不存在的参数: {sorted(unknown)}")
+        self.base = None
+        self.matrix = None
+        self.error = None
+
+    def step_sizes(self, values):
+        """
+        各参数的扰动量
+
+        参数:
+        - values: ndarray, 参数值
+
+        返回:
+        - ndarray: 扰动量(均为正值)
+        """
+        sizes = []
+        for parameter, value in zip(self.parameters, values):
+            if parameter.name in self.steps:
+                sizes.append(abs(float(self.steps[parameter.name])))
+            else:
+                sizes.append(self.step * (abs(value) or parameter.upper - parameter.lower))
+        return np.array(sizes)
+
+    def _kinds(self, values, sizes, scheme):
+        """
+        各参数实际使用的差分格式，由完整步长确定(半步长使用相同格式)
+
+        返回:
+        - list: "central"(中心差分)、"forward"(向上单侧差分)或"backward"(向下单侧差分)
+        """
+        kinds = []
+        for parameter, value, h in zip(self.parameters, values, sizes):
+            plus_ok, minus_ok = value + h <= parameter.upper, value - h >= parameter.lower
+            if not (plus_ok or minus_ok):
+                raise ValueError(f"参数 {parameter.name} 的步长({h})大于参数范围")
+            if scheme == "central" and plus_ok and minus_ok:
+                kinds.append("central")
+            else:
+                kinds.append("forward" if plus_ok else "backward")
+        return kinds
+
+    @staticmethod
+    def _stencil(kind, h):
+        """
+        单个参数的差分格式
+
+        返回:
+        - list: [(扰动量, 系数), ...]，导数 = Σ 系数 × f(参数值 + 扰动量)
+        """
+        if kind == "central":
+            return [(h, 0.5 / h), (-h, -0.5 / h)]
+        s = h if kind == "forward" else -h
+        return [(0.0, -1.0 / s), (s, 1.0 / s)]
+
+    def _derivatives(self, values, sizes, kinds, results):
+        """由计算结果组装导数矩阵(测点 × 参数)"""
+        columns = []
+        for j, (kind, h) in enumerate(zip(kinds, sizes)):
+            derivative = 0.0
+            for offset, weight in self._stencil(kind, h):
+                point = values.copy()
+                point[j] += offset
+                derivative = derivative + weight * results[tuple(point.tolist())]
+            columns.append(derivative)
+        return np.column_stack(columns)
+
+    def run(self, values=None, scheme="forward", refine=False):
+        """
+        计算敏感性矩阵，全部扰动模型一次分派到各实例并行计算
+
+        参数:
+        - values: dict/array-like, 计算敏感性的参数值，默认为参数初始值
+        - scheme: str, 差分格式，"forward"(前差分)或"central"(中心差分)，
+          参数范围边界处自动改用单侧差分
+        - refine: bool, 是否同时计算半步长结果，以Richardson外推提高精度并估计截断误差
+
+        返回:
+        - DataFrame: 敏感性矩阵，行为测点(Type, Component, Stage, ID)，列为参数
+        """
+        if scheme not in self.SCHEMES:
+            raise ValueError(f"不支持的差分格式: {scheme}。可用格式: {', '.join(self.SCHEMES)}")
+        if values is None:
+            values = self.initial
+        elif isinstance(values, dict):
+            values = np.array([values.get(name, p.initial) for name, p in zip(self.names, self.parameters)])
+        values = np.asarray(values, dtype=np.float64)
+
+        sizes = self.step_sizes(values)
+        kinds = self._kinds(values, sizes, scheme)
+        levels = [sizes, sizes / 2] if refine else [sizes]
+
+        # 收集全部扰动点并去重，一次并行计算
+        points = {tuple(values.tolist()): values}
+        for level in levels:
+            for j, (kind, h) in enumerate(zip(kinds, level)):
+                for offset, _ in self._stencil(kind, h):
+                    point = values.copy()
+                    point[j] += offset
+                    points.setdefault(tuple(point.tolist()), point)
+        print(f'开始敏感性分析，共{len(self.parameters)}个参数，{len(points)}个计算模型，'
+              f'{len(self.instances)}个计算实例')
+        simulated = self.simulate_many(list(points.values()))
+        results = dict(zip(points, simulated))
+
+        derivatives = self._derivatives(values, sizes, kinds, results)
+        self.error = None
+        if refine:
+            # 两级步长使用相同格式：单侧差分为一阶精度，中心差分为二阶精度
+            half = self._derivatives(values, sizes / 2, kinds, results)
+            order = np.array([2 if kind == "central" else 1 for kind in kinds])
+            extrapolated = (2 ** order * half - derivatives) / (2 ** order - 1)
+            self.error = pd.DataFrame(np.abs(half - derivatives), index=self.response_index(), columns=self.names)
+            derivatives = extrapolated
+
+        self.base = pd.Series(values, index=self.names, name="Value")
+        self.matrix = pd.DataFrame(derivatives, index=self.response_index(), columns=self.names)
+        self._response = results[tuple(values.tolist())]
+        print("敏感性分析完成")
+        return self.matrix
+
+    def normalized(self):
+        """
+        无量纲敏感性(弹性系数)，即参数变化1%时测点结果变化的百分数
+
+        返回:
+        - DataFrame: 弹性系数矩阵，测点结果为0时为NaN
+        """
+        if self.matrix is None:
+            raise ValueError("尚未运行敏感性分析")
+        response = np.where(self._response == 0, np.nan, self._response)
+        return self.matrix * self.base.to_numpy()[None, :] / response[:, None]
+
+    def ranking(self):
+        """
+        参数重要性排序(弹性系数矩阵各列的均方根)
+
+        返回:
+        - Series: 参数名称 -> 重要性，降序排列
+        """
+        elasticity = self.normalized().to_numpy()
+        importance = np.sqrt(np.nanmean(elasticity ** 2, axis=0))
+        return pd.Series(importance, index=self.names, name="Importance").sort_values(ascending=False)
@@ -0,0 +1,372 @@
+"""模型快照模块，将模型数据保存为紧凑的列式文件并批量恢复，包括：
+- 从/db/*接口读取节点、单元、边界、弹簧、连接、荷载工况和荷载
+- 以列式数组保存为单个未压缩的.npz文件(可按需内存映射读取)
+- 两个快照之间的差异比较
+- 分批上传恢复模型数据
+"""
+
+import json
+import struct
+import zipfile
+import numpy as np
+import pandas as pd
+from .api import midas_api
+from .geometry import geometry_index
+from .library import material_library, section_library
+from .load_cases import load_case_registry
+from .validation import model_validator
+
+# 快照包含的数据表及对应接口，按恢复顺序排列(被引用的数据在前)
+SNAPSHOT_TABLES = {
+    "MATL": "/db/MATL",   # 材料
+    "SECT": "/db/SECT",   # 截面
+    "NODE": "/db/NODE",   # 节点
+    "ELEM": "/db/ELEM",   # 单元
+    "CONS": "/db/CONS",   # 一般支撑
+    "NSPR": "/db/NSPR",   # 节点弹性支撑
+    "ELNK": "/db/ELNK",   # 弹性连接
+    "RIGD": "/db/RIGD",   # 刚性连接
+    "STLD": "/db/STLD",   # 静力荷载工况
+    "CNLD": "/db/CNLD",   # 节点荷载
+    "BMLD": "/db/BMLD",   # 梁单元荷载
+    "TDPL": "/db/TDPL",   # 钢束预应力荷载
+    "ETMP": "/db/ETMP"    # 单元温度荷载
+}
+
+_MANIFEST = "__manifest__"
+
+
+def _column_kind(values):
+    """判断字段的存储方式: num(数值数组)、str(字符串数组)或json(JSON字符串数组)"""
+    if any(v is None for v in values):
+        return "json"
+    if all(isinstance(v, bool) for v in values):
+        return "num"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return "num"
+    if all(isinstance(v, str) for v in values):
+        return "str"
+    return "json"
+
+
+def encode_table(records):
+    """
+    将接口返回的{编号: {字段: 值}}数据转换为列式数组
+
+    参数:
+    - records: dict, 数据表内容，如{"1": {"X": 0, "Y": 0, "Z": 0}}
+
+    返回:
+    - tuple: (columns, kinds)
+        - columns: dict, {"ids": 编号数组, 字段名: 数组}
+        - kinds: dict, {字段名: 存储方式}
+    """
+    ids = list(records)
+    fields = []
+    for item in records.values():
+        fields.extend(key for key in item if key not in fields)
+
+    columns = {"ids": np.array(ids, dtype=str)}
+    kinds = {}
+    for field in fields:
+        present = [field in item for item in records.values()]
+        values = [item.get(field) for item in records.values()]
+        kind = _column_kind(values) if all(present) else "json"
+        if kind == "num":
+            columns[field] = np.array(values)
+        elif kind == "str":
+            columns[field] = np.array(values, dtype=str)
+        else:
+            # 缺失字段以空字符串表示
+            columns[field] = np.array(
+                [json.dumps(v, ensure_ascii=False) if p else "" for v, p in zip(values, present)],
+                dtype=str
+            )
+        kinds[field] = kind
+    return columns, kinds
+
+
+def decode_table(columns, kinds, ids=None):
+    """
+    将列式数组还原为{编号: {字段: 值}}数据
+
+    参数:
+    - columns: dict, encode_table返回的列
+    - kinds: dict, 各字段的存储方式
+    - ids: list, 仅还原指定编号，默认全部
+
+    返回:
+    - dict: 接口格式的数据表内容
+    """
+    all_ids = np.asarray(columns["ids"]).tolist()
+    rows = range(len(all_ids))
+    if ids is not None:
+        position = {key: i for i, key in enumerate(all_ids)}
+        rows = [position[str(key)] for key in ids]
+
+    lists = {field: np.asarray(columns[field]).tolist() for field in kinds}
+    records = {}
+    for i in rows:
+        item = {}
+        for field, kind in kinds.items():
+            value = lists[field][i]
+            if kind == "json":
+                if value == "":
+                    continue
+                value = json.loads(value)
+            item[field] = value
+        records[all_ids[i]] = item
+    return records
+
+
+def _mmap_npz(path):
+    """
+    以内存映射方式打开未压缩的.npz文件中的全部数组
+
+    返回:
+    - dict: {数组名: np.memmap}
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"快照文件中的数组 {info.filename} 已压缩，无法内存映射")
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if 0 in shape:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                    order="F" if fortran else "C"
+                )
+    return arrays
+
+
+class Snapshot:
+    """
+    模型快照
+
+    属性:
+    - path: str, 快照文件路径
+    - tables: list, 快照中包含的数据表名称
+
+    使用方法:
+    >>> snap = Snapshot("model_base.npz")
+    >>> snap.to_frame("NODE")
+    >>> snap.records("NSPR")
+    """
+
+    def __init__(self, path, mmap=True):
+        """
+        打开快照文件(数组按需读取)
+
+        参数:
+        - path: str, 快照文件路径
+        - mmap: bool, 是否以内存映射方式读取数组
+        """
+        self.path = path
+        self._arrays = _mmap_npz(path) if mmap else np.load(path, allow_pickle=False)
+        self._manifest = json.loads(str(np.asarray(self._arrays[_MANIFEST])))
+        self.tables = list(self._manifest)
+
+    def kinds(self, table):
+        """数据表各字段的存储方式"""
+        return self._manifest[table]["kinds"]
+
+    def endpoint(self, table):
+        """数据表对应的接口路径"""
+        return self._manifest[table]["endpoint"]
+
+    def columns(self, table):
+        """
+        获取数据表的列式数组
+
+        参数:
+        - table: str, 数据表名称，如"NODE"
+
+        返回:
+        - dict: {"ids": 编号数组, 字段名: 数组}
+        """
+        names = ["ids"] + list(self.kinds(table))
+        return {name: self._arrays[f"{table}.{name}"] for name in names}
+
+    def to_frame(self, table):
+        """
+        将数据表转换为DataFrame(以编号为索引)
+
+        参数:
+        - table: str, 数据表名称
+
+        返回:
+        - DataFrame: 每条数据一行，json类型字段为JSON字符串
+        """
+        columns = self.columns(table)
+        ids = np.asarray(columns.pop("ids"))
+        return pd.DataFrame({k: np.asarray(v) for k, v in columns.items()}, index=pd.Index(ids, name="ID"))
+
+    def records(self, table, ids=None):
+        """
+        将数据表还原为接口格式
+
+        参数:
+        - table: str, 数据表名称
+        - ids: list, 仅还原指定编号，默认全部
+
+        返回:
+        - dict: {编号: {字段: 值}}
+        """
+        return decode_table(self.columns(table), self.kinds(table), ids)
+
+
+def _read_table(table, endpoint):
+    """读取模型中的一个数据表，返回{编号: 数据}"""
+    response = midas_api.request("GET", endpoint, {}) or {}
+    return response.get(table) or next(
+        (v for k, v in response.items() if k.upper() == table.upper() and isinstance(v, dict)), {}
+    )
+
+
+def _invalidate(tables):
+    """恢复或删除数据后清除相关的本地索引"""
+    if {"NODE", "ELEM"} & set(tables):
+        geometry_index.invalidate()
+    if "STLD" in tables:
+        load_case_registry.invalidate()
+    if "MATL" in tables:
+        material_library.invalidate()
+    if "SECT" in tables:
+        section_library.invalidate()
+    if {"NODE", "MATL", "SECT", "STLD"} & set(tables):
+        model_validator.reset()
+
+
+def snapshot(path, tables=None):
+    """
+    读取模型数据并保存为快照文件
+
+    参数:
+    - path: str, 快照文件路径(.npz)
+    - tables: list, 需要保存的数据表名称，默认为SNAPSHOT_TABLES中的全部数据表
+
+    返回:
+    - Snapshot: 快照对象
+
+    示例:
+    >>> snapshot("model_base.npz")
+    >>> restore("model_base.npz", tables=["NSPR", "MATL"])
+    """
+    tables = tables or list(SNAPSHOT_TABLES)
+    arrays, manifest = {}, {}
+    print(f'开始保存模型快照: {path}')
+    for table in tables:
+        endpoint = SNAPSHOT_TABLES.get(table, f"/db/{table}")
+        records = _read_table(table, endpoint)
+        columns, kinds = encode_table(records)
+        for name, values in columns.items():
+            arrays[f"{table}.{name}"] = values
+        manifest[table] = {"endpoint": endpoint, "kinds": kinds, "count": len(records)}
+
+    arrays[_MANIFEST] = np.array(json.dumps(manifest, ensure_ascii=False))
+    # 不压缩保存，便于内存映射读取
+    np.savez(path, **arrays)
+    counts = ", ".join(f"{t}:{m['count']}" for t, m in manifest.items())
+    print(f"模型快照保存完成({counts})")
+    return Snapshot(path)
+
+
+def diff(old, new, tables=None):
+    """
+    比较两个快照的差异
+
+    参数:
+    - old: Snapshot/str, 原快照或快照文件路径
+    - new: Snapshot/str, 新快照或快照文件路径
+    - tables: list, 需要比较的数据表，默认为两个快照共有的数据表
+
+    返回:
+    - dict: {数据表: {"added": 新增编号, "removed": 删除编号, "changed": 修改编号}}
+    """
+    old = old if isinstance(old, Snapshot) else Snapshot(old)
+    new = new if isinstance(new, Snapshot) else Snapshot(new)
+    tables = tables or [t for t in old.tables if t in new.tables]
+
+    result = {}
+    for table in tables:
+        a, b = old.to_frame(table), new.to_frame(table)
+        common = a.index.intersection(b.index)
+        fields = a.columns.union(b.columns)
+        a_common = a.reindex(index=common, columns=fields)
+        b_common = b.reindex(index=common, columns=fields)
+        unequal = (a_common != b_common) & ~(a_common.isna() & b_common.isna())
+        result[table] = {
+            "added": b.index.difference(a.index).tolist(),
+            "removed": a.index.difference(b.index).tolist(),
+            "changed": common[unequal.any(axis=1).to_numpy()].tolist()
+        }
+    return result
+
+
+def restore(source, tables=None, ids=None, chunk_size=5000, delete=None):
+    """
+    将快照数据分批写回模型(PUT操作，覆盖同编号的数据)，并删除快照之后新增的数据
+
+    参数:
+    - source: Snapshot/str, 快照或快照文件路径
+    - tables: list, 需要恢复的数据表，默认为快照中的全部数据表
+    - ids: dict, {数据表: 编号列表}，仅恢复指定数据(如diff返回的修改编号)
+    - chunk_size: int, 每批提交的数据条数
+    - delete: dict, {数据表: 编号列表}，需要删除的数据(如diff返回的新增编号)；
+      默认在完整恢复(ids为None)时读取模型当前数据，删除快照中没有的编号
+
+    返回:
+    - dict: {数据表: 各批次响应结果}
+    
+    数据删除失败时，其余数据照常恢复，完成后抛出RuntimeError
+
+    示例:
+    >>> changes = diff("model_base.npz", snapshot("model_now.npz"))
+    >>> restore("model_base.npz", ids={t: c["changed"] + c["removed"] for t, c in changes.items()},
+    ...         delete={t: c["added"] for t, c in changes.items()})
+    >>> restore("model_base.npz")      # 完整恢复，模型回到快照时的状态
+    """
+    snap = source if isinstance(source, Snapshot) else Snapshot(source)
+    tables = tables or (list(ids) if ids else snap.tables)
+    order = [t for t in snap.tables if t in tables]
+
+    print(f'开始恢复模型快照: {snap.path}')
+    if delete is None and ids is None:
+        delete = {}
+        for table in order:
+            current = np.array(list(_read_table(table, snap.endpoint(table))), dtype=str)
+            delete[table] = np.setdiff1d(current, np.asarray(snap.columns(table)["ids"], dtype=str)).tolist()
+    # 先删除新增数据(引用其他数据的表在前)，再按恢复顺序写回
+    failed = {}
+    for table in reversed(order):
+        added = (delete or {}).get(table, [])
+        if len(added):
+            _, failed_ids = midas_api.delete_many(snap.endpoint(table), np.asarray(added, dtype=np.int64))
+            if len(failed_ids):
+                failed[table] = failed_ids
+    responses = {}
+    for table in order:
+        selected = None if ids is None else ids.get(table, [])
+        records = snap.records(table, selected)
+        if not records:
+            continue
+        responses[table] = midas_api.request_chunked("PUT", snap.endpoint(table), records, chunk_size)
+    _invalidate(order)
+    if failed:
+        details = "; ".join(f"{t}: {ids[:10].tolist()}" for t, ids in failed.items())
+        raise RuntimeError(f"模型快照恢复未完成，以下新增数据删除失败: {details}")
+    print("模型快照恢复完成")
+    return responses
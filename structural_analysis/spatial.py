@@ -0,0 +1,153 @@
+"""节点空间索引模块，基于KD树提供节点坐标查询功能，包括：
+- 最近节点查询
+- 半径范围和矩形框范围查询
+- 重合(重复)节点检测
+空间索引由几何索引的节点坐标建立，模型节点未修改时重复使用
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+from .geometry import geometry_index
+
+
+class NodeSpatialIndex:
+    """
+    节点空间索引
+
+    属性:
+    - node_ids: ndarray, 节点编号
+    - coords: ndarray, 节点坐标，形状为(节点数, 3)
+
+    使用方法:
+    >>> index = NodeProcessor().spatial_index()
+    >>> index.nearest([10.0, 0.0, 0.0])
+    >>> index.in_box([0, -1, -5], [50, 1, 0])
+    """
+
+    def __init__(self, node_ids, coords):
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        self.tree = cKDTree(self.coords)
+
+    @classmethod
+    def from_model(cls, force=False):
+        """
+        由模型节点建立空间索引，模型节点未修改时返回已建立的索引
+
+        参数:
+        - force: bool, 是否重新读取节点数据并重建索引
+
+        返回:
+        - NodeSpatialIndex: 空间索引
+        """
+        global _model_index
+        geometry_index.load(force=force)
+        if _model_index is None or _model_index.node_ids is not geometry_index.node_ids:
+            _model_index = cls(geometry_index.node_ids, geometry_index.coords)
+        return _model_index
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def nearest(self, points, k=1, max_distance=np.inf):
+        """
+        查询距离指定点最近的节点
+
+        参数:
+        - points: array-like, 单个点[x, y, z]或形状为(点数, 3)的坐标数组
+        - k: int, 返回的最近节点个数
+        - max_distance: float, 最大搜索距离，超出范围时节点编号为-1
+
+        返回:
+        - tuple: (节点编号, 距离)，形状与输入点数及k对应
+        """
+        points = np.asarray(points, dtype=np.float64)
+        distances, index = self.tree.query(points, k=k, distance_upper_bound=max_distance)
+        found = np.isfinite(distances)
+        ids = np.where(found, self.node_ids[np.minimum(index, len(self.node_ids) - 1)], -1)
+        return ids, distances
+
+    def within_radius(self, point, radius):
+        """
+        查询指定点半径范围内的节点
+
+        参数:
+        - point: array-like, 中心点坐标[x, y, z]
+        - radius: float, 搜索半径
+
+        返回:
+        - ndarray: 节点编号(升序)
+        """
+        index = self.tree.query_ball_point(np.asarray(point, dtype=np.float64), radius)
+        return np.sort(self.node_ids[np.asarray(index, dtype=np.intp)])
+
+    def in_box(self, lower, upper):
+        """
+        查询矩形框范围内(含边界)的节点
+
+        参数:
+        - lower: array-like, 框的最小坐标[xmin, ymin, zmin]
+        - upper: array-like, 框的最大坐标[xmax, ymax, zmax]
+
+        返回:
+        - ndarray: 节点编号(升序)
+        """
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+        if np.any(lower > upper):
+            return np.empty(0, dtype=np.int64)
+        # 先由KD树查询框外接球内的节点，再按框的范围筛选(半径略放大以包含角点上的节点)
+        radius = np.linalg.norm(upper - lower) / 2
+        candidates = np.asarray(
+            self.tree.query_ball_point((lower + upper) / 2, radius * (1 + 1e-9) + 1e-12), dtype=np.intp
+        )
+        coords = self.coords[candidates]
+        inside = np.all((coords >= lower) & (coords <= upper), axis=1)
+        return np.sort(self.node_ids[candidates[inside]])
+
+    def duplicates(self, tolerance=1e-3):
+        """
+        检测重合节点(距离小于容差的节点对)
+
+        参数:
+        - tolerance: float, 距离容差
+
+        返回:
+        - ndarray: 形状为(节点对数, 2)的节点编号数组，每行较小编号在前
+        """
+        pairs = self.tree.query_pairs(tolerance, output_type="ndarray")
+        if not len(pairs):
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.sort(self.node_ids[pairs], axis=1)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def merge_map(self, tolerance=1e-3):
+        """
+        生成重合节点的合并映射，每组重合节点合并到编号最小的节点
+
+        参数:
+        - tolerance: float, 距离容差
+
+        返回:
+        - dict: {被合并的节点编号: 保留的节点编号}
+        """
+        pairs = self.tree.query_pairs(tolerance, output_type="ndarray")
+        if not len(pairs):
+            return {}
+
+        # 重合节点对构成的连通分量即为一组重合节点
+        n = len(self.node_ids)
+        graph = sparse.coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+
+        nodes = np.unique(pairs)
+        keep = np.full(n, np.iinfo(np.int64).max)
+        np.minimum.at(keep, labels[nodes], self.node_ids[nodes])
+        merged = self.node_ids[nodes] != keep[labels[nodes]]
+        return dict(zip(self.node_ids[nodes[merged]].tolist(), keep[labels[nodes[merged]]].tolist()))
+
+
+# 由模型节点建立的空间索引缓存
+_model_index = None
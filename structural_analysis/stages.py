@@ -0,0 +1,289 @@
+"""施工阶段模块，由施工阶段表批量生成阶段定义并缓存阶段列表，包括：
+- 由阶段表和激活/钝化表生成/db/STAG分配数据
+- 施工阶段列表的本地缓存
+- 阶段名称到结果提取所用STAGE_STEP名称(如"CS1:002(最后)")的转换
+阶段列表只读取一次，之后由本地定义的阶段同步更新，打开新模型后失效；
+步骤名称优先使用结果表Stage、Step列中出现过的名称，未提取过结果的阶段按步骤数生成
+"""
+
+import numpy as np
+import pandas as pd
+from .api import midas_api
+
+# 激活/钝化操作: (操作, 对象类型) -> (数据字段, 名称字段, 参数字段, 参数默认值)
+ACTION_FIELDS = {
+    ("ACT", "ELEM"): ("ACT_ELEM", "GRUP_NAME", "AGE", 0),
+    ("DACT", "ELEM"): ("DACT_ELEM", "GRUP_NAME", "REDIST", 100),
+    ("ACT", "BNGR"): ("ACT_BNGR", "BNGR_NAME", "POS", "DEFORMED"),
+    ("DACT", "BNGR"): ("DACT_BNGR", "BNGR_NAME", None, None),
+    ("ACT", "LOAD"): ("ACT_LOAD", "LOAD_NAME", "DAY", "FIRST"),
+    ("DACT", "LOAD"): ("DACT_LOAD", "LOAD_NAME", "DAY", "FIRST")
+}
+
+# 结果表中阶段首、末步骤的标记(如"001(第一个)"、"003(最后)")
+STEP_LABELS = {"first": "(第一个)", "last": "(最后)"}
+
+
+def build_stage_assign(stages, actions=None, start_id=1):
+    """
+    由阶段表和激活/钝化表生成/db/STAG的分配数据
+
+    参数:
+    - stages: DataFrame/list, 阶段表，每行一个阶段，按施工顺序排列
+        - NAME: str, 阶段名称
+        - DURATION: float, 持续时间(天)
+        - ID: int, 阶段编号(可选，缺省时从start_id起连续编号)
+        - SAVE_RESULT: bool, 是否保存阶段结果(可选，默认True)
+        - SAVE_STEP: bool, 是否保存步骤结果(可选，默认False)
+        - ADD_STEP: list, 阶段内增加的步骤(天)(可选)
+    - actions: DataFrame/list, 激活/钝化表，每行一个结构组、边界组或荷载组
+        - STAGE: str, 阶段名称
+        - ACTION: str, "ACT"(激活)或"DACT"(钝化)
+        - KIND: str, "ELEM"(结构组)、"BNGR"(边界组)或"LOAD"(荷载组)
+        - GROUP: str, 组名称
+        - VALUE: 参数(可选)，激活结构组为材龄AGE，钝化结构组为内力重分配比例REDIST，
+          激活边界组为位置POS，荷载组为激活/钝化时刻DAY
+    - start_id: int, 未指定ID时的起始编号
+
+    返回:
+    - dict: {阶段编号: 阶段数据}
+
+    示例:
+    >>> stages = pd.DataFrame({"NAME": ["CS1", "CS2"], "DURATION": [10, 7]})
+    >>> actions = pd.DataFrame({
+    ...     "STAGE": ["CS1", "CS1", "CS2"], "ACTION": "ACT",
+    ...     "KIND": ["ELEM", "BNGR", "ELEM"], "GROUP": ["0#块", "墩顶支座", "1#块"]
+    ... })
+    >>> build_stage_assign(stages, actions)
+    """
+    stages = pd.DataFrame(stages).reset_index(drop=True)
+    if stages["NAME"].duplicated().any():
+        raise ValueError(f"阶段名称重复: {stages['NAME'][stages['NAME'].duplicated()].tolist()[:10]}")
+    if "ID" not in stages:
+        stages["ID"] = np.arange(start_id, start_id + len(stages))
+    n = len(stages)
+    save_result = stages["SAVE_RESULT"].tolist() if "SAVE_RESULT" in stages else [True] * n
+    save_step = stages["SAVE_STEP"].tolist() if "SAVE_STEP" in stages else [False] * n
+    add_step = stages["ADD_STEP"].tolist() if "ADD_STEP" in stages else [None] * n
+
+    assign = {}
+    for k, (stage_id, name, duration) in enumerate(stages[["ID", "NAME", "DURATION"]].itertuples(index=False)):
+        item = {
+            "NAME": name,
+            "DURATION": float(duration),
+            "bSV_RSLT": bool(save_result[k]),
+            "bSV_STEP": bool(save_step[k])
+        }
+        if isinstance(add_step[k], (list, tuple, np.ndarray)) and len(add_step[k]):
+            item["ADD_STEP"] = [float(day) for day in add_step[k]]
+        assign[str(int(stage_id))] = item
+
+    if actions is None or not len(actions):
+        return assign
+
+    actions = pd.DataFrame(actions).copy()
+    actions["ACTION"] = actions["ACTION"].str.upper()
+    actions["KIND"] = actions["KIND"].str.upper()
+    invalid = set(zip(actions["ACTION"], actions["KIND"])) - set(ACTION_FIELDS)
+    if invalid:
+        raise ValueError(f"不支持的激活/钝化操作: {sorted(invalid)}")
+    stage_ids = dict(zip(stages["NAME"], stages["ID"].astype(int).astype(str)))
+    unknown = set(actions["STAGE"]) - set(stage_ids)
+    if unknown:
+        raise ValueError(f"激活/钝化表中引用了不存在的阶段: {sorted(unknown)[:10]}")
+    if "VALUE" not in actions:
+        actions["VALUE"] = None
+
+    # 按(操作, 对象类型)分组，每组一次生成全部条目
+    for (action, kind), group in actions.groupby(["ACTION", "KIND"], sort=False):
+        field, name_field, value_field, default = ACTION_FIELDS[(action, kind)]
+        values = group["VALUE"].where(group["VALUE"].notna(), default).tolist()
+        for stage, group_name, value in zip(group["STAGE"].tolist(), group["GROUP"].tolist(), values):
+            entry = {name_field: group_name}
+            if value_field is not None:
+                entry[value_field] = value
+            assign[stage_ids[stage]].setdefault(field, []).append(entry)
+    return assign
+
+
+def _step_number(step):
+    """步骤编号，如"002(最后)" -> 2，无法识别时返回None"""
+    text = str(step).split("(")[0].strip()
+    return int(text) if text.isdigit() else None
+
+
+class StageRegistry:
+    """
+    施工阶段列表缓存
+
+    使用方法:
+    >>> stage_registry.names
+    >>> stage_registry.resolve(["CS1", "CS5:001(第一个)"])   # ["CS1:002(最后)", "CS5:001(第一个)"]
+    >>> stage_registry.all_steps()
+    """
+
+    def __init__(self):
+        self._stages = None
+        # 结果表中出现过的步骤名称: {阶段名称: {步骤编号: STAGE_STEP名称}}
+        self._steps = {}
+
+    @property
+    def loaded(self):
+        """阶段列表是否已读取"""
+        return self._stages is not None
+
+    def invalidate(self):
+        """清除缓存的阶段列表(打开新模型后调用)"""
+        self._stages = None
+        self._steps = {}
+
+    def load(self, force=False, response=None):
+        """
+        读取模型中的施工阶段，已读取时直接使用缓存
+
+        参数:
+        - force: bool, 是否强制重新读取
+        - response: dict, 已查询到的/db/STAG响应数据，提供时不再发送请求
+
+        返回:
+        - StageRegistry: 当前对象
+        """
+        if self.loaded and not force and response is None:
+            return self
+        if response is None:
+            print('开始读取施工阶段列表')
+            response = midas_api.request("GET", "/db/STAG", {})
+        self._stages = {}
+        self.record((response or {}).get("STAG", {}))
+        return self
+
+    def record(self, assign):
+        """
+        登记本地定义的阶段(未读取阶段列表时先读取)
+
+        参数:
+        - assign: dict, {阶段编号: 阶段数据}
+        """
+        if self._stages is None:
+            self.load()
+        for key, item in assign.items():
+            # 重新定义的阶段步骤可能改变，不再使用之前结果表中的步骤名称
+            previous = self._stages.get(int(key))
+            if previous is not None:
+                self._steps.pop(previous[0], None)
+            self._stages[int(key)] = (
+                item["NAME"], float(item.get("DURATION", 0)), len(item.get("ADD_STEP", []) or [])
+            )
+
+    def record_steps(self, stages, steps):
+        """
+        登记结果表中出现的步骤名称，之后step_names中相同编号的步骤使用这些名称
+
+        参数:
+        - stages: array-like, 结果表的Stage列
+        - steps: array-like, 结果表的Step列(如"001(第一个)")
+        """
+        for stage, step in set(zip(stages, steps)):
+            if pd.isna(stage) or pd.isna(step):
+                continue
+            number = _step_number(step)
+            if number is not None:
+                self._steps.setdefault(str(stage), {})[number] = f"{stage}:{str(step).strip()}"
+
+    def remove(self, stage_ids=None):
+        """
+        登记本地删除的阶段(未读取阶段列表时忽略)
+
+        参数:
+        - stage_ids: int/array-like, 阶段编号，None表示全部删除
+        """
+        if not self.loaded:
+            return
+        if stage_ids is None:
+            self._stages.clear()
+            self._steps.clear()
+            return
+        for stage_id in np.atleast_1d(stage_ids).astype(np.int64).tolist():
+            removed = self._stages.pop(stage_id, None)
+            if removed is not None:
+                self._steps.pop(removed[0], None)
+
+    def __len__(self):
+        return len(self.load()._stages)
+
+    @property
+    def names(self):
+        """按编号顺序排列的阶段名称"""
+        stages = self.load()._stages
+        return [stages[stage_id][0] for stage_id in sorted(stages)]
+
+    def next_id(self):
+        """下一个可用的阶段编号(排在已有阶段之后)"""
+        return max(self.load()._stages, default=0) + 1
+
+    def step_names(self, stage):
+        """
+        获取阶段的全部STAGE_STEP名称，优先使用结果表中出现过的名称，否则按步骤数生成
+
+        参数:
+        - stage: str, 阶段名称
+
+        返回:
+        - list: 如["CS1:001(第一个)", "CS1:002(最后)"]，阶段内增加的步骤位于首末步骤之间
+        """
+        for name, _, add_steps in self.load()._stages.values():
+            if name == stage:
+                count = add_steps + 2
+                names = {
+                    k: f"{stage}:{k:03d}" + (STEP_LABELS["first"] if k == 1 else STEP_LABELS["last"] if k == count else "")
+                    for k in range(1, count + 1)
+                }
+                names.update(self._steps.get(stage, {}))
+                return [names[k] for k in sorted(names)]
+        raise ValueError(f"模型中不存在施工阶段: {stage}")
+
+    def resolve(self, stages, step="last"):
+        """
+        将阶段名称转换为结果提取所用的STAGE_STEP名称，已含步骤的名称保持不变
+
+        参数:
+        - stages: str/list, 阶段名称或STAGE_STEP名称，None表示全部阶段
+        - step: str, 阶段名称对应的步骤，"first"或"last"
+
+        返回:
+        - list: STAGE_STEP名称，stages为None时返回None
+        """
+        if stages is None:
+            return None
+        if isinstance(stages, str):
+            stages = [stages]
+        index = 0 if step == "first" else -1
+        return [name if ":" in name else self.step_names(name)[index] for name in stages]
+
+    def all_steps(self):
+        """
+        按施工顺序排列的全部STAGE_STEP名称
+
+        返回:
+        - list: STAGE_STEP名称
+        """
+        return [step for stage in self.names for step in self.step_names(stage)]
+
+    def to_frame(self):
+        """
+        将阶段列表转换为DataFrame
+
+        返回:
+        - DataFrame: 列为 ID, NAME, DURATION, ADD_STEPS，按编号排序
+        """
+        stages = self.load()._stages
+        ids = sorted(stages)
+        return pd.DataFrame(
+            [stages[stage_id] for stage_id in ids],
+            index=pd.Index(ids, name="ID", dtype=np.int64),
+            columns=["NAME", "DURATION", "ADD_STEPS"]
+        ).reset_index()
+
+
+# 全局施工阶段缓存实例
+stage_registry = StageRegistry()
@@ -0,0 +1,239 @@
+"""代理模型模块，以已完成的分析结果训练响应面，代替部分MIDAS分析，包括：
+- 高斯过程(GP)代理模型，给出预测值和预测标准差
+- 二次多项式响应面，预测标准差由回归残差估计
+- 信赖域判断：查询点须靠近已有样本，且预测误差不超过容差，否则调用真实分析
+参数空间使用归一化变量(各参数范围映射到0~1)，多个测点结果共用一个代理模型
+"""
+
+import threading
+from itertools import combinations_with_replacement
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import minimize_scalar
+from scipy.spatial.distance import cdist
+
+
+class GaussianProcess:
+    """
+    高斯过程回归(平方指数核，各输出共用长度尺度，信号方差按输出分别估计)
+    """
+
+    def __init__(self, nugget=1e-8):
+        self.nugget = nugget
+        self.length = None
+
+    def _factor(self, length):
+        """核矩阵的Cholesky分解及各输出的信号方差"""
+        K = np.exp(-0.5 * self._d2 / length ** 2) + self.nugget * np.eye(len(self._d2))
+        factor = cho_factor(K, lower=True)
+        alpha = cho_solve(factor, self._y)
+        sigma2 = np.maximum(np.einsum("ij,ij->j", self._y, alpha) / len(self._y), 1e-300)
+        return factor, alpha, sigma2
+
+    def _neg_log_likelihood(self, log_length):
+        try:
+            factor, _, sigma2 = self._factor(np.exp(log_length))
+        except np.linalg.LinAlgError:
+            return np.inf
+        n, m = self._y.shape
+        log_det = 2 * np.log(np.diag(factor[0])).sum()
+        return 0.5 * n * np.log(sigma2).sum() + 0.5 * m * log_det
+
+    def fit(self, X, Y):
+        """
+        训练模型，长度尺度按边缘似然最大确定
+
+        参数:
+        - X: ndarray, 形状为(样本数, 参数数)的归一化变量
+        - Y: ndarray, 形状为(样本数, 输出数)的结果
+        """
+        self._X = X
+        self._mean = Y.mean(axis=0)
+        self._scale = Y.std(axis=0)
+        self._scale[self._scale == 0] = 1.0
+        self._y = (Y - self._mean) / self._scale
+        self._d2 = cdist(X, X, "sqeuclidean")
+        result = minimize_scalar(self._neg_log_likelihood, bounds=(np.log(0.01), np.log(10.0)), method="bounded")
+        self.length = float(np.exp(result.x))
+        self._factor_k, self._alpha, self._sigma2 = self._factor(self.length)
+        return self
+
+    def predict(self, X):
+        """
+        预测
+
+        参数:
+        - X: ndarray, 形状为(点数, 参数数)的归一化变量
+
+        返回:
+        - tuple: (预测值, 预测标准差)，形状均为(点数, 输出数)
+        """
+        k = np.exp(-0.5 * cdist(X, self._X, "sqeuclidean") / self.length ** 2)
+        mean = k @ self._alpha
+        v = cho_solve(self._factor_k, k.T)
+        var = np.maximum(1.0 + self.nugget - np.einsum("ij,ji->i", k, v), 0.0)
+        std = np.sqrt(var[:, None] * self._sigma2[None, :])
+        return self._mean + mean * self._scale, std * self._scale
+
+
+class QuadraticSurface:
+    """
+    二次多项式响应面(最小二乘拟合)
+    """
+
+    @staticmethod
+    def features(X):
+        """二次多项式基函数: 1, x_i, x_i·x_j"""
+        n, d = X.shape
+        columns = [np.ones(n)] + [X[:, i] for i in range(d)]
+        columns += [X[:, i] * X[:, j] for i, j in combinations_with_replacement(range(d), 2)]
+        return np.column_stack(columns)
+
+    @staticmethod
+    def terms(dim):
+        """基函数个数"""
+        return 1 + dim + dim * (dim + 1) // 2
+
+    def fit(self, X, Y):
+        """
+        训练模型
+
+        参数:
+        - X: ndarray, 形状为(样本数, 参数数)的归一化变量
+        - Y: ndarray, 形状为(样本数, 输出数)的结果
+        """
+        phi = self.features(X)
+        self._coef, _, _, _ = np.linalg.lstsq(phi, Y, rcond=None)
+        dof = len(X) - phi.shape[1]
+        residual = Y - phi @ self._coef
+        self._s2 = (residual ** 2).sum(axis=0) / dof if dof > 0 else np.full(Y.shape[1], np.inf)
+        self._cov = np.linalg.pinv(phi.T @ phi)
+        return self
+
+    def predict(self, X):
+        """
+        预测
+
+        参数:
+        - X: ndarray, 形状为(点数, 参数数)的归一化变量
+
+        返回:
+        - tuple: (预测值, 预测标准差)，形状均为(点数, 输出数)
+        """
+        phi = self.features(X)
+        leverage = np.einsum("ij,jk,ik->i", phi, self._cov, phi)
+        std = np.sqrt(np.maximum(leverage, 0.0)[:, None] * self._s2[None, :])
+        return phi @ self._coef, std
+
+
+class ResponseSurface:
+    """
+    带信赖域的代理模型
+
+    查询点与最近样本的距离不超过radius，且各输出的预测标准差与该输出样本最大绝对值之比
+    不超过tolerance时返回预测值，否则返回None(由调用方运行真实分析并添加样本)
+
+    使用方法:
+    >>> surface = ResponseSurface(kind="gp", tolerance=0.005, radius=0.15)
+    >>> surface.add(x, y)               # x为归一化变量，y为测点结果
+    >>> surface.query(x_new)            # 预测值或None
+    """
+
+    KINDS = {"gp": GaussianProcess, "quadratic": QuadraticSurface}
+
+    def __init__(self, kind="gp", tolerance=0.01, radius=0.1, min_samples=None):
+        """
+        参数:
+        - kind: str, 代理模型类型，"gp"(高斯过程)或"quadratic"(二次多项式)
+        - tolerance: float, 允许的相对预测误差(预测标准差 / 样本结果绝对值最大值)
+        - radius: float, 信赖域半径(归一化变量空间中与最近样本的距离)
+        - min_samples: int, 开始使用代理模型的最少样本数，默认为参数数+2(二次多项式为基函数个数+1)
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"不支持的代理模型类型: {kind}。可用类型: {', '.join(self.KINDS)}")
+        self.kind = kind
+        self.tolerance = tolerance
+        self.radius = radius
+        self.min_samples = min_samples
+        self.hits = 0
+        self.misses = 0
+        self._X, self._Y = [], []
+        self._model = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._X)
+
+    def add(self, x, y):
+        """
+        添加样本(模型在下次查询时重新训练)
+
+        参数:
+        - x: array-like, 归一化变量
+        - y: array-like, 测点结果
+        """
+        with self._lock:
+            self._X.append(np.asarray(x, dtype=np.float64))
+            self._Y.append(np.asarray(y, dtype=np.float64))
+            self._model = None
+
+    def _required(self, dim):
+        if self.min_samples is not None:
+            return self.min_samples
+        return QuadraticSurface.terms(dim) + 1 if self.kind == "quadratic" else dim + 2
+
+    def _fitted(self):
+        """训练后的模型，样本不足时返回None(须在锁内调用)"""
+        if not self._X or len(self._X) < self._required(len(self._X[0])):
+            return None
+        if self._model is None:
+            self._model = self.KINDS[self.kind]().fit(np.array(self._X), np.array(self._Y))
+            self._bound = np.maximum(np.abs(np.array(self._Y)).max(axis=0), np.finfo(float).tiny)
+        return self._model
+
+    def predict(self, x):
+        """
+        预测(不做信赖域判断)
+
+        参数:
+        - x: array-like, 归一化变量
+
+        返回:
+        - tuple: (预测值, 预测标准差)，样本不足时返回None
+        """
+        with self._lock:
+            model = self._fitted()
+            if model is None:
+                return None
+            mean, std = model.predict(np.atleast_2d(np.asarray(x, dtype=np.float64)))
+        return mean[0], std[0]
+
+    def query(self, x):
+        """
+        在信赖域内且预测误差满足容差时返回预测值
+
+        参数:
+        - x: array-like, 归一化变量
+
+        返回:
+        - ndarray: 预测的测点结果，不满足条件时返回None
+        """
+        x = np.asarray(x, dtype=np.float64)
+        with self._lock:
+            model = self._fitted()
+            if model is not None and np.min(np.linalg.norm(np.array(self._X) - x, axis=1)) <= self.radius:
+                mean, std = model.predict(x[None, :])
+                if np.max(std[0] / self._bound) <= self.tolerance:
+                    self.hits += 1
+                    return mean[0]
+            self.misses += 1
+        return None
+
+    def stats(self):
+        """
+        使用统计
+
+        返回:
+        - dict: samples(样本数)、hits(代理模型回答次数)、misses(调用真实分析次数)
+        """
+        return {"samples": len(self), "hits": self.hits, "misses": self.misses}
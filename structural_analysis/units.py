@@ -0,0 +1,255 @@
+"""单位换算模块，提供力、长度及其导出量(弯矩、应力、位移、转角等)的本地换算，包括：
+- 结果表按统一的基准单位提取和缓存，按需在本地换算为指定单位
+- 记录模型当前单位(由PreProcessor.set_units设置，未设置时从/db/UNIT读取)，将输入参数换算为模型单位
+"""
+
+import numpy as np
+import pandas as pd
+from .api import midas_api
+
+# 各力单位相对于N的换算系数
+FORCE_FACTORS = {
+    "N": 1.0,
+    "KN": 1.0e3,
+    "KGF": 9.80665,
+    "TONF": 9.80665e3,
+    "LBF": 4.4482216152605,
+    "KIPS": 4.4482216152605e3
+}
+
+# 各长度单位相对于mm的换算系数
+DIST_FACTORS = {
+    "MM": 1.0,
+    "CM": 10.0,
+    "M": 1.0e3,
+    "IN": 25.4,
+    "FT": 304.8
+}
+
+# 结果提取和缓存使用的基准单位(力, 长度)
+CANONICAL_UNIT = ("N", "MM")
+
+# 物理量的量纲，(力的指数, 长度的指数)
+QUANTITIES = {
+    "force": (1, 0),
+    "moment": (1, 1),
+    "bimoment": (1, 2),
+    "stress": (1, -2),
+    "displacement": (0, 1),
+    "length": (0, 1),
+    "area": (0, 2),
+    "inertia": (0, 4),
+    "rotation": (0, 0),
+    "warping": (0, -1),
+    "weight_density": (1, -3),
+    "mass_density": (1, -4),
+    "dimensionless": (0, 0)
+}
+
+# 各结果表中数值列对应的物理量
+TABLE_QUANTITIES = {
+    "BeamForce": {
+        "Axial": "force", "Shear-y": "force", "Shear-z": "force",
+        "Torsion": "moment", "Moment-y": "moment", "Moment-z": "moment",
+        "Bi-Moment": "bimoment", "T-Moment": "moment", "W-Moment": "moment"
+    },
+    "BeamStress": {
+        "Axial": "stress", "Shear-y": "stress", "Shear-z": "stress",
+        "Bend(+y)": "stress", "Bend(-y)": "stress", "Bend(+z)": "stress", "Bend(-z)": "stress",
+        "Cb(min/max)": "stress", "Cb1(-y+z)": "stress", "Cb2(+y+z)": "stress",
+        "Cb3(+y-z)": "stress", "Cb4(-y-z)": "stress"
+    },
+    "TrussForce": {"Force-I": "force", "Force-J": "force"},
+    "TrussStress": {"Stress-I": "stress", "Stress-J": "stress"},
+    "CableForce": {"Tension": "force", "FX": "force", "FY": "force", "FZ": "force"},
+    "CableEfficiency": {
+        "ChordLength": "length", "ExA": "force", "Weight": "force",
+        "Tension": "force", "ExA(mod)": "force", "Efficiency": "dimensionless"
+    },
+    "CableConfiguration": {
+        "TotalLength": "length", "Elongation": "length", "UnstrainedLength": "length",
+        "Sag": "length", "HorizontalDistance": "length", "VerticalDistance": "length",
+        "Gradient": "dimensionless", "SkewAngle/IEnd": "dimensionless",
+        "SkewAngle/JEnd": "dimensionless"
+    },
+    "Displacements(Global)": {
+        "DX": "displacement", "DY": "displacement", "DZ": "displacement",
+        "RX": "rotation", "RY": "rotation", "RZ": "rotation", "RW": "warping"
+    }
+}
+TABLE_QUANTITIES["BeamStress(7DOF)"] = TABLE_QUANTITIES["BeamStress"]
+TABLE_QUANTITIES["BeamStress(7thDOF)"] = TABLE_QUANTITIES["BeamStress"]
+
+
+def normalize_unit(unit):
+    """
+    规范化单位元组
+
+    参数:
+    - unit: tuple, (力单位, 长度单位)，如("kN", "m")
+
+    返回:
+    - tuple: 大写的(力单位, 长度单位)
+    """
+    force, dist = (str(u).upper() for u in unit)
+    if force not in FORCE_FACTORS:
+        raise ValueError(f"不支持的力单位: {unit[0]}。支持的单位: {', '.join(FORCE_FACTORS)}")
+    if dist not in DIST_FACTORS:
+        raise ValueError(f"不支持的长度单位: {unit[1]}。支持的单位: {', '.join(DIST_FACTORS)}")
+    return force, dist
+
+
+def unit_factor(quantity, from_unit, to_unit):
+    """
+    计算物理量由一种单位换算为另一种单位的系数
+
+    参数:
+    - quantity: str, 物理量名称(见QUANTITIES)
+    - from_unit: tuple, 原单位(力单位, 长度单位)
+    - to_unit: tuple, 目标单位(力单位, 长度单位)
+
+    返回:
+    - float: 换算系数，目标值 = 原值 × 系数
+    """
+    force_exp, dist_exp = QUANTITIES[quantity]
+    f_from, d_from = normalize_unit(from_unit)
+    f_to, d_to = normalize_unit(to_unit)
+    return (
+        (FORCE_FACTORS[f_from] / FORCE_FACTORS[f_to]) ** force_exp
+        * (DIST_FACTORS[d_from] / DIST_FACTORS[d_to]) ** dist_exp
+    )
+
+
+def convert(values, quantity, from_unit, to_unit):
+    """
+    换算数值或数组的单位
+
+    参数:
+    - values: float/array-like, 原单位下的数值
+    - quantity: str, 物理量名称
+    - from_unit: tuple, 原单位(力单位, 长度单位)
+    - to_unit: tuple, 目标单位(力单位, 长度单位)
+
+    返回:
+    - float/ndarray: 目标单位下的数值
+    """
+    factor = unit_factor(quantity, from_unit, to_unit)
+    if np.isscalar(values):
+        return values * factor
+    return np.asarray(values, dtype=np.float64) * factor
+
+
+def convert_table(raw_data, from_unit, to_unit, format_style=None, decimal_places=None):
+    """
+    换算/post/table接口返回结果的单位
+
+    参数:
+    - raw_data: dict, 接口返回结果，形如{表名: {"HEAD": [...], "DATA": [[...], ...]}}
+    - from_unit: tuple, 原单位(力单位, 长度单位)
+    - to_unit: tuple, 目标单位(力单位, 长度单位)
+    - format_style: str, 数据格式，"Fixed"时按decimal_places四舍五入
+    - decimal_places: int, 小数位数
+
+    返回:
+    - dict: 与raw_data结构相同的新结果，已换算的数值列为float
+    """
+    converted = {}
+    for table_name, table in raw_data.items():
+        if not isinstance(table, dict) or "HEAD" not in table or "DATA" not in table:
+            converted[table_name] = table
+            continue
+
+        quantities = TABLE_QUANTITIES.get(table_name, {})
+        head, rows = table["HEAD"], table["DATA"]
+        if not rows:
+            converted[table_name] = {**table, "DATA": []}
+            continue
+
+        data = np.array(rows, dtype=object)
+        for col, name in enumerate(head):
+            if name not in quantities:
+                continue
+            original = data[:, col]
+            numeric = pd.to_numeric(original, errors="coerce").astype(np.float64)
+            numeric = numeric * unit_factor(quantities[name], from_unit, to_unit)
+            if format_style == "Fixed" and decimal_places is not None:
+                numeric = np.round(numeric, decimal_places)
+            data[:, col] = np.where(np.isnan(numeric), original, numeric)
+
+        converted[table_name] = {**table, "DATA": data.tolist()}
+    return converted
+
+
+class UnitSystem:
+    """
+    模型单位管理类
+
+    属性:
+    - model_unit: tuple, 模型当前单位(力单位, 长度单位)，由PreProcessor.set_units更新，
+      未知时从模型读取
+    """
+
+    def __init__(self, model_unit=None):
+        self._model_unit = None if model_unit is None else normalize_unit(model_unit)
+
+    @property
+    def model_unit(self):
+        """模型当前单位，未知时读取/db/UNIT，读取失败时抛出ValueError"""
+        if self._model_unit is None:
+            self.load()
+        return self._model_unit
+
+    def load(self):
+        """
+        从模型读取当前单位
+
+        返回:
+        - tuple: (力单位, 长度单位)
+        """
+        response = midas_api.request("GET", "/db/UNIT", {}) or {}
+        table = next((v for k, v in response.items() if k.upper() == "UNIT" and isinstance(v, dict)), {})
+        item = next(iter(table.values()), None)
+        if not item or "FORCE" not in item or "DIST" not in item:
+            raise ValueError("无法读取模型单位，请先调用PreProcessor.set_units设置模型单位")
+        self._model_unit = normalize_unit((item["FORCE"], item["DIST"]))
+        return self._model_unit
+
+    def set_model_unit(self, force_unit, dist_unit):
+        """记录模型当前单位"""
+        self._model_unit = normalize_unit((force_unit, dist_unit))
+
+    def invalidate(self):
+        """清除记录的模型单位(打开新模型后调用)"""
+        self._model_unit = None
+
+    def to_model(self, values, quantity, unit):
+        """
+        将指定单位下的输入值换算为模型单位
+
+        参数:
+        - values: float/array-like, 输入值
+        - quantity: str, 物理量名称
+        - unit: tuple, 输入值的单位(力单位, 长度单位)
+
+        返回:
+        - float/ndarray: 模型单位下的数值
+        """
+        return convert(values, quantity, unit, self.model_unit)
+
+    def from_model(self, values, quantity, unit):
+        """
+        将模型单位下的数值换算为指定单位
+
+        参数:
+        - values: float/array-like, 模型单位下的数值
+        - quantity: str, 物理量名称
+        - unit: tuple, 目标单位(力单位, 长度单位)
+
+        返回:
+        - float/ndarray: 目标单位下的数值
+        """
+        return convert(values, quantity, self.model_unit, unit)
+
+
+# 全局单位管理实例
+unit_system = UnitSystem()
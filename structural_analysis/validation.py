@@ -0,0 +1,244 @@
+"""数据校验模块，在提交请求前于本地检查模型数据的引用关系，包括：
+- 单元引用的节点、材料、截面是否存在
+- 荷载引用的荷载工况是否存在
+- 边界条件约束字符串格式是否正确
+校验以NumPy数组向量化完成，发现错误时在发送请求前抛出ValueError
+"""
+
+import numpy as np
+from .api import midas_api
+from .geometry import geometry_index
+
+# 错误信息中最多列出的条目数
+MAX_REPORTED = 10
+
+
+def _report(label, values):
+    """生成错误条目的说明文字"""
+    values = list(dict.fromkeys(np.asarray(values).tolist()))
+    more = f" 等{len(values)}项" if len(values) > MAX_REPORTED else ""
+    return f"{label}: {values[:MAX_REPORTED]}{more}"
+
+
+def check_references(values, known, label):
+    """
+    检查引用的编号(名称)是否都存在
+
+    参数:
+    - values: array-like, 被引用的编号或名称
+    - known: array-like, 已存在的编号或名称
+    - label: str, 错误信息中的数据名称，如"节点"
+
+    异常:
+    - ValueError: 存在未定义的引用时抛出
+    """
+    values = np.asarray(values).ravel()
+    missing = values[~np.isin(values, known)]
+    if len(missing):
+        raise ValueError(_report(f"引用了不存在的{label}", missing))
+
+
+def check_constraints(constraints):
+    """
+    检查约束字符串格式(7位，仅包含0和1，依次对应UX, UY, UZ, RX, RY, RZ, RW)
+
+    参数:
+    - constraints: str/array-like, 约束字符串
+
+    异常:
+    - ValueError: 存在格式错误的约束字符串时抛出
+    """
+    if isinstance(constraints, str):
+        constraints = [constraints]
+    values = np.asarray(constraints).astype(str)
+    # 按UTF-32码位逐字符比较：长度为7且每个字符为"0"或"1"
+    chars = values.astype("<U8").view(np.uint32).reshape(-1, 8)[:, :7]
+    valid = (np.char.str_len(values) == 7) & np.all((chars == ord("0")) | (chars == ord("1")), axis=1)
+    if not valid.all():
+        raise ValueError(_report("约束字符串格式错误(应为7位0/1字符串)", values[~valid]))
+
+
+def load_case_names(payload):
+    """
+    提取荷载数据中引用的全部荷载工况名称
+
+    参数:
+    - payload: dict, {"Assign": {编号: 数据}}格式的荷载数据
+
+    返回:
+    - list: 荷载工况名称
+    """
+    names = []
+    for item in payload.get("Assign", {}).values():
+        if "LCNAME" in item:
+            names.append(item["LCNAME"])
+        names.extend(sub["LCNAME"] for sub in item.get("ITEMS", []) if sub.get("LCNAME") is not None)
+    return names
+
+
+class ModelValidator:
+    """
+    模型数据校验器
+
+    已知数据来自load_model读取的模型数据、几何索引缓存以及本地提交的数据；
+    某类数据未知(None)时跳过该类引用检查
+
+    使用方法:
+    >>> model_validator.load_model()
+    >>> model_validator.check_elements([[1, 2], [2, 99999]])   # 抛出ValueError
+    """
+
+    TABLES = {"MATL": "/db/MATL", "SECT": "/db/SECT", "STLD": "/db/STLD"}
+
+    def __init__(self):
+        self.enabled = True
+        self.known = {"NODE": None, "MATL": None, "SECT": None, "STLD": None}
+
+    def load_model(self):
+        """
+        读取模型中已有的节点、材料、截面和荷载工况，作为引用检查的依据
+
+        返回:
+        - ModelValidator: 当前对象
+        """
+        print('开始读取校验数据')
+        geometry_index.load()
+        self.known["NODE"] = geometry_index.node_ids.copy()
+        for table, endpoint in self.TABLES.items():
+            records = (midas_api.request("GET", endpoint, {}) or {}).get(table, {})
+            if table == "STLD":
+                self.known[table] = np.array([item["NAME"] for item in records.values()], dtype=object)
+            else:
+                self.known[table] = np.array([int(key) for key in records], dtype=np.int64)
+        print("校验数据读取完成")
+        return self
+
+    def reset(self):
+        """清除已知数据(打开新模型后调用)"""
+        for table in self.known:
+            self.known[table] = None
+
+    def register(self, table, values):
+        """
+        登记本地新增的数据(已知数据未读取时忽略)
+
+        参数:
+        - table: str, 数据类型("NODE", "MATL", "SECT", "STLD")
+        - values: array-like, 新增的编号或工况名称
+        """
+        if self.known[table] is None:
+            return
+        values = np.asarray(values, dtype=self.known[table].dtype).ravel()
+        self.known[table] = np.union1d(self.known[table], values)
+
+    def unregister(self, table, values=None):
+        """
+        登记本地删除的数据
+
+        参数:
+        - table: str, 数据类型
+        - values: array-like, 删除的编号或工况名称，None表示全部删除
+        """
+        if self.known[table] is None:
+            return
+        if values is None:
+            self.known[table] = self.known[table][:0]
+        else:
+            values = np.asarray(values, dtype=self.known[table].dtype).ravel()
+            self.known[table] = np.setdiff1d(self.known[table], values)
+
+    def _known_nodes(self):
+        """已知节点编号，未读取模型数据时使用几何索引缓存"""
+        if self.known["NODE"] is not None:
+            return self.known["NODE"]
+        return geometry_index.node_ids
+
+    def check_nodes(self, node_ids):
+        """
+        检查节点是否存在(用于弹性支撑、连接等按节点分配的数据)
+
+        参数:
+        - node_ids: array-like, 节点编号，0表示空位
+
+        异常:
+        - ValueError: 存在未定义的节点时抛出
+        """
+        known_nodes = self._known_nodes()
+        if not self.enabled or known_nodes is None:
+            return
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        check_references(node_ids[node_ids != 0], known_nodes, "节点")
+
+    def check_elements(self, nodes, matl=None, sect=None):
+        """
+        检查单元引用的节点、材料和截面
+
+        参数:
+        - nodes: array-like, 单元节点编号，形状为(单元数, 节点数)，0表示空位
+        - matl: int/array-like, 材料ID
+        - sect: int/array-like, 截面ID
+
+        异常:
+        - ValueError: 存在未定义的引用时抛出
+        """
+        if not self.enabled:
+            return
+        self.check_nodes(nodes)
+        if matl is not None and self.known["MATL"] is not None:
+            check_references(np.asarray(matl, dtype=np.int64), self.known["MATL"], "材料")
+        if sect is not None and self.known["SECT"] is not None:
+            check_references(np.asarray(sect, dtype=np.int64), self.known["SECT"], "截面")
+
+    def check_element_payload(self, payload):
+        """检查{"Assign": {单元编号: 单元数据}}格式的单元数据"""
+        if not self.enabled:
+            return
+        items = list(payload.get("Assign", {}).values())
+        if not items:
+            return
+        nodes = np.concatenate([np.asarray(item["NODE"], dtype=np.int64).ravel() for item in items])
+        self.check_elements(
+            nodes,
+            [item["MATL"] for item in items if "MATL" in item],
+            [item["SECT"] for item in items if "SECT" in item]
+        )
+
+    def check_load_cases(self, names):
+        """
+        检查荷载工况名称是否已定义
+
+        参数:
+        - names: str/array-like, 荷载工况名称
+
+        异常:
+        - ValueError: 存在未定义的荷载工况时抛出
+        """
+        if not self.enabled or self.known["STLD"] is None:
+            return
+        if isinstance(names, str):
+            names = [names]
+        check_references(np.asarray(names, dtype=object), self.known["STLD"], "荷载工况")
+
+    def check_load_payload(self, payload):
+        """检查{"Assign": {...}}格式的荷载数据中引用的荷载工况"""
+        self.check_load_cases(load_case_names(payload))
+
+    def check_constraint_payload(self, payload):
+        """
+        检查{"Assign": {节点编号: {"ITEMS": [...]}}}格式的边界条件数据
+
+        检查约束字符串格式以及节点是否存在
+        """
+        if not self.enabled:
+            return
+        assign = payload.get("Assign", {})
+        constraints = [
+            sub["CONSTRAINT"] for item in assign.values()
+            for sub in item.get("ITEMS", []) if "CONSTRAINT" in sub
+        ]
+        check_constraints(constraints)
+        self.check_nodes([int(key) for key in assign])
+
+
+# 全局校验器实例
+model_validator = ModelValidator()
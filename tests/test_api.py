@@ -0,0 +1,27 @@
+"""编号区间压缩测试"""
+
+from structural_analysis.api import compress_ranges, format_ranges, response_failed
+
+
+def test_compress_ranges_unordered_duplicates():
+    assert compress_ranges([5, 1, 2, 3, 7, 8, 2]) == [(1, 3), (5, 5), (7, 8)]
+
+
+def test_compress_ranges_empty():
+    assert compress_ranges([]) == []
+
+
+def test_compress_ranges_single():
+    assert compress_ranges([42]) == [(42, 42)]
+
+
+def test_format_ranges():
+    assert format_ranges([(1, 3), (5, 5), (7, 8)]) == "1to3,5,7to8"
+    assert format_ranges(compress_ranges(range(1, 101))) == "1to100"
+
+
+def test_response_failed():
+    assert response_failed(None)
+    assert response_failed({})
+    assert response_failed({"error": {"message": "not found"}})
+    assert not response_failed({"NODE": {"1": {"X": 0}}})
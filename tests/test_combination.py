@@ -0,0 +1,98 @@
+"""荷载组合测试"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from structural_analysis.combination import CombinationEngine, LoadCombination, case_key
+
+
+def basic_results():
+    """两个基本工况、两个单元的梁单元内力长表"""
+    return pd.DataFrame({
+        "Elem": [1, 2, 1, 2],
+        "Load": ["DL", "DL", "LL", "LL"],
+        "Part": ["I[1]", "I[2]", "I[1]", "I[2]"],
+        "Moment-y": [10.0, -4.0, 3.0, 6.0],
+        "Axial": [1.0, 2.0, -1.0, 0.5],
+    })
+
+
+def combined(df, load, component="Moment-y"):
+    return df[df["Load"] == load].sort_values("Elem")[component].to_numpy()
+
+
+def test_case_key():
+    assert case_key("DL(ST)") == "DL"
+    assert case_key(" CS合计(CS) ") == "CS合计"
+    assert case_key("LL") == "LL"
+
+
+def test_invalid_type():
+    with pytest.raises(ValueError):
+        LoadCombination("cLCB1", {"DL(ST)": 1.0}, "MAX")
+
+
+def test_linear_combination():
+    engine = CombinationEngine()
+    engine.add_combination("cLCB1", {"DL(ST)": 1.2, "LL(ST)": 1.4})
+    df = engine.combine(basic_results())
+
+    np.testing.assert_allclose(combined(df, "cLCB1(CB)"), [1.2 * 10 + 1.4 * 3, 1.2 * -4 + 1.4 * 6])
+    np.testing.assert_allclose(combined(df, "cLCB1(CB)", "Axial"), [1.2 - 1.4, 2.4 + 0.7])
+
+
+def test_envelope_abs_srss():
+    engine = CombinationEngine()
+    engine.add_combination("ENV", {"DL(ST)": 1.0, "LL(ST)": 1.0}, "ENVELOPE")
+    engine.add_combination("ABS", {"DL(ST)": 1.0, "LL(ST)": 1.0}, "ABS")
+    engine.add_combination("SRSS", {"DL(ST)": 1.0, "LL(ST)": 1.0}, "SRSS")
+    df = engine.combine(basic_results(), components=["Moment-y"])
+
+    np.testing.assert_allclose(combined(df, "ENV(CBmax)"), [10.0, 6.0])
+    np.testing.assert_allclose(combined(df, "ENV(CBmin)"), [3.0, -4.0])
+    np.testing.assert_allclose(combined(df, "ABS(CB)"), [13.0, 10.0])
+    np.testing.assert_allclose(combined(df, "SRSS(CB)"), np.hypot([10.0, -4.0], [3.0, 6.0]))
+
+
+def test_factor_matrix():
+    engine = CombinationEngine()
+    engine.add_combination("cLCB1", {"DL(ST)": 1.2, "LL(ST)": 1.4})
+    engine.add_combination("cLCB2", {"DL(ST)": 1.0})
+    matrix, names, cases = engine.factor_matrix()
+
+    assert names == ["cLCB1", "cLCB2"]
+    assert cases == ["DL(ST)", "LL(ST)"]
+    np.testing.assert_allclose(matrix.toarray(), [[1.2, 1.4], [1.0, 0.0]])
+
+
+def test_missing_case_raises():
+    engine = CombinationEngine()
+    engine.add_combination("cLCB1", {"DL(ST)": 1.0, "WL(ST)": 1.0})
+    with pytest.raises(KeyError):
+        engine.combine(basic_results())
+
+
+def test_missing_rows_propagate_nan():
+    df = basic_results().iloc[:3]   # 单元2缺少LL工况结果
+    engine = CombinationEngine()
+    engine.add_combination("cLCB1", {"DL(ST)": 1.2, "LL(ST)": 1.4})
+    engine.add_combination("cLCB2", {"DL(ST)": 1.0})
+    out = engine.combine(df, components=["Moment-y"])
+
+    assert combined(out, "cLCB1(CB)")[0] == pytest.approx(16.2)
+    assert np.isnan(combined(out, "cLCB1(CB)")[1])
+    np.testing.assert_allclose(combined(out, "cLCB2(CB)"), [10.0, -4.0])
+
+
+def test_only_requested_combinations_are_expanded():
+    engine = CombinationEngine()
+    engine.add_combination("ENV", {"DL(ST)": 1.0, "LL(ST)": 1.0}, "ENVELOPE")
+    engine.add_combination("BAD", {"ENV(CB)": 1.0, "DL(ST)": 1.0})
+    engine.add_combination("cLCB1", {"DL(ST)": 1.2})
+
+    assert engine.cases_for(["cLCB1"]) == ["DL(ST)"]
+    df = engine.combine(basic_results(), components=["Moment-y"], names=["cLCB1"])
+    np.testing.assert_allclose(combined(df, "cLCB1(CB)"), [12.0, -4.8])
+    with pytest.raises(ValueError):
+        engine.combine(basic_results(), names=["BAD"])
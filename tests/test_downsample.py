@@ -0,0 +1,23 @@
+"""绘图降采样测试"""
+
+import numpy as np
+import pytest
+
+from structural_analysis.downsample import minmax_downsample
+
+
+@pytest.mark.parametrize("max_points", [4, 5, 7, 50, 101])
+def test_minmax_respects_max_points(max_points):
+    x = np.arange(100.0)
+    y = np.sin(x / 3.0)
+    x_out, y_out = minmax_downsample(x, y, max_points)
+
+    assert len(x_out) <= max_points
+    assert y_out.max() == y.max() and y_out.min() == y.min()
+    assert x_out[0] == 0.0 and x_out[-1] == 99.0
+
+
+@pytest.mark.parametrize("max_points", [2, 3])
+def test_minmax_rejects_too_few_points(max_points):
+    with pytest.raises(ValueError):
+        minmax_downsample(np.arange(10.0), np.arange(10.0), max_points)
@@ -0,0 +1,63 @@
+"""包络计算测试"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from structural_analysis.envelope import compute_envelope, envelope_from_array, stack_results
+
+
+def test_envelope_from_array():
+    values = np.array([[1.0, np.nan], [-3.0, np.nan], [2.0, np.nan]])
+    env = envelope_from_array(values, ["A", "B", "C"])
+
+    assert env["max"][0] == 2.0 and env["max_case"][0] == "C"
+    assert env["min"][0] == -3.0 and env["min_case"][0] == "B"
+    assert env["absmax"][0] == -3.0 and env["absmax_case"][0] == "B"
+    assert np.isnan(env["max"][1]) and env["max_case"][1] is None
+
+
+def test_compute_envelope():
+    df = pd.DataFrame({
+        "Elem": [1, 2, 1, 2],
+        "Load": ["cLCB1", "cLCB1", "cLCB2", "cLCB2"],
+        "Moment-y": [5.0, -1.0, -8.0, 2.0],
+    })
+    env = compute_envelope(df).set_index("Elem")
+
+    assert env.loc[1, "Max"] == 5.0 and env.loc[1, "Max_Case"] == "cLCB1"
+    assert env.loc[1, "Min"] == -8.0 and env.loc[1, "Min_Case"] == "cLCB2"
+    assert env.loc[1, "AbsMax"] == -8.0
+    assert env.loc[2, "Max_Case"] == "cLCB2" and env.loc[2, "Min_Case"] == "cLCB1"
+
+
+def test_stage_steps_are_separate_cases():
+    df = pd.DataFrame({
+        "Elem": [1, 1, 1],
+        "Stage": ["CS1", "CS1", "CS2"],
+        "Step": ["001(第一个)", "002(最后)", "001(第一个)"],
+        "Moment-y": [1.0, 4.0, 2.0],
+    })
+    values, cases, rows, components = stack_results(df, by="Stage")
+
+    assert list(cases) == ["CS1:001(第一个)", "CS1:002(最后)", "CS2:001(第一个)"]
+    assert values.shape == (3, 1, 1)
+    assert compute_envelope(df, by="Stage")["Max_Case"].iloc[0] == "CS1:002(最后)"
+
+
+def test_missing_keys_dropped():
+    df = pd.DataFrame({
+        "Elem": [1, np.nan, 1],
+        "Load": ["A", "A", "B"],
+        "Moment-y": [1.0, 100.0, 2.0],
+    })
+    values, cases, rows, components = stack_results(df)
+
+    assert rows["Elem"].tolist() == [1.0]
+    np.testing.assert_allclose(values[:, 0, 0], [1.0, 2.0])
+
+
+def test_duplicate_rows_raise():
+    df = pd.DataFrame({"Elem": [1, 1], "Load": ["A", "A"], "Moment-y": [1.0, 2.0]})
+    with pytest.raises(ValueError):
+        stack_results(df)
@@ -0,0 +1,47 @@
+"""结果导出测试"""
+
+import pandas as pd
+import pytest
+
+from structural_analysis.export import ResultExporter, read_results, unique_columns
+
+# 索单元内力结果表，I、J端分量同名
+CABLE_FORCE = {
+    "CableForce": {
+        "HEAD": ["Index", "Elem", "NodeI", "NodeJ", "Load", "Stage", "Step",
+                 "Tension", "FX", "FY", "FZ", "Tension", "FX", "FY", "FZ"],
+        "DATA": [
+            [1, 501, 11, 61, "合计(CS)", "CS1", "001(第一个)", "3.2e6", "1.0", "0", "2.0", "3.1e6", "1.1", "0", "2.1"],
+            [2, 502, 12, 62, "合计(CS)", "CS1", "001(第一个)", "2.9e6", "1.2", "0", "2.2", "2.8e6", "1.3", "0", "2.3"],
+            [3, 501, 11, 61, "合计(CS)", "CS2", "001(第一个)", "3.4e6", "1.4", "0", "2.4", "3.3e6", "1.5", "0", "2.5"],
+        ]
+    }
+}
+
+
+def test_unique_columns():
+    assert unique_columns(["Elem", "Tension", "FX", "Tension", "FX", "Tension"]) == [
+        "Elem", "Tension", "FX", "Tension.1", "FX.1", "Tension.2"
+    ]
+    assert unique_columns(["A", "A", "A.1"]) == ["A", "A.2", "A.1"]
+
+
+@pytest.mark.parametrize("format, module, name", [("parquet", "pyarrow", "cable"), ("hdf5", "h5py", "cable.h5")])
+def test_cable_force_round_trip(tmp_path, format, module, name):
+    pytest.importorskip(module)
+    path = str(tmp_path / name)
+    with ResultExporter(path, format=format) as exporter:
+        assert exporter.write(CABLE_FORCE) == 3
+        # 处理后的结果同样含重复列名
+        processed = pd.DataFrame(CABLE_FORCE["CableForce"]["DATA"], columns=CABLE_FORCE["CableForce"]["HEAD"])
+        exporter.write_frame(processed.iloc[:1], "CableForceRaw")
+
+    df = read_results(path, "CableForce", stages="CS1").sort_values("Elem").reset_index(drop=True)
+    assert df["Elem"].tolist() == [501, 502]
+    assert df["Tension"].tolist() == [3.2e6, 2.9e6]
+    assert df["Tension.1"].tolist() == [3.1e6, 2.8e6]
+    assert df["FZ.1"].tolist() == [2.1, 2.3]
+    assert set(df["Stage"]) == {"CS1"}
+
+    raw = read_results(path, "CableForceRaw", columns=["Elem", "Tension", "Tension.1"])
+    assert raw.iloc[0].tolist() == [501, "3.2e6", "3.1e6"]
@@ -0,0 +1,66 @@
+"""本地线性静力分析测试"""
+
+import numpy as np
+import pytest
+
+from structural_analysis.frame_solver import FrameModel
+
+E, A, J, IY, IZ = 2.0e8, 0.1, 0.02, 0.01, 0.04
+LENGTH = 10.0
+
+
+def cantilever(n_elem=2):
+    """沿X轴的悬臂梁，节点1固结"""
+    x = np.linspace(0.0, LENGTH, n_elem + 1)
+    tables = {
+        "NODE": {str(i + 1): {"X": float(v), "Y": 0.0, "Z": 0.0} for i, v in enumerate(x)},
+        "ELEM": {
+            str(i + 1): {"TYPE": "BEAM", "MATL": 1, "SECT": 1, "NODE": [i + 1, i + 2]}
+            for i in range(n_elem)
+        },
+    }
+    model = FrameModel.from_tables(
+        tables, materials={1: {"E": E, "nu": 0.3}}, sections={1: {"A": A, "J": J, "Iy": IY, "Iz": IZ}}
+    )
+    model.add_supports([1], "1111110")
+    return model
+
+
+def test_cantilever_tip_deflection():
+    model = cantilever()
+    tip = len(model.node_ids)
+    model.add_nodal_loads("FZ", [tip], [0, 0, -100.0, 0, 0, 0])
+    model.add_nodal_loads("FY", [tip], [0, 100.0, 0, 0, 0, 0])
+    model.add_nodal_loads("FX", [tip], [50.0, 0, 0, 0, 0, 0])
+    result = model.solve()
+
+    disp = dict(zip(result.load_cases, result.displacements[:, tip - 1]))
+    # 竖向荷载绕局部y轴弯曲，水平荷载绕局部z轴弯曲
+    assert disp["FZ"][2] == pytest.approx(-100.0 * LENGTH ** 3 / (3 * E * IY))
+    assert disp["FZ"][4] == pytest.approx(100.0 * LENGTH ** 2 / (2 * E * IY))
+    assert disp["FY"][1] == pytest.approx(100.0 * LENGTH ** 3 / (3 * E * IZ))
+    assert disp["FX"][0] == pytest.approx(50.0 * LENGTH / (E * A))
+
+
+def test_cantilever_reactions_and_forces():
+    model = cantilever()
+    model.add_nodal_loads("P", [len(model.node_ids)], [0, 0, -100.0, 0, 0, 0])
+    result = model.solve()
+
+    reaction = result.reaction_frame("P").set_index("Node").loc[1]
+    assert reaction["FZ"] == pytest.approx(100.0)
+    assert reaction["MY"] == pytest.approx(-100.0 * LENGTH)
+
+    table = result.beam_force_table("P")["BeamForce"]
+    moment = table["HEAD"].index("Moment-y")
+    moments = [row[moment] for row in table["DATA"]]
+    assert moments[0] == pytest.approx(-100.0 * LENGTH)
+    assert moments[-1] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_missing_section_raises():
+    model = cantilever()
+    model.sections.clear()
+    model.add_nodal_loads("P", [2], [0, 0, -1.0, 0, 0, 0])
+    with pytest.raises(ValueError):
+        model.solve()
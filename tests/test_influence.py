@@ -0,0 +1,71 @@
+"""索力影响矩阵求解测试"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from structural_analysis.influence import InfluenceMatrix
+
+
+def influence(n_resp=6, n_cable=3, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.MultiIndex.from_tuples(
+        [("Displacement", "DZ", None, k + 1) for k in range(n_resp)],
+        names=["Type", "Component", "Stage", "ID"]
+    )
+    return InfluenceMatrix(rng.normal(size=(n_resp, n_cable)), [101, 102, 103][:n_cable], index)
+
+
+def test_shape_mismatch_raises():
+    with pytest.raises(ValueError):
+        InfluenceMatrix(np.zeros((2, 3)), [1, 2], pd.Index([1, 2]))
+
+
+def test_solve_recovers_tensions():
+    im = influence()
+    tensions = np.array([1500.0, 2200.0, 1800.0])
+    base = np.linspace(-5.0, 5.0, 6)
+    solved = im.solve(im.response(tensions) + base, base=base)
+
+    assert solved.index.tolist() == [101, 102, 103]
+    np.testing.assert_allclose(solved.to_numpy(), tensions)
+
+
+def test_solve_multiple_targets_and_nan():
+    im = influence()
+    tensions = np.array([[1500.0, 1000.0], [2200.0, 1200.0], [1800.0, 900.0]])
+    targets = im.response(tensions)
+    # 第二组目标的第一个控制点不参与
+    targets[0, 1] = np.nan
+    solved = im.solve(targets)
+
+    assert isinstance(solved, pd.DataFrame)
+    np.testing.assert_allclose(solved.to_numpy(), tensions)
+
+
+def test_solve_bounds():
+    im = influence()
+    tensions = np.array([1500.0, 2200.0, 1800.0])
+    solved = im.solve(im.response(tensions), bounds=(1000.0, 2000.0))
+
+    assert solved.between(1000.0 - 1e-6, 2000.0 + 1e-6).all()
+    assert solved[102] == pytest.approx(2000.0)
+
+
+def test_solve_underdetermined_with_smoothing():
+    im = influence(n_resp=2)
+    reference = np.array([1000.0, 1000.0, 1000.0])
+    solved = im.solve(im.response(reference), reference=reference, smoothing=1e-6)
+
+    np.testing.assert_allclose(solved.to_numpy(), reference)
+
+
+def test_save_and_load(tmp_path):
+    im = influence()
+    path = str(tmp_path / "influence.npz")
+    im.save(path)
+    loaded = InfluenceMatrix.load(path)
+
+    np.testing.assert_array_equal(loaded.matrix, im.matrix)
+    assert loaded.cables.tolist() == [101, 102, 103]
+    assert loaded.index.get_level_values("ID").tolist() == list(range(1, 7))
@@ -0,0 +1,78 @@
+"""施工阶段结果张量测试"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from structural_analysis.result_tensor import StageResultTensor
+
+
+def stage_results():
+    """两个阶段(CS1含两个步骤)、两个单元、两个部件的梁单元内力"""
+    rows = []
+    for stage, steps in [("CS1", ["001(第一个)", "002(最后)"]), ("CS2", ["001(最后)"])]:
+        for k, step in enumerate(steps):
+            for elem in [2, 1]:
+                for part in ["PartI", "PartJ"]:
+                    value = {"CS1": 10.0, "CS2": 20.0}[stage] + k + elem + (0.5 if part == "PartJ" else 0.0)
+                    rows.append({"Elem": elem, "Load": "合计(CS)", "Stage": stage, "Step": step,
+                                 "Part": part, "Moment-y": value, "Axial": -value})
+    return pd.DataFrame(rows)
+
+
+def test_from_dataframe():
+    tensor = StageResultTensor.from_dataframe(stage_results())
+
+    assert tensor.shape == (2, 3, 2, 2, 2)
+    assert tensor.stages == ["CS1", "CS2"]
+    assert tensor.steps == ["001(第一个)", "002(最后)", "001(最后)"]
+    assert tensor.elems.tolist() == [1, 2]
+    assert tensor.components == ["Moment-y", "Axial"]
+    assert tensor.element(2)[1, 2, 1, 0] == 22.5
+    # CS2没有CS1的步骤
+    assert np.isnan(tensor.stage("CS2")[0]).all()
+
+
+def test_history_uses_last_valid_step():
+    tensor = StageResultTensor.from_dataframe(stage_results())
+
+    history = tensor.history(1, "Moment-y")
+    assert history.to_dict() == {"CS1": 12.0, "CS2": 21.0}
+    assert tensor.history(1, "Moment-y", part="PartJ", step="001(第一个)")["CS1"] == 11.5
+
+
+def test_to_frame_round_trip():
+    df = stage_results()
+    tensor = StageResultTensor.from_dataframe(df)
+    frame = tensor.to_frame()
+
+    keys = ["Stage", "Step", "Elem", "Part"]
+    expected = df[keys + tensor.components].sort_values(keys).reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        frame.sort_values(keys).reset_index(drop=True), expected, check_dtype=False
+    )
+    assert [len(f) for f in tensor.to_frames()] == [8, 4]
+
+
+def test_save_and_load(tmp_path):
+    tensor = StageResultTensor.from_dataframe(stage_results(), path=tmp_path / "direct")
+    tensor.save(tmp_path / "saved")
+
+    for path in ["direct", "saved"]:
+        loaded = StageResultTensor.load(tmp_path / path)
+        np.testing.assert_array_equal(np.asarray(loaded.values), np.asarray(tensor.values))
+        assert loaded.steps == tensor.steps and loaded.elems.tolist() == [1, 2]
+
+
+def test_duplicate_cells_raise():
+    df = stage_results()
+    df = pd.concat([df, df.assign(Load="ST")], ignore_index=True)
+    with pytest.raises(ValueError, match="荷载工况"):
+        StageResultTensor.from_dataframe(df)
+
+
+def test_missing_stage_raises():
+    df = stage_results()
+    df.loc[0, "Stage"] = None
+    with pytest.raises(ValueError):
+        StageResultTensor.from_dataframe(df)
@@ -0,0 +1,47 @@
+"""施工阶段列表测试"""
+
+import pytest
+
+from structural_analysis.stages import StageRegistry
+
+STAG = {
+    "STAG": {
+        "1": {"NAME": "CS1", "DURATION": 10},
+        "2": {"NAME": "CS2", "DURATION": 7, "ADD_STEP": [2, 5]},
+    }
+}
+
+
+def registry():
+    return StageRegistry().load(response=STAG)
+
+
+def test_step_names_match_midas_labels():
+    stages = registry()
+
+    assert stages.step_names("CS1") == ["CS1:001(第一个)", "CS1:002(最后)"]
+    assert stages.step_names("CS2") == ["CS2:001(第一个)", "CS2:002", "CS2:003", "CS2:004(最后)"]
+    with pytest.raises(ValueError):
+        stages.step_names("CS9")
+
+
+def test_resolve():
+    stages = registry()
+
+    assert stages.resolve("CS1") == ["CS1:002(最后)"]
+    assert stages.resolve(["CS1", "CS2"], step="first") == ["CS1:001(第一个)", "CS2:001(第一个)"]
+    assert stages.resolve(["CS2:003"]) == ["CS2:003"]
+    assert stages.resolve(None) is None
+
+
+def test_result_step_names_take_precedence():
+    stages = StageRegistry()
+    # 结果表中的名称可在读取阶段列表前登记
+    stages.record_steps(["CS2", "CS2", "CS2"], ["002(3.0)", "004(最后)", "004(最后)"])
+    stages.load(response=STAG)
+
+    assert stages.step_names("CS2") == ["CS2:001(第一个)", "CS2:002(3.0)", "CS2:003", "CS2:004(最后)"]
+
+    # 重新定义阶段后恢复为按步骤数生成
+    stages.record({"2": {"NAME": "CS2", "DURATION": 7}})
+    assert stages.step_names("CS2") == ["CS2:001(第一个)", "CS2:002(最后)"]